@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: collector, sorter, filter, Users aggregation, Treeview refresh
+
+Chạy trên cây /proc giả (benchmarks/fake_procfs.py), kết quả ghi ra JSON để so sánh giữa các phiên bản:
+
+    python -m benchmarks.bench_collector --procs 1000,10000 --output bench.json
+    python -m benchmarks.bench_collector --procs 10000 --baseline bench.json
+    python -m benchmarks.bench_collector --procs 10000 --backend procfs
+    python -m benchmarks.bench_collector --procs 2000,20000 --backend procfs --workers 1,2,4,8
+
+Treeview chỉ được đo khi có display (Tk root ẩn); nếu không sẽ ghi "skipped".
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+import psutil
+
+from benchmarks.fake_procfs import FakeProc
+from task_manager.config import DEFAULT_CFG
+from task_manager.backends import PsutilSource, ProcfsSource, RecordedSource, SnapshotRecorder
+from task_manager.containers import ContainerResolver, ALL_CONTAINERS
+from task_manager.procfs import PROC_ROOT
+from task_manager.person2_processes import ProcessesTabMixin
+from task_manager.person3_details import DetailsTabMixin
+from task_manager.person5_other_tabs import OtherTabsMixin
+
+
+class _Var:
+    """Stand-in for tk.StringVar when no Tk root exists."""
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Harness(ProcessesTabMixin, DetailsTabMixin, OtherTabsMixin):
+    """Mixins of the app without the window: enough state for the collector/sorter to run."""
+    def __init__(self, source, cfg=None):
+        self.source = source
+        self.enricher = None
+        self._tree_rows = {}
+        self.cfg = json.loads(json.dumps(cfg or DEFAULT_CFG))
+        self.filter_text = _Var("")
+        self.cgroup_filter = None
+        self.containers = ContainerResolver(getattr(source, "root", PROC_ROOT))
+        self.container_filter = _Var(ALL_CONTAINERS)
+        self.group_by_container = _Var(False)
+        self.sort_col = "cpu"
+        self.sort_desc = True
+        self.details_sort_col = "cpu"
+        self.details_sort_desc = True
+
+
+def timeit(fn, repeat: int, setup=None) -> dict:
+    """Run fn `repeat` times; `setup` (untimed) runs before each call."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "max_ms": max(times),
+            "runs": repeat, "_result": result}
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent.parent, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def make_bench_source(kind: str, fp: FakeProc, args):
+    root = str(fp.root)
+    if kind == "psutil":
+        return PsutilSource()
+    if kind == "procfs":
+        return ProcfsSource(root)
+    if kind == "recorded":
+        # ghi trước vài frame từ cây giả rồi phát lại từng frame một
+        path = Path(args.workdir) / f"recording_{len(fp.procs)}.jsonl"
+        src = ProcfsSource(root)
+        src.prime()
+        rec = SnapshotRecorder(str(path))
+        for _ in range(args.repeat + 1):
+            fp.advance(churn=args.churn)
+            rec.record(src.system_snapshot(max_age=0), src.collect_rows())
+        rec.close()
+        return RecordedSource(str(path), realtime=False)
+    raise ValueError(kind)
+
+
+def bench_size(n: int, args, results: list, tk_root=None):
+    root = Path(args.workdir) / f"proc_{n}"
+    fp = FakeProc(root, seed=args.seed).build(n)
+    old_procfs = psutil.PROCFS_PATH
+    psutil.PROCFS_PATH = str(root)
+    try:
+        for backend in [b.strip() for b in args.backend.split(",") if b.strip()]:
+            h = Harness(make_bench_source(backend, fp, args))
+            bench_backend(h, fp, n, backend, args, results, tk_root)
+            h.source.close()
+    finally:
+        psutil.PROCFS_PATH = old_procfs
+        if not args.keep:
+            fp.destroy()
+
+
+def bench_backend(h: Harness, fp: FakeProc, n: int, backend: str, args, results: list, tk_root=None):
+    def add(bench, r, **extra):
+        r.pop("_result", None)
+        results.append(dict(bench=bench, procs=n, backend=backend, **extra, **r))
+
+    # lần đầu: prime rate counters (giống tick đầu tiên của app)
+    h._collect_process_rows()
+    r = timeit(h._collect_process_rows, args.repeat, setup=lambda: fp.advance(churn=args.churn))
+    rows = r.pop("_result")
+    add("collect", r, churn=args.churn)
+
+    # plan mặc định của tab Processes (threads/fds/start ẩn) -> so với "collect" (đọc tất cả)
+    plan = h._build_collect_plan(h._visible_columns("columns"), h.sort_col)
+    r = timeit(lambda: h._collect_process_rows(plan), args.repeat, setup=lambda: fp.advance(churn=args.churn))
+    r.pop("_result")
+    add("collect_plan_processes_tab", r, churn=args.churn)
+
+    if backend == "procfs" and args.workers:
+        bench_parallel(h, fp, n, args, add)
+
+    for col in ("cpu", "mem", "name", "pid"):
+        add(f"sort_{col}", timeit(lambda: h._sort_rows(rows, col, True), args.repeat))
+
+    def filt():
+        s = "python"
+        return [x for x in rows if h._row_matches(s, x.pid, x.name, x.user, x.cmd)]
+    add("filter", timeit(filt, args.repeat))
+    add("users_aggregate", timeit(lambda: h._aggregate_users(rows), args.repeat))
+
+    if tk_root is not None:
+        from tkinter import ttk
+        h.proc_tree = ttk.Treeview(tk_root, columns=("pid", "name", "user", "cpu", "mem", "pss", "uss",
+                                                     "swap", "status", "nice", "threads", "fds", "ctx_v",
+                                                     "ctx_i", "rq_wait", "start",
+                                                     "io_r", "io_w", "exe", "cgroup", "container", "cmd"),
+                                   show="headings")
+        add("treeview_fill_initial", timeit(lambda: h._fill_process_tree(rows), 1))
+        add("treeview_fill_update", timeit(lambda: h._fill_process_tree(rows), args.repeat))
+        h.proc_tree.destroy()
+    else:
+        results.append(dict(bench="treeview_fill_update", procs=n, backend=backend, skipped="no display"))
+
+
+def bench_parallel(h: Harness, fp: FakeProc, n: int, args, add):
+    """Scaling of the sharded /proc scan: same tick with 1 (serial), 2, 4... workers."""
+    root = str(fp.root)
+    base = None
+    for w in [int(x) for x in args.workers.split(",") if x.strip()]:
+        src = ProcfsSource(root, parallel="on" if w > 1 else "off", workers=w)
+        hp = Harness(src)
+        hp._collect_process_rows()  # prime + khởi động pool (không tính thời gian spawn worker)
+        r = timeit(hp._collect_process_rows, args.repeat, setup=lambda: fp.advance(churn=args.churn))
+        r.pop("_result")
+        base = base or r["median_ms"]
+        add(f"collect_parallel_w{w}", r, workers=w, shards=src.last_scan_shards,
+            speedup=round(base / max(1e-9, r["median_ms"]), 2))
+        src.close()
+
+
+def compare(results: list, baseline_path: str):
+    base = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    index = {(b["bench"], b["procs"], b.get("backend", "psutil")): b
+             for b in base.get("results", []) if "median_ms" in b}
+    print(f"\n{'bench':<26}{'backend':>10}{'procs':>8}{'base ms':>12}{'now ms':>12}{'ratio':>8}")
+    for r in results:
+        b = index.get((r["bench"], r["procs"], r.get("backend", "psutil")))
+        if not b or "median_ms" not in r:
+            continue
+        ratio = r["median_ms"] / max(1e-9, b["median_ms"])
+        flag = "  <-- REGRESSION" if ratio > 1.2 else ""
+        print(f"{r['bench']:<26}{r.get('backend', ''):>10}{r['procs']:>8}{b['median_ms']:>12.2f}{r['median_ms']:>12.2f}{ratio:>8.2f}{flag}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--procs", default="1000,10000", help="comma separated sizes, e.g. 1000,10000,50000")
+    ap.add_argument("--backend", default="psutil,procfs,recorded", help="data sources to benchmark")
+    ap.add_argument("--churn", type=float, default=0.01, help="fraction of processes replaced per tick")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--workers", default="1,2,4", help="procfs parallel scan scaling (worker counts, '' = skip)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workdir", default=tempfile.gettempdir())
+    ap.add_argument("--keep", action="store_true", help="keep the generated fake /proc trees")
+    ap.add_argument("--output", default="", help="write JSON results here (default: stdout)")
+    ap.add_argument("--baseline", default="", help="previous JSON output to compare against")
+    args = ap.parse_args(argv)
+
+    tk_root = None
+    try:
+        import tkinter as tk
+        tk_root = tk.Tk()
+        tk_root.withdraw()
+    except Exception:
+        tk_root = None
+
+    results = []
+    for n in [int(x) for x in args.procs.split(",") if x.strip()]:
+        print(f"[bench] {n} processes...", file=sys.stderr)
+        bench_size(n, args, results, tk_root)
+
+    out = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "psutil": psutil.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    text = json.dumps(out, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"[bench] results -> {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    if args.baseline:
+        compare(results, args.baseline)
+    if tk_root is not None:
+        tk_root.destroy()
+
+
+if __name__ == "__main__":
+    main()
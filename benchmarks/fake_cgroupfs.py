@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Synthetic cgroup v2 tree (/sys/fs/cgroup) for the Services and Cgroups tabs
+
+Sinh `system.slice/<unit>/` với cpu.stat, memory.current, memory.peak, io.stat, pids.current,
+*.pressure và cgroup.procs cho N service unit (kể cả unit template trong `system-<name>.slice`),
+cùng output giả của `systemctl list-units` để ghép với danh sách unit. Các cgroup trong
+benchmarks.fake_procfs.CGROUPS (user slice, scope, container...) cũng được tạo; nếu truyền
+một FakeProc, cgroup.procs chứa đúng các PID của cây /proc giả đó.
+`advance()` tăng counter CPU/I/O như một khoảng refresh. Trỏ app vào cây này bằng key
+`cgroup_root` trong config.
+
+Dùng độc lập:
+    python -m benchmarks.fake_cgroupfs /tmp/fakecg 600
+"""
+
+from __future__ import annotations
+
+import sys
+import random
+import shutil
+from pathlib import Path
+
+from benchmarks.fake_procfs import CGROUPS
+from task_manager.cgroupfs import SYSTEM_SLICE, unit_cgroup_dir
+
+NAMES = [
+    "nginx", "postgresql", "ssh", "cron", "dbus", "systemd-journald", "systemd-logind", "containerd",
+    "docker", "snapd", "rsyslog", "NetworkManager", "polkit", "udisks2", "cups", "redis-server",
+]
+TEMPLATES = ["getty", "user", "systemd-fsck", "openvpn-client"]
+
+
+class FakeCgroup:
+    def __init__(self, root: str | Path, seed: int = 1):
+        self.root = Path(root)
+        self.rng = random.Random(seed)
+        self.units = {}    # unit -> dict(counters, active/sub)
+        self.cgroups = {}  # rel path -> dict(counters, pids) của mọi cgroup có file
+
+    def build(self, n: int, procs=None) -> "FakeCgroup":
+        """`procs`: optional FakeProc whose processes are placed into their "cgroup" field."""
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        (self.root / SYSTEM_SLICE).mkdir(parents=True)
+        (self.root / "cgroup.controllers").write_text("cpuset cpu io memory hugetlb pids rdma misc\n")
+        rng = self.rng
+        for i in range(n):
+            if i % 5 == 4:
+                unit = f"{rng.choice(TEMPLATES)}@{i}.service"
+            else:
+                unit = f"{NAMES[i % len(NAMES)]}{'' if i < len(NAMES) else f'-{i}'}.service"
+            active = rng.random() < 0.7
+            self.units[unit] = {
+                "active": active,
+                "cpu_usec": rng.randint(0, 10 ** 10),
+                "mem": rng.randint(1 << 20, 1 << 30),
+                "rbytes": rng.randint(0, 10 ** 10),
+                "wbytes": rng.randint(0, 10 ** 9),
+                "tasks": rng.choice([1, 1, 2, 4, 16, 64]),
+                "throttled_usec": 0,
+                "pids": [],
+            }
+            self.units[unit]["peak"] = self.units[unit]["mem"] * 2
+            if active:
+                rel = str(Path(unit_cgroup_dir(unit, str(self.root))).relative_to(self.root))
+                self.cgroups[rel] = self.units[unit]
+        for cg in CGROUPS:
+            self.cgroups.setdefault(cg.strip("/"), self._counters())
+        if procs is not None:
+            for pid, p in procs.procs.items():
+                self.cgroups.setdefault(p["cgroup"].strip("/"), self._counters())["pids"].append(pid)
+        # slice cha (system.slice, user.slice...) cũng là cgroup có file
+        for rel in list(self.cgroups):
+            parts = rel.split("/")
+            for i in range(1, len(parts)):
+                self.cgroups.setdefault("/".join(parts[:i]), self._counters())
+        for rel in self.cgroups:
+            self._write_cgroup(rel)
+        return self
+
+    def _counters(self) -> dict:
+        rng = self.rng
+        mem = rng.randint(1 << 20, 1 << 30)
+        return {"active": True, "cpu_usec": rng.randint(0, 10 ** 10), "mem": mem, "peak": mem * 2,
+                "rbytes": rng.randint(0, 10 ** 10), "wbytes": rng.randint(0, 10 ** 9),
+                "tasks": rng.choice([1, 2, 4, 16]), "throttled_usec": 0, "pids": []}
+
+    def _write_cgroup(self, rel: str):
+        u = self.cgroups[rel]
+        d = self.root / rel
+        d.mkdir(parents=True, exist_ok=True)
+        throttled = u.get("throttled_usec", 0)
+        (d / "cpu.stat").write_text(
+            f"usage_usec {u['cpu_usec']}\nuser_usec {u['cpu_usec'] * 3 // 4}\n"
+            f"system_usec {u['cpu_usec'] // 4}\nnr_periods {throttled // 1000}\n"
+            f"nr_throttled {throttled // 5000}\nthrottled_usec {throttled}\n"
+        )
+        (d / "cgroup.procs").write_text("".join(f"{pid}\n" for pid in u.get("pids", ())))
+        some = min(99.0, u["cpu_usec"] % 997 / 10.0)
+        for res in ("cpu", "memory", "io"):
+            (d / f"{res}.pressure").write_text(
+                f"some avg10={some:.2f} avg60={some / 2:.2f} avg300={some / 4:.2f} total={u['cpu_usec'] // 7}\n"
+                f"full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+        (d / "memory.current").write_text(f"{u['mem']}\n")
+        (d / "memory.peak").write_text(f"{u['peak']}\n")
+        (d / "io.stat").write_text(
+            f"8:0 rbytes={u['rbytes']} wbytes={u['wbytes']} rios=100 wios=50 dbytes=0 dios=0\n"
+            f"259:0 rbytes={u['rbytes'] // 10} wbytes=0 rios=10 wios=0 dbytes=0 dios=0\n"
+        )
+        (d / "pids.current").write_text(f"{u['tasks']}\n")
+
+    def list_units_output(self) -> str:
+        """Text in the format of `systemctl list-units --type=service --all --no-legend --plain`."""
+        lines = []
+        for unit in sorted(self.units):
+            u = self.units[unit]
+            state = "active running" if u["active"] else "inactive dead"
+            lines.append(f"{unit} loaded {state} Fake {unit.split('.')[0]} service")
+        return "\n".join(lines) + "\n"
+
+    def advance(self, busy: float = 0.3, dt_s: float = 1.0):
+        """One refresh interval: a `busy` fraction of active units burns CPU and does I/O."""
+        rng = self.rng
+        for rel in rng.sample(list(self.cgroups), int(len(self.cgroups) * busy)):
+            u = self.cgroups[rel]
+            u["cpu_usec"] += int(rng.random() * dt_s * 1e6)
+            if rng.random() < 0.2:
+                u["throttled_usec"] = u.get("throttled_usec", 0) + int(rng.random() * dt_s * 2e5)
+            u["rbytes"] += rng.randint(0, 50 << 20)
+            u["wbytes"] += rng.randint(0, 10 << 20)
+            u["mem"] = max(1 << 20, u["mem"] + rng.randint(-(8 << 20), 8 << 20))
+            u["peak"] = max(u["peak"], u["mem"])
+            self._write_cgroup(rel)
+
+    def destroy(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else "/tmp/fakecg"
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    FakeCgroup(root).build(n)
+    print(f"fake cgroupfs with {n} units at {root}")
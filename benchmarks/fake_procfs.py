@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""Synthetic /proc tree for benchmarks
+
+Sinh một cây procfs giả (stat, status, statm, schedstat, cmdline, comm, io, cgroup, fd/) với N process,
+nội dung giống thật (comm có dấu cách / dấu ngoặc, nhiều user, nhiều thread...).
+`advance()` mô phỏng churn: một phần process chết, process mới sinh ra, counter CPU tăng.
+`add_sockets()` thêm /proc/net/{tcp,tcp6,udp,udp6} và fd `socket:[inode]` (vd 100k socket
+dồn vào một process như load balancer); `advance()` khi đó cũng đóng/mở một phần socket.
+
+Dùng độc lập:
+    python -m benchmarks.fake_procfs /tmp/fakeproc 10000
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import random
+import shutil
+from pathlib import Path
+
+CLK_TCK = 100
+PAGE = 4096
+BOOT_TIME = 1_700_000_000
+
+COMMS = [
+    "systemd", "bash", "python3", "nginx: worker", "postgres", "Web Content", "(sd-pam)",
+    "kworker/3:1-events", "sshd", "java", "node", "containerd-shim", "tmux: server",
+    "gunicorn", "chrome", "Xorg", "dbus-daemon", "a (weird) name",
+]
+UIDS = [0, 0, 0, 1000, 1000, 1001, 33, 65534]
+STATES = "SSSSSSRDIZ"
+CGROUPS = [
+    "/system.slice/nginx.service",
+    "/system.slice/postgresql.service",
+    "/user.slice/user-1000.slice/session-2.scope",
+    "/system.slice/docker-3f9a1c0e5b7d2a4c6e8f0a1b2c3d4e5f60718293a4b5c6d7e8f9a0b1c2d3e4f5.scope",
+    "/kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod1234abcd_5678_90ef_aaaa_bbbbccccdddd.slice/cri-containerd-0a1b2c3d4e5f60718293a4b5c6d7e8f9a0b1c2d3e4f5a6b7c8d9e0f1a2b3c4d5.scope",
+    "/init.scope",
+]
+
+
+class FakeProc:
+    def __init__(self, root: str | Path, seed: int = 1):
+        self.root = Path(root)
+        self.rng = random.Random(seed)
+        self.next_pid = 2
+        self.uptime_ticks = 500_000
+        self.procs = {}  # pid -> dict(fields)
+        self.sockets = {}  # inode -> [proto, local hex, remote hex, state hex, uid, pid]
+        self.next_inode = 500_000
+
+    # ------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------
+    def build(self, n: int) -> "FakeProc":
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        self.root.mkdir(parents=True)
+        self._write_system_files()
+        self._spawn(1, comm="systemd", uid=0)
+        for _ in range(max(0, n - 1)):
+            self._spawn(self._alloc_pid())
+        return self
+
+    def _alloc_pid(self) -> int:
+        self.next_pid += self.rng.randint(1, 3)
+        return self.next_pid
+
+    def _write_system_files(self):
+        ncpu = os.cpu_count() or 4
+        lines = [f"cpu  {self.uptime_ticks} 0 {self.uptime_ticks // 4} {self.uptime_ticks * ncpu} 100 0 0 0 0 0"]
+        for i in range(ncpu):
+            lines.append(f"cpu{i} {self.uptime_ticks // ncpu} 0 0 {self.uptime_ticks} 0 0 0 0 0 0")
+        lines += [f"btime {BOOT_TIME}", "processes 100000", "procs_running 2", "procs_blocked 0"]
+        (self.root / "stat").write_text("\n".join(lines) + "\n")
+        (self.root / "uptime").write_text(f"{self.uptime_ticks / CLK_TCK:.2f} 0.00\n")
+        self._write_net_dev()
+        (self.root / "pressure").mkdir(exist_ok=True)
+        t = self.uptime_ticks
+        for i, res in enumerate(("cpu", "memory", "io")):
+            some = (t // 100 * (i + 3)) % 40 / 2.0
+            (self.root / "pressure" / res).write_text(
+                f"some avg10={some:.2f} avg60={some / 2:.2f} avg300={some / 3:.2f} total={t * 1000 * (i + 1)}\n"
+                f"full avg10={some / 4:.2f} avg60={some / 8:.2f} avg300={some / 12:.2f} total={t * 100 * (i + 1)}\n")
+        (self.root / "meminfo").write_text(
+            "MemTotal:       65807832 kB\nMemFree:        10000000 kB\nMemAvailable:   30000000 kB\n"
+            "Buffers:          100000 kB\nCached:         15000000 kB\nSwapTotal:       8388604 kB\n"
+            "SwapFree:        8000000 kB\nShmem:            200000 kB\nSReclaimable:     500000 kB\n"
+        )
+
+    def _write_net_dev(self):
+        """/proc/net/dev: lo, a NIC, a docker bridge and its veths; counters grow with uptime."""
+        (self.root / "net").mkdir(exist_ok=True)
+        t = self.uptime_ticks
+        lines = ["Inter-|   Receive                                                |  Transmit\n",
+                 " face |bytes    packets errs drop fifo frame compressed multicast"
+                 "|bytes    packets errs drop fifo colls carrier compressed\n"]
+        for i, name in enumerate(["lo", "eth0", "docker0", "veth1a2b3c", "veth4d5e6f"]):
+            rx, tx = t * 1500 * (i + 1), t * 700 * (i + 1)
+            drops = t // 50 if name == "eth0" else 0
+            lines.append(f"{name:>6}: {rx} {rx // 1000} 0 {drops} 0 0 0 0 {tx} {tx // 800} {t // 5000} 0 0 0 0 0\n")
+        (self.root / "net" / "dev").write_text("".join(lines))
+
+    def _spawn(self, pid: int, comm: str | None = None, uid: int | None = None):
+        rng = self.rng
+        comm = comm or rng.choice(COMMS)
+        uid = rng.choice(UIDS) if uid is None else uid
+        nthreads = rng.choice([1, 1, 1, 2, 4, 8, 16, 64])
+        p = {
+            "comm": comm[:15],
+            "state": rng.choice(STATES),
+            "ppid": 1 if pid == 1 else rng.choice([1] + list(self.procs)[-50:]),
+            "uid": uid,
+            "utime": rng.randint(0, 50_000),
+            "stime": rng.randint(0, 10_000),
+            "nice": rng.choice([0, 0, 0, 0, 5, 10, 19, -5]),
+            "threads": nthreads,
+            "start": rng.randint(0, self.uptime_ticks),
+            "vsize_pages": rng.randint(1_000, 2_000_000),
+            "rss_pages": rng.randint(50, 200_000),
+            "nfds": rng.choice([3, 4, 8, 16, 32, 128]),
+            "argv": self._argv(comm),
+            "cgroup": rng.choice(CGROUPS),
+            "rchar": rng.randint(0, 10 ** 10),
+            "wchar": rng.randint(0, 10 ** 9),
+        }
+        self.procs[pid] = p
+        self._write_proc(pid, p)
+
+    def _argv(self, comm: str) -> list[str]:
+        base = comm.split(":")[0].split()[0].strip("()")
+        n = self.rng.randint(0, 12)
+        return [f"/usr/bin/{base}"] + [f"--opt{i}=value{self.rng.randint(0, 999)}" for i in range(n)]
+
+    def _stat_line(self, pid: int, p: dict) -> str:
+        f = [
+            p["state"], p["ppid"], pid, pid, 0, -1, 4194560, 1000, 0, 10, 0,
+            p["utime"], p["stime"], 0, 0, 20, p["nice"], p["threads"], 0, p["start"],
+            p["vsize_pages"] * PAGE, p["rss_pages"], 18446744073709551615,
+        ] + [0] * 13 + [self.rng.randint(0, 7), 0, 0, 0, 0, 0] + [0] * 8
+        return f"{pid} ({p['comm']}) " + " ".join(map(str, f)) + "\n"
+
+    def _write_proc(self, pid: int, p: dict):
+        d = self.root / str(pid)
+        d.mkdir(exist_ok=True)
+        self._write_counters(pid, p)
+        (d / "comm").write_text(p["comm"] + "\n")
+        (d / "cmdline").write_bytes(("\0".join(p["argv"]) + "\0").encode())
+        (d / "statm").write_text(f"{p['vsize_pages']} {p['rss_pages']} {p['rss_pages'] // 3} 10 0 {p['rss_pages']} 0\n")
+        (d / "io").write_text(
+            f"rchar: {p['rchar']}\nwchar: {p['wchar']}\nsyscr: 1000\nsyscw: 500\n"
+            f"read_bytes: {p['rchar'] // 2}\nwrite_bytes: {p['wchar'] // 2}\ncancelled_write_bytes: 0\n"
+        )
+        (d / "cgroup").write_text(f"0::{p['cgroup']}\n")
+        fd = d / "fd"
+        fd.mkdir(exist_ok=True)
+        targets = ["/dev/null", "/dev/pts/0", "socket:[12345]", "pipe:[6789]", "/var/log/syslog"]
+        for i in range(p["nfds"]):
+            try:
+                os.symlink(targets[i % len(targets)], fd / str(i))
+            except FileExistsError:
+                pass
+
+    def _write_counters(self, pid: int, p: dict):
+        """Files whose counters move every tick: stat, status (ctx switches), schedstat."""
+        d = self.root / str(pid)
+        (d / "stat").write_text(self._stat_line(pid, p))
+        uid, state = p["uid"], p["state"]
+        (d / "status").write_text(
+            f"Name:\t{p['comm']}\nUmask:\t0022\nState:\t{state} (x)\nTgid:\t{pid}\nNgid:\t0\nPid:\t{pid}\n"
+            f"PPid:\t{p['ppid']}\nTracerPid:\t0\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n"
+            f"Gid:\t{uid}\t{uid}\t{uid}\t{uid}\nFDSize:\t64\nGroups:\t\nNSpid:\t{pid}\n"
+            f"VmSize:\t{p['vsize_pages'] * 4} kB\nVmRSS:\t{p['rss_pages'] * 4} kB\nVmSwap:\t0 kB\n"
+            f"Threads:\t{p['threads']}\nvoluntary_ctxt_switches:\t{p['utime'] * 3}\n"
+            f"nonvoluntary_ctxt_switches:\t{p['stime']}\n"
+        )
+        run_ns = (p["utime"] + p["stime"]) * (10 ** 9 // CLK_TCK)
+        (d / "schedstat").write_text(f"{run_ns} {run_ns // 5 + p['stime'] * 1000} {p['utime'] * 3 + p['stime']}\n")
+
+    # ------------------------------------------------------------
+    # Churn
+    # ------------------------------------------------------------
+    def advance(self, churn: float = 0.01, busy: float = 0.2, dt_ticks: int = 100):
+        """Simulate one refresh interval: kill/spawn `churn` fraction, bump CPU for `busy` fraction."""
+        rng = self.rng
+        self.uptime_ticks += dt_ticks
+        self._write_system_files()
+        pids = [pid for pid in self.procs if pid != 1]
+        n_churn = int(len(pids) * churn)
+        for pid in rng.sample(pids, min(n_churn, len(pids))):
+            del self.procs[pid]
+            shutil.rmtree(self.root / str(pid), ignore_errors=True)
+        if self.sockets:
+            self._churn_sockets(churn)
+        for _ in range(n_churn):
+            self._spawn(self._alloc_pid())
+            self.procs[self.next_pid]["start"] = self.uptime_ticks - rng.randint(0, dt_ticks)
+            self._write_proc(self.next_pid, self.procs[self.next_pid])
+        live = list(self.procs)
+        for pid in rng.sample(live, int(len(live) * busy)):
+            p = self.procs[pid]
+            p["utime"] += rng.randint(0, dt_ticks)
+            p["stime"] += rng.randint(0, dt_ticks // 4)
+            self._write_counters(pid, p)
+
+    # ------------------------------------------------------------
+    # Sockets (/proc/net/*)
+    # ------------------------------------------------------------
+    def add_sockets(self, n: int, owner: int | None = None, owner_share: float = 0.9) -> "FakeProc":
+        """Open `n` sockets; `owner_share` of them belong to `owner` (mặc định: một process bất kỳ)."""
+        rng = self.rng
+        pids = list(self.procs)
+        owner = owner if owner is not None else rng.choice(pids)
+        for _ in range(n):
+            pid = owner if rng.random() < owner_share else rng.choice(pids)
+            self._open_socket(pid)
+        self._write_net_tables()
+        return self
+
+    def _open_socket(self, pid: int):
+        rng = self.rng
+        self.next_inode += 1
+        proto = rng.choice(["tcp", "tcp", "tcp", "tcp6", "udp", "udp6"])
+        v6 = proto.endswith("6")
+        ip = (lambda: "".join(f"{rng.randint(0, 0xFFFFFFFF):08X}" for _ in range(4))) if v6 else \
+             (lambda: f"{rng.randint(0, 0xFFFFFFFF):08X}")
+        if proto.startswith("tcp"):
+            state = rng.choice(["01", "01", "01", "01", "0A", "06", "08"])
+        else:
+            state = rng.choice(["07", "01"])
+        remote = ("0" * len(ip()) + ":0000") if state in ("0A", "07") else f"{ip()}:{rng.randint(1, 65535):04X}"
+        inode = 0 if state == "06" else self.next_inode
+        self.sockets[self.next_inode] = [proto, f"{ip()}:{rng.randint(1, 65535):04X}", remote, state,
+                                         self.procs[pid]["uid"], pid, inode]
+        if inode:
+            try:
+                os.symlink(f"socket:[{inode}]", self.root / str(pid) / "fd" / str(1000 + inode))
+            except OSError:
+                pass
+
+    def _churn_sockets(self, churn: float):
+        rng = self.rng
+        for key in [k for k, s in self.sockets.items() if s[5] not in self.procs]:
+            del self.sockets[key]
+        for key in rng.sample(list(self.sockets), int(len(self.sockets) * churn)):
+            s = self.sockets.pop(key)
+            if s[6]:
+                try:
+                    os.unlink(self.root / str(s[5]) / "fd" / str(1000 + s[6]))
+                except OSError:
+                    pass
+            self._open_socket(s[5])
+        self._write_net_tables()
+
+    def _write_net_tables(self):
+        net = self.root / "net"
+        net.mkdir(exist_ok=True)
+        header = ("  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt"
+                  "   uid  timeout inode\n")
+        tables = {proto: [header] for proto in ("tcp", "tcp6", "udp", "udp6")}
+        for s in self.sockets.values():
+            rows = tables[s[0]]
+            rows.append(f"{len(rows) - 1:4d}: {s[1]} {s[2]} {s[3]} 00000000:00000000 00:00000000 00000000 "
+                        f"{s[4]:5d}        0 {s[6]} 1 0000000000000000 100 0 0 10 0\n")
+        for proto, rows in tables.items():
+            (net / proto).write_text("".join(rows))
+
+    def destroy(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else "/tmp/fakeproc"
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    FakeProc(root).build(n)
+    print(f"Built {n} fake processes under {root}")
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""AccessDenied cache + capability detection
+
+Khi chạy không có quyền root, nhiều field của process user khác (fd, exe, cwd, io...) luôn bị
+từ chối. Thay vì raise + nuốt exception mỗi tick:
+  - DenialTracker nhớ (pid, create_time, field) đã bị từ chối -> bỏ qua tới khi process đổi
+    (PID tái sử dụng sẽ có create_time khác nên key khác).
+  - detect_capabilities() thử một lần lúc khởi động: class field nào không bao giờ đọc được
+    cho process của user khác thì tắt hẳn (không thử lần nào).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter
+
+from . import procfs
+
+# field "nhạy cảm" (ptrace access mode) và file dùng để thử khi detect
+PROBES = {
+    "fds": lambda pid, root: os.listdir(f"{root}/{pid}/fd"),
+    "exe": lambda pid, root: os.readlink(f"{root}/{pid}/exe"),
+    "cwd": lambda pid, root: os.readlink(f"{root}/{pid}/cwd"),
+    "io": lambda pid, root: open(f"{root}/{pid}/io", "rb").close(),
+    "stat": lambda pid, root: open(f"{root}/{pid}/stat", "rb").close(),
+}
+# các field khác đi chung quyền với một probe
+PROBE_ALIASES = {"open_files": "fds", "connections": "fds", "smaps": "io"}
+
+CAP_DAC_READ_SEARCH = 2
+CAP_SYS_PTRACE = 19
+
+
+def _effective_caps() -> int:
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"CapEff:"):
+                    return int(line.split()[1], 16)
+    except Exception:
+        pass
+    return 0
+
+
+def proc_mount_options(root: str = procfs.PROC_ROOT) -> str:
+    """Mount options of the procfs at `root` (để đọc hidepid=...)."""
+    try:
+        with open("/proc/self/mountinfo", "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                left, _, right = line.partition(" - ")
+                parts = left.split()
+                rparts = right.split()
+                if len(parts) > 4 and parts[4] == root and rparts and rparts[0] == "proc":
+                    return rparts[2] if len(rparts) > 2 else ""
+    except Exception:
+        pass
+    return ""
+
+
+def detect_capabilities(root: str = procfs.PROC_ROOT, max_probe: int = 200) -> dict:
+    """Probe once which field classes can never be read for other users' processes."""
+    euid = os.geteuid()
+    eff = _effective_caps()
+    opts = proc_mount_options(root)
+    hidepid = ""
+    for opt in opts.split(","):
+        if opt.startswith("hidepid="):
+            hidepid = opt.split("=", 1)[1]
+    caps = {
+        "root": euid == 0,
+        "cap_sys_ptrace": bool(eff & (1 << CAP_SYS_PTRACE)),
+        "cap_dac_read_search": bool(eff & (1 << CAP_DAC_READ_SEARCH)),
+        "hidepid": hidepid,
+        "disabled_foreign": set(),
+    }
+    if caps["root"]:
+        return caps
+
+    # tìm một process của user khác rồi thử từng loại field
+    foreign = None
+    try:
+        for pid in procfs.list_pids(root)[:max_probe]:
+            try:
+                if procfs.owner_uid(pid, root) != euid:
+                    foreign = pid
+                    break
+            except OSError:
+                continue
+    except OSError:
+        return caps
+    if foreign is None:
+        return caps
+    for field, probe in PROBES.items():
+        try:
+            probe(foreign, root)
+        except PermissionError:
+            caps["disabled_foreign"].add(field)
+        except OSError:
+            pass
+    return caps
+
+
+class DenialTracker:
+    def __init__(self, caps: dict | None = None, root: str = procfs.PROC_ROOT):
+        self.root = root
+        self.caps = caps if caps is not None else {"disabled_foreign": set()}
+        self.disabled_foreign = set(self.caps.get("disabled_foreign", ()))
+        self.euid = os.geteuid()
+        self._denied = {}   # (pid, create_time) -> set(field)
+        self._foreign = {}  # (pid, create_time) -> bool
+        self.denied = Counter()   # lần bị từ chối thật (exception)
+        self.skipped = Counter()  # lần đọc được bỏ qua nhờ cache / capability
+        # mark/should_skip chạy cả từ thread nền (Properties refresh), prune/snapshot trên UI thread
+        self._lock = threading.Lock()
+
+    def _class_disabled(self, key, field: str) -> bool:
+        cls = PROBE_ALIASES.get(field, field)
+        if cls not in self.disabled_foreign:
+            return False
+        foreign = self._foreign.get(key)
+        if foreign is None:
+            try:
+                foreign = procfs.owner_uid(key[0], self.root) != self.euid
+            except OSError:
+                foreign = False
+            self._foreign[key] = foreign
+        return foreign
+
+    def should_skip(self, key, field: str) -> bool:
+        """True if reading `field` for this process is known to be denied."""
+        with self._lock:
+            fields = self._denied.get(key)
+            if (fields is not None and field in fields) or self._class_disabled(key, field):
+                self.skipped[field] += 1
+                return True
+            return False
+
+    def mark(self, key, field: str) -> None:
+        with self._lock:
+            self._denied.setdefault(key, set()).add(field)
+            self.denied[field] += 1
+
+    def known_by_pid(self) -> dict:
+        """{pid: (create_time, fields)} snapshot, picklable for scan workers."""
+        with self._lock:
+            return {k[0]: (k[1], frozenset(v)) for k, v in self._denied.items()}
+
+    def prune(self, live_keys) -> None:
+        live = set(live_keys)
+        with self._lock:
+            for k in [k for k in self._denied if k not in live]:
+                del self._denied[k]
+            for k in [k for k in self._foreign if k not in live]:
+                del self._foreign[k]
+
+    def summary(self) -> dict:
+        def fmt(counter):
+            return ", ".join(f"{k}={v}" for k, v in counter.most_common()) or "0"
+        with self._lock:
+            denied, skipped, tracked = self.denied.copy(), self.skipped.copy(), len(self._denied)
+        caps = self.caps
+        mode = "root" if caps.get("root") else "unprivileged"
+        if caps.get("cap_sys_ptrace"):
+            mode += " +CAP_SYS_PTRACE"
+        return {
+            "Privileges": mode,
+            "procfs hidepid": caps.get("hidepid") or "(none)",
+            "Disabled for other users": ", ".join(sorted(self.disabled_foreign)) or "(none)",
+            "AccessDenied (raised)": fmt(denied),
+            "AccessDenied (skipped)": fmt(skipped),
+            "Tracked denied processes": str(tracked),
+        }
@@ -16,6 +16,12 @@ from .person2_processes import ProcessesTabMixin
 from .person3_details import DetailsTabMixin
 from .person4_actions import ActionsMixin
 from .person5_other_tabs import OtherTabsMixin
+from .tracing import TRACER
+from .watchdog import StallWatchdog
+from .backends import make_source
+from .enrich import make_enricher
+from .containers import ContainerResolver, ALL_CONTAINERS
+from .procfs import PROC_ROOT
 
 HISTORY_LEN = 60
 
@@ -31,11 +37,22 @@ class TaskManagerApp(CoreMixin, ProcessesTabMixin, DetailsTabMixin, ActionsMixin
         # Nếu cấu hình bị lỗi, ta ép buộc reset lại phần hiển thị cột của tab Details
         self.cfg["details_columns"] = {
             "pid": True, "name": True, "user": True, "status": True,
-            "cpu": True, "mem": True, "nice": True, "threads": True,
-            "fds": True, "start": True, "cmd": True
+            "cpu": True, "mem": True, "pss": False, "uss": False, "swap": False, "nice": True, "threads": True,
+            "fds": True, "ctx_v": False, "ctx_i": False, "rq_wait": False,
+            "start": True, "io_r": False, "io_w": False,
+            "exe": False, "cgroup": False, "container": False, "cmd": True
         }
         # -------------------------------------------
 
+        # Nguồn dữ liệu (psutil / procfs / recorded) - UI chỉ gọi qua self.source
+        self.source = make_source(self.cfg)
+        self.enricher = make_enricher(self.source, self.cfg)
+        self.containers = ContainerResolver(getattr(self.source, "root", PROC_ROOT))
+        self.fd_index = None  # fdindex.FdIndex, tạo khi mở "Who holds this file" lần đầu
+        self._tree_rows = {}         # Treeview -> {iid: ProcRow} của lần fill gần nhất
+        self._viewport_jobs = {}
+        self._enrich_job = None
+
         self.title(APP_NAME)
         
         # Fix lỗi geometry
@@ -51,6 +68,11 @@ class TaskManagerApp(CoreMixin, ProcessesTabMixin, DetailsTabMixin, ActionsMixin
         self.details_sort_desc = True
 
         self.filter_text = tk.StringVar(value="")
+        self.cgroup_filter = None  # (label, đường dẫn cgroup): chỉ hiện process thuộc cây cgroup đó
+        self._cgroup_members = set()  # PID của cgroup_filter, đọc nền (lần đọc gần nhất)
+        self._cgroup_members_task = None
+        self.container_filter = tk.StringVar(value=ALL_CONTAINERS)
+        self.group_by_container = tk.BooleanVar(value=bool(self.cfg.get("group_by_container", False)))
         self.auto_refresh = tk.BooleanVar(value=True)
 
         self._last_refresh_ts = 0.0
@@ -61,10 +83,22 @@ class TaskManagerApp(CoreMixin, ProcessesTabMixin, DetailsTabMixin, ActionsMixin
         self.swap_hist = deque(maxlen=HISTORY_LEN)
         self.net_sent_hist = deque(maxlen=HISTORY_LEN)
         self.net_recv_hist = deque(maxlen=HISTORY_LEN)
+        self.psi_cpu_hist = deque(maxlen=HISTORY_LEN)   # % thời gian stall ("some") mỗi tick
+        self.psi_mem_hist = deque(maxlen=HISTORY_LEN)
+        self.psi_io_hist = deque(maxlen=HISTORY_LEN)
+        self.iface_hist = {}  # interface -> {"rx", "tx", "drops", "errs": deque}
 
         self._last_net = None
         self._last_net_ts = None
 
+        # Trace từ lúc khởi động: TASK_MANAGER_TRACE=/tmp/trace.json python3 run.py
+        trace_path = os.environ.get("TASK_MANAGER_TRACE", "").strip()
+        if trace_path:
+            try:
+                TRACER.start(trace_path, max_events=int(self.cfg.get("trace_buffer_events", 50000)))
+            except Exception as e:
+                print(f"Không bật được trace: {e}")
+
         # Xây dựng giao diện
         self._build_ui()
 
@@ -83,14 +117,16 @@ class TaskManagerApp(CoreMixin, ProcessesTabMixin, DetailsTabMixin, ActionsMixin
             print(">>> Đã gắn sự kiện chuyển tab thành công!")
         # -------------------------------
 
-        try:
-            psutil.cpu_percent(interval=None)
-            for p in psutil.process_iter():
-                try: p.cpu_percent(interval=None)
-                except: pass
-        except: pass
+        self.source.prime()
 
         self.after(250, self._tick)
+
+        # Watchdog phát hiện UI bị đứng (log stack vào ~/.config/py_task_manager/stalls.log)
+        self.watchdog = None
+        if self.cfg.get("stall_watchdog", True):
+            self.watchdog = StallWatchdog(self, threshold_ms=int(self.cfg.get("stall_threshold_ms", 250)))
+            self.watchdog.start()
+
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _on_tab_changed(self, event):
@@ -105,8 +141,8 @@ class TaskManagerApp(CoreMixin, ProcessesTabMixin, DetailsTabMixin, ActionsMixin
                 if hasattr(self, 'details_tree'):
                     cols = self.details_tree["columns"]
                     for c in cols:
-                        # Nếu cột nào đang bị độ rộng = 0 (bị ẩn), mở nó ra
-                        if self.details_tree.column(c, "width") < 5:
+                        # Nếu cột nào đang bị độ rộng = 0 (bị ẩn) mà config muốn hiện, mở nó ra
+                        if self.cfg["details_columns"].get(c, True) and self.details_tree.column(c, "width") < 5:
                             self.details_tree.column(c, width=80)
                 
                 # Tải dữ liệu
@@ -120,6 +156,11 @@ class TaskManagerApp(CoreMixin, ProcessesTabMixin, DetailsTabMixin, ActionsMixin
             print(f"Lỗi tab: {e}")
 
     def _on_close(self):
+        TRACER.stop()
+        if self.watchdog:
+            self.watchdog.stop()
+        self.source.close()
+        self._startup_scanner.close()
         self.cfg["geometry"] = self.winfo_geometry()
         save_cfg(self.cfg)
         self.destroy()
@@ -0,0 +1,579 @@
+# -*- coding: utf-8 -*-
+"""Data-source backends consumed by the UI
+
+    psutil   -> PsutilSource   (mặc định, giống hành vi cũ)
+    procfs   -> ProcfsSource   (đọc thẳng /proc, ít object Python hơn)
+    recorded -> RecordedSource (phát lại file snapshot .jsonl đã ghi)
+
+Chọn bằng key config "data_source". Ghi một file recording:
+    python3 -m task_manager.backends record /tmp/rec.jsonl --frames 60 --interval 1
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+from dataclasses import astuple, fields
+
+import psutil
+
+from .config import PROC_STATUS_LABEL
+from .models import ProcRow, CollectPlan, FULL_PLAN
+from . import procfs
+from .access import DenialTracker, detect_capabilities
+from .cpuacct import CpuAccounting, RateTracker
+
+ROW_FIELDS = [f.name for f in fields(ProcRow)]
+RECORDING_FORMAT = "task_manager-recording"
+# thời gian tối đa chờ các shard của một lần scan song song; quá hạn -> coi như pool hỏng
+PARALLEL_SCAN_TIMEOUT_S = 10.0
+# key của process_info() hay đổi: Properties chỉ đọc lại chúng mỗi lần auto refresh
+VOLATILE_INFO = ("status", "create_time", "nice", "cpu_seconds", "rss", "threads", "fds")
+
+
+class _Skip(Exception):
+    """Row rejected by the match() filter."""
+
+
+class DataSource:
+    """Base interface. Subclasses implement collect_rows() and _read_system()."""
+    name = "base"
+
+    def __init__(self, root: str = procfs.PROC_ROOT, detect: bool = True):
+        self.root = root
+        self._snap = None
+        self._snap_ts = 0.0
+        # cache AccessDenied theo (pid, create_time, field) + field class không bao giờ đọc được
+        self.denials = DenialTracker(detect_capabilities(root) if detect else None, root)
+        # CPU % từ delta utime+stime theo (pid, create_time); mode "core" | "machine"
+        self.cpu = CpuAccounting()
+        # cùng cơ chế delta: context switch / giây, ns chờ run-queue / giây
+        self.ctx_vol = RateTracker()
+        self.ctx_invol = RateTracker()
+        self.rq_wait = RateTracker()
+        self._psi_prev = None  # (monotonic, {key: total_us}) của snapshot trước
+
+    def _read_psi(self) -> dict:
+        """System PSI as flat snapshot keys (ghi được vào recording), {} nếu kernel không có PSI.
+
+        psi_<res>_some10 / _some60 / _full10 / _full60: avg của kernel (%);
+        psi_<res>_some_stall / _full_stall: % thời gian bị stall từ snapshot trước (delta total).
+        """
+        out = {}
+        totals = {}
+        for res in procfs.PSI_RESOURCES:
+            try:
+                psi = procfs.read_pressure(res, self.root)
+            except OSError:
+                continue
+            for kind in ("some", "full"):
+                vals = psi.get(kind)
+                if vals is None:
+                    continue
+                out[f"psi_{res}_{kind}10"], out[f"psi_{res}_{kind}60"] = vals[0], vals[1]
+                totals[f"psi_{res}_{kind}_stall"] = vals[3]
+        now = time.monotonic()
+        prev = self._psi_prev
+        for k, total in totals.items():
+            if prev is not None and now > prev[0] and k in prev[1]:
+                out[k] = max(0.0, min(100.0, (total - prev[1][k]) / ((now - prev[0]) * 1e6) * 100.0))
+            else:
+                out[k] = 0.0
+        self._psi_prev = (now, totals)
+        return out
+
+    def _rate_trackers(self):
+        return (self.cpu, self.ctx_vol, self.ctx_invol, self.rq_wait)
+
+    def _sched_rates(self, key, vol: int, invol: int, wait_ns) -> tuple[float, float, float]:
+        """(voluntary/s, involuntary/s, run-queue wait ms/s) for one process this tick."""
+        wait = self.rq_wait.update(key, wait_ns) / 1e6 if wait_ns is not None else 0.0
+        return self.ctx_vol.update(key, vol), self.ctx_invol.update(key, invol), wait
+
+    def prime(self) -> None:
+        """Warm up rate counters so the first real tick has deltas."""
+        try:
+            self.collect_rows()
+            self.system_snapshot(max_age=0)
+        except Exception:
+            pass
+
+    def collect_rows(self, match=None, plan: CollectPlan = FULL_PLAN) -> list[ProcRow]:
+        """All processes as ProcRow; `match(pid, name, user, cmd)` may drop rows early.
+
+        Fields not in `plan` may be left at their default (0 / "").
+        """
+        raise NotImplementedError
+
+    def system_snapshot(self, max_age: float = 0.25) -> dict:
+        """System totals (cpu/mem/swap/net/procs); cached briefly so status bar + perf share one read."""
+        now = time.monotonic()
+        if self._snap is None or now - self._snap_ts > max_age:
+            self._snap = self._read_system()
+            self._snap_ts = now
+        return self._snap
+
+    def _read_system(self) -> dict:
+        raise NotImplementedError
+
+    def process_info(self, pid: int, expensive: bool = True, only=None) -> dict:
+        """Best-effort details for one PID (Properties dialog). Raises psutil.NoSuchProcess/AccessDenied.
+
+        `only` giới hạn các key được đọc (vd VOLATILE_INFO cho auto refresh của Properties).
+        """
+        p = psutil.Process(pid)
+        info = {"pid": pid, "name": p.name()}
+        dkey = (pid, p.create_time())
+
+        def get(key, fn):
+            if only is not None and key not in only:
+                return
+            if self.denials.should_skip(dkey, key):
+                info[key] = None
+                return
+            try:
+                info[key] = fn()
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                raise
+            except psutil.AccessDenied:
+                self.denials.mark(dkey, key)
+                info[key] = None
+            except Exception:
+                info[key] = None
+
+        get("exe", p.exe)
+        get("cwd", p.cwd)
+        get("user", p.username)
+        get("status", p.status)
+        get("create_time", p.create_time)
+        get("nice", p.nice)
+        get("cpu_seconds", lambda: sum(p.cpu_times()[:2]))
+        if info.get("cpu_seconds") is not None:
+            info["cpu"] = self.cpu.estimate(dkey, info["cpu_seconds"])
+        else:
+            info["cpu"] = None
+        get("rss", lambda: p.memory_info().rss)
+        get("threads", p.num_threads)
+        get("fds", p.num_fds)
+        get("cmdline", lambda: " ".join(p.cmdline()))
+        if expensive:
+            get("open_files", lambda: len(p.open_files()))
+            get("connections", lambda: len(p.net_connections(kind="inet")
+                                           if hasattr(p, "net_connections") else p.connections(kind="inet")))
+        return info
+
+    def close(self) -> None:
+        pass
+
+
+# ============================================================
+# psutil
+# ============================================================
+class PsutilSource(DataSource):
+    name = "psutil"
+
+    def __init__(self):
+        super().__init__(psutil.PROCFS_PATH)
+
+    def collect_rows(self, match=None, plan: CollectPlan = FULL_PLAN) -> list[ProcRow]:
+        need = plan.fields
+        need_user = "user" in need
+        need_cmd = "cmd" in need
+        rows = []
+        live = []
+        for t in self._rate_trackers():
+            t.begin()
+        for p in psutil.process_iter():
+            try:
+                key = (p.pid, p.create_time())
+                live.append(key)
+                with p.oneshot():
+                    rows.append(self._row(p, key, need, need_user, need_cmd, match))
+            except _Skip:
+                continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            except Exception:
+                continue
+        for t in self._rate_trackers():
+            t.end(live)
+        self.denials.prune(live)
+        return rows
+
+    def _read(self, key, field: str, fn, default):
+        """One psutil field read; AccessDenied is remembered so it is not retried for this process."""
+        if self.denials.should_skip(key, field):
+            return default
+        try:
+            return fn()
+        except psutil.AccessDenied:
+            self.denials.mark(key, field)
+            return default
+        except psutil.NoSuchProcess:
+            raise
+        except Exception:
+            return default
+
+    def _row(self, p, key, need, need_user: bool, need_cmd: bool, match) -> ProcRow:
+        pid = p.pid
+        name = p.name()
+        user = self._read(key, "user", p.username, "") if need_user else ""
+
+        cmdline = ""
+        if need_cmd:
+            cmdline = " ".join(self._read(key, "cmd", p.cmdline, None) or [])
+        if match is not None and not match(pid, name, user, cmdline):
+            raise _Skip
+
+        cpu = 0.0
+        if "cpu" in need:
+            times = self._read(key, "cpu", p.cpu_times, None)
+            if times is not None:
+                cpu = self.cpu.update(key, times.user + times.system)
+
+        mem_rss = 0
+        if "mem" in need:
+            mem_rss = int(self._read(key, "mem", lambda: p.memory_info().rss, 0))
+
+        status = ""
+        if "status" in need:
+            st = self._read(key, "status", p.status, "")
+            status = PROC_STATUS_LABEL.get(st, st)
+
+        nice = 0
+        if "nice" in need:
+            nice = int(self._read(key, "nice", p.nice, 0))
+
+        threads = 0
+        if "threads" in need:
+            threads = int(self._read(key, "threads", p.num_threads, 0))
+
+        # num_fds() phải listdir /proc/<pid>/fd -> đắt nhất, chỉ đọc khi cột FDs đang hiện/sort
+        fds = 0
+        if "fds" in need and hasattr(p, "num_fds"):
+            fds = int(self._read(key, "fds", p.num_fds, 0))
+
+        start_time = float(key[1] or 0.0) if "start" in need else 0.0
+
+        row = ProcRow(
+            pid=pid, name=name, user=user or "",
+            cpu=cpu, mem_rss=mem_rss, status=status, nice=nice,
+            threads=threads, fds=fds, start_time=start_time, cmd=cmdline
+        )
+        if "sched" in need:
+            ctx = self._read(key, "sched", p.num_ctx_switches, None)
+            try:
+                wait = procfs.read_schedstat(pid, self.root)[1]
+            except OSError:
+                wait = None
+            if ctx is not None:
+                row.ctx_vol_rate, row.ctx_invol_rate, row.rq_wait = \
+                    self._sched_rates(key, ctx.voluntary, ctx.involuntary, wait)
+        return row
+
+    def _read_system(self) -> dict:
+        vm = psutil.virtual_memory()
+        sm = psutil.swap_memory()
+        try:
+            net = psutil.net_io_counters()
+            net_sent, net_recv = net.bytes_sent, net.bytes_recv
+        except Exception:
+            net_sent = net_recv = 0
+        return {
+            "cpu": psutil.cpu_percent(interval=None),
+            "mem_percent": vm.percent, "mem_used": vm.used, "mem_total": vm.total,
+            "swap_percent": sm.percent, "swap_used": sm.used, "swap_total": sm.total,
+            "net_sent": net_sent, "net_recv": net_recv,
+            "procs": len(psutil.pids()),
+            **self._read_psi(),
+        }
+
+
+# ============================================================
+# raw procfs
+# ============================================================
+class ProcfsSource(DataSource):
+    name = "procfs"
+
+    def __init__(self, root: str = procfs.PROC_ROOT, parallel: str = "off",
+                 min_pids: int = 3000, workers: int = 0):
+        super().__init__(root)
+        self._btime = procfs.boot_time(root)
+        self._prev_sys = None
+        self._npids = 0
+        # scan song song: "off" | "auto" (chỉ khi số PID >= min_pids) | "on"
+        self.parallel = parallel
+        self.min_pids = max(1, int(min_pids))
+        self.workers = int(workers) or (os.cpu_count() or 1)
+        self._pool = None
+        self.last_scan_shards = 1
+
+    # ------------------------------------------------------------
+    # Scan: serial hoặc chia shard cho process pool rồi gộp lại
+    # ------------------------------------------------------------
+    def _use_parallel(self, npids: int) -> bool:
+        if self.parallel == "on":
+            return npids > 0
+        if self.parallel == "auto":
+            return self.workers > 1 and npids >= self.min_pids
+        return False
+
+    def _get_pool(self):
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # forkserver: worker không kế thừa Tk / các thread của app
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("forkserver"))
+        return self._pool
+
+    def _scan(self, pids, need_cmd: bool, need_fds: bool, need_uid: bool, need_sched: bool = False) -> list:
+        denials = self.denials
+        common = (need_cmd, need_fds, need_uid, self._btime, denials.euid,
+                  frozenset(denials.disabled_foreign))
+        known = denials.known_by_pid()
+        if self._use_parallel(len(pids)):
+            try:
+                pool = self._get_pool()
+                # vài shard mỗi worker để cân tải; shard liền nhau -> gộp lại giữ thứ tự PID
+                nshards = min(len(pids), self.workers * 4) or 1
+                size = -(-len(pids) // nshards)
+                shards = [pids[i:i + size] for i in range(0, len(pids), size)]
+                futures = [pool.submit(procfs.scan_pids, self.root, shard, *common,
+                                       {pid: known[pid] for pid in shard if pid in known}, need_sched)
+                           for shard in shards]
+                self.last_scan_shards = len(shards)
+                deadline = time.monotonic() + PARALLEL_SCAN_TIMEOUT_S
+                return [fut.result(timeout=max(0.0, deadline - time.monotonic())) for fut in futures]
+            except Exception as e:
+                # pool hỏng (vd: không fork được) hoặc worker treo quá hạn -> quay về serial luôn
+                print(f"Parallel scan failed ({str(e) or type(e).__name__}), falling back to serial")
+                self.parallel = "off"
+                self.close()
+        self.last_scan_shards = 1
+        return [procfs.scan_pids(self.root, pids, *common, known, need_sched)]
+
+    def collect_rows(self, match=None, plan: CollectPlan = FULL_PLAN) -> list[ProcRow]:
+        need = plan.fields
+        need_user = "user" in need
+        denials = self.denials
+        cpu_acct = self.cpu
+        for t in self._rate_trackers():
+            t.begin()
+        rows = []
+        live = []
+        pids = procfs.list_pids(self.root)
+        self._npids = len(pids)
+        for records, newly, skipped in self._scan(pids, "cmd" in need, "fds" in need, need_user, "sched" in need):
+            for pid, start_time, field in newly:
+                denials.mark((pid, start_time), field)
+            denials.skipped.update(skipped)
+            for pid, name, uid, start_time, jiffies, state, nice, threads, rss, cmdline, fds, sched in records:
+                key = (pid, start_time)
+                live.append(key)
+                # CPU đo cho mọi process (kể cả bị filter) để baseline luôn mới
+                cpu = cpu_acct.update(key, jiffies / procfs.CLK_TCK)
+                user = procfs.username(uid) if need_user else ""
+                if match is not None and not match(pid, name, user, cmdline):
+                    continue
+                st = procfs.STATE_MAP.get(state, "")
+                row = ProcRow(
+                    pid=pid, name=name, user=user,
+                    cpu=cpu, mem_rss=rss * procfs.PAGE_SIZE,
+                    status=PROC_STATUS_LABEL.get(st, st), nice=nice,
+                    threads=threads, fds=fds, start_time=start_time, cmd=cmdline
+                )
+                if sched is not None:
+                    row.ctx_vol_rate, row.ctx_invol_rate, row.rq_wait = self._sched_rates(key, *sched)
+                rows.append(row)
+        for t in self._rate_trackers():
+            t.end(live)
+        denials.prune(live)
+        return rows
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _read_system(self) -> dict:
+        root = self.root
+        times = procfs.read_cpu_times(root)
+        total = sum(times[:8])
+        idle = times[3] + (times[4] if len(times) > 4 else 0)
+        cpu = 0.0
+        if self._prev_sys is not None:
+            dt = total - self._prev_sys[0]
+            if dt > 0:
+                cpu = max(0.0, min(100.0, (dt - (idle - self._prev_sys[1])) / dt * 100.0))
+        self._prev_sys = (total, idle)
+
+        mi = procfs.read_meminfo(root)
+        mem_total = mi.get("MemTotal", 0)
+        mem_used = mem_total - mi.get("MemAvailable", mi.get("MemFree", 0))
+        swap_total = mi.get("SwapTotal", 0)
+        swap_used = swap_total - mi.get("SwapFree", 0)
+        sent, recv = procfs.read_net_totals(root)
+        return {
+            "cpu": cpu,
+            "mem_percent": mem_used / mem_total * 100.0 if mem_total else 0.0,
+            "mem_used": mem_used, "mem_total": mem_total,
+            "swap_percent": swap_used / swap_total * 100.0 if swap_total else 0.0,
+            "swap_used": swap_used, "swap_total": swap_total,
+            "net_sent": sent, "net_recv": recv,
+            "procs": self._npids or len(procfs.list_pids(root)),
+            **self._read_psi(),
+        }
+
+
+# ============================================================
+# recorded snapshots (.jsonl)
+# ============================================================
+class RecordedSource(DataSource):
+    """Replay a recording. realtime=True follows the recorded timestamps; False steps one frame per collect."""
+    name = "recorded"
+
+    def __init__(self, path: str, realtime: bool = True):
+        super().__init__(detect=False)
+        self.path = path
+        self.realtime = realtime
+        self._fh = open(path, "rb")
+        header = json.loads(self._fh.readline())
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"{path}: không phải file recording của Task Manager")
+        self._fields = header.get("fields", ROW_FIELDS)
+        # chỉ lưu offset từng frame, parse khi cần -> file lớn vẫn mở nhanh
+        self._offsets = []
+        self._stamps = []
+        pos = self._fh.tell()
+        for line in self._fh:
+            if line.strip():
+                self._offsets.append(pos)
+                self._stamps.append(json.loads(line[:64].split(b",", 1)[0] + b"}")["ts"])
+            pos += len(line)
+        if not self._offsets:
+            raise ValueError(f"{path}: recording rỗng")
+        self._t0 = time.monotonic()
+        self._step = 0
+        self._cache_idx = -1
+        self._cache = None
+
+    def _frame_index(self) -> int:
+        if not self.realtime:
+            return self._step % len(self._offsets)
+        span = max(1e-6, self._stamps[-1] - self._stamps[0])
+        t = self._stamps[0] + (time.monotonic() - self._t0) % (span + 1.0)
+        idx = 0
+        for i, ts in enumerate(self._stamps):
+            if ts <= t:
+                idx = i
+            else:
+                break
+        return idx
+
+    def _frame(self) -> dict:
+        idx = self._frame_index()
+        if idx != self._cache_idx:
+            self._fh.seek(self._offsets[idx])
+            self._cache = json.loads(self._fh.readline())
+            self._cache_idx = idx
+        return self._cache
+
+    def collect_rows(self, match=None, plan: CollectPlan = FULL_PLAN) -> list[ProcRow]:
+        frame = self._frame()
+        self._step += 1
+        rows = []
+        for vals in frame["rows"]:
+            r = ProcRow(**dict(zip(self._fields, vals)))
+            if match is not None and not match(r.pid, r.name, r.user, r.cmd):
+                continue
+            rows.append(r)
+        return rows
+
+    def _read_system(self) -> dict:
+        return dict(self._frame()["system"])
+
+    def process_info(self, pid: int, expensive: bool = True, only=None) -> dict:
+        for vals in self._frame()["rows"]:
+            if vals[0] == pid:
+                r = ProcRow(**dict(zip(self._fields, vals)))
+                return {"pid": r.pid, "name": r.name, "exe": None, "cwd": None, "user": r.user,
+                        "status": r.status, "create_time": r.start_time, "nice": r.nice, "cpu": r.cpu,
+                        "rss": r.mem_rss, "threads": r.threads, "fds": r.fds, "cmdline": r.cmd}
+        raise psutil.NoSuchProcess(pid)
+
+    def close(self) -> None:
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+
+class SnapshotRecorder:
+    """Append (system, rows) frames from any source to a .jsonl recording."""
+
+    def __init__(self, path: str):
+        self._fh = open(path, "w", encoding="utf-8")
+        self._fh.write(json.dumps({"format": RECORDING_FORMAT, "version": 1, "fields": ROW_FIELDS}) + "\n")
+
+    def record(self, system: dict, rows: list[ProcRow]) -> None:
+        # "ts" phải là key đầu tiên (RecordedSource đọc nhanh timestamp từ đầu dòng)
+        frame = {"ts": time.time(), "system": system, "rows": [list(astuple(r)) for r in rows]}
+        self._fh.write(json.dumps(frame, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+SOURCES = {"psutil": PsutilSource, "procfs": ProcfsSource, "recorded": RecordedSource}
+
+
+def make_source(cfg: dict) -> DataSource:
+    """Create the backend selected by cfg["data_source"]; falls back to psutil on error."""
+    kind = cfg.get("data_source", "psutil")
+    src = None
+    try:
+        if kind == "procfs":
+            src = ProcfsSource(parallel=cfg.get("parallel_scan", "auto"),
+                               min_pids=int(cfg.get("parallel_min_pids", 3000)),
+                               workers=int(cfg.get("parallel_workers", 0)))
+        elif kind == "recorded":
+            src = RecordedSource(cfg.get("recording_path", ""))
+    except Exception as e:
+        print(f"Không dùng được data source '{kind}': {e} -> dùng psutil")
+    if src is None:
+        src = PsutilSource()
+    src.cpu = CpuAccounting(cfg.get("cpu_mode", "core"))
+    return src
+
+
+def _record_main(argv=None):
+    ap = argparse.ArgumentParser(prog="python3 -m task_manager.backends record")
+    ap.add_argument("path")
+    ap.add_argument("--frames", type=int, default=60)
+    ap.add_argument("--interval", type=float, default=1.0)
+    ap.add_argument("--source", choices=["psutil", "procfs"], default="psutil")
+    args = ap.parse_args(argv)
+
+    src = make_source({"data_source": args.source})
+    src.prime()
+    rec = SnapshotRecorder(args.path)
+    try:
+        for i in range(args.frames):
+            time.sleep(args.interval)
+            rec.record(src.system_snapshot(max_age=0), src.collect_rows())
+            print(f"\rframe {i + 1}/{args.frames}", end="", file=sys.stderr)
+    finally:
+        rec.close()
+    print(f"\nSaved -> {args.path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        _record_main(sys.argv[2:])
+    else:
+        print(__doc__)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Chạy việc chậm ngoài UI thread, nhận kết quả lại trên UI thread
+
+Tk không cho gọi widget từ thread khác, nên thread nền chỉ tính toán; kết quả được
+hỏi vòng bằng `after()` và callback luôn chạy trên main loop:
+
+    task = run_async(self, lambda: p.open_files(), on_done, timeout_s=5)
+    task.cancel()   # vd: khi đóng cửa sổ -> kết quả muộn bị bỏ qua
+
+Thread không thể bị giết: khi quá `timeout_s` callback nhận TimeoutError ngay, thread
+vẫn chạy nốt rồi kết quả của nó bị bỏ. Việc nền dùng chung một object không thread-safe
+(CgroupTree, SocketIndex...) phải hỏi `task.busy` (thread còn sống) chứ không phải
+`task.running` trước khi chạy lần mới.
+"""
+
+from __future__ import annotations
+
+import time
+import threading
+
+POLL_MS = 50
+
+
+class BackgroundTask:
+    def __init__(self, root, fn, on_done, timeout_s: float | None = None, name: str = "bg-task"):
+        self.root = root
+        self.fn = fn
+        self.on_done = on_done  # on_done(result, error) trên UI thread
+        self.timeout_s = timeout_s
+        self.cancelled = False
+        self.finished = False
+        self._result = None
+        self._error = None
+        self._event = threading.Event()
+        self._t0 = time.monotonic()
+        self._job = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "BackgroundTask":
+        self._thread.start()
+        self._job = self.root.after(POLL_MS, self._poll)
+        return self
+
+    def _run(self):
+        try:
+            self._result = self.fn()
+        except BaseException as e:  # trả mọi lỗi về UI thread
+            self._error = e
+        self._event.set()
+
+    def _poll(self):
+        self._job = None
+        if self.cancelled:
+            return
+        if self._event.is_set():
+            self._finish(self._result, self._error)
+        elif self.timeout_s is not None and time.monotonic() - self._t0 > self.timeout_s:
+            self._finish(None, TimeoutError(f"no result after {self.timeout_s:g}s"))
+        else:
+            self._job = self.root.after(POLL_MS, self._poll)
+
+    def _finish(self, result, error):
+        self.finished = True
+        try:
+            self.on_done(result, error)
+        except Exception as e:
+            print(f"Background task callback failed: {e}")
+
+    @property
+    def running(self) -> bool:
+        return not (self.finished or self.cancelled)
+
+    @property
+    def busy(self) -> bool:
+        """Result not delivered yet, or the worker thread still running after timeout/cancel."""
+        return self.running or self._thread.is_alive()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+
+def run_async(root, fn, on_done, timeout_s: float | None = None, name: str = "bg-task") -> BackgroundTask:
+    """Run `fn()` in a daemon thread; `on_done(result, error)` is called on the Tk thread."""
+    return BackgroundTask(root, fn, on_done, timeout_s, name).start()
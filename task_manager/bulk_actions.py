@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Bulk action window: một thao tác (signal / renice / affinity) cho nhiều process cùng lúc
+
+Phạm vi: các dòng đang chọn trong bảng (Processes hoặc Details), mọi dòng khớp filter hiện
+tại, hoặc các process đang chọn cùng toàn bộ con cháu. Việc xác định target và thực thi
+đều chạy nền (bulkops), chỉ hỏi xác nhận một lần, có tiến độ và bảng kết quả theo từng PID.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+from collections import Counter
+from tkinter import ttk, messagebox
+
+import psutil
+
+from . import procfs
+from .bgtask import run_async
+from .bulkops import SIGNALS, OK, BulkRun, HAVE_PIDFD, resolve_targets, parse_cpu_list
+
+SCOPES = (("selected", "Selected rows"), ("matching", "All rows matching the current filter"),
+          ("subtree", "Selected + child processes (subtree)"))
+RENICE = "Renice"
+AFFINITY = "Set CPU affinity"
+ACTIONS = [name for name, _ in SIGNALS] + [RENICE, AFFINITY]
+PROGRESS_MS = 100
+
+
+class BulkActionWindow:
+    COLS = (("pid", "PID", 80), ("name", "Process", 180), ("result", "Result", 110), ("detail", "Detail", 360))
+
+    def __init__(self, app, tree: ttk.Treeview, action: str = "SIGTERM", scope: str = "selected",
+                 run: bool = False):
+        self.app = app
+        self.tree_src = tree
+        self._task = None
+        self._runner = None
+
+        self.win = win = tk.Toplevel(app)
+        win.title("Bulk action")
+        win.geometry("820x560")
+        win.protocol("WM_DELETE_WINDOW", self.close)
+
+        top = ttk.Frame(win)
+        top.pack(fill="x", padx=10, pady=8)
+        self.scope = tk.StringVar(value=scope)
+        counts = {"selected": len(self._selected_iids()), "matching": len(self._rows())}
+        for value, label in SCOPES:
+            if value in counts:
+                label = f"{label} ({counts[value]})"
+            ttk.Radiobutton(top, text=label, value=value, variable=self.scope).pack(anchor="w")
+
+        row = ttk.Frame(win)
+        row.pack(fill="x", padx=10)
+        ttk.Label(row, text="Action:").pack(side="left")
+        self.action = tk.StringVar(value=action)
+        combo = ttk.Combobox(row, textvariable=self.action, values=ACTIONS, state="readonly", width=18)
+        combo.pack(side="left", padx=6)
+        combo.bind("<<ComboboxSelected>>", lambda e: self._action_changed())
+        self.value_label = tk.StringVar()
+        ttk.Label(row, textvariable=self.value_label).pack(side="left", padx=(10, 4))
+        self.value = tk.StringVar()
+        self.value_entry = ttk.Entry(row, textvariable=self.value, width=16)
+        self.value_entry.pack(side="left")
+        self.run_btn = ttk.Button(row, text="Run", command=self.start)
+        self.run_btn.pack(side="left", padx=(10, 4))
+        self.cancel_btn = ttk.Button(row, text="Stop", command=self._stop, state="disabled")
+        self.cancel_btn.pack(side="left")
+
+        self.progress = ttk.Progressbar(win, mode="determinate")
+        self.progress.pack(fill="x", padx=10, pady=(8, 0))
+        self.status_var = tk.StringVar(
+            value="Signal được gửi qua pidfd nên không thể trúng process mới dùng lại PID."
+            if HAVE_PIDFD else "Kernel/Python không có pidfd: dùng kill() sau khi kiểm tra danh tính process.")
+        ttk.Label(win, textvariable=self.status_var, foreground="#555555").pack(fill="x", padx=10)
+
+        self.tree = ttk.Treeview(win, columns=[c[0] for c in self.COLS], show="headings")
+        for cid, heading, width in self.COLS:
+            self.tree.heading(cid, text=heading)
+            self.tree.column(cid, width=width, anchor="w")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(6, 10))
+        ysb = ttk.Scrollbar(win, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=ysb.set)
+        ysb.place(in_=self.tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        self._action_changed()
+        if run:
+            self.start()
+
+    # ------------------------------------------------------------
+    # Target rows từ bảng nguồn
+    # ------------------------------------------------------------
+    def _rows(self) -> dict:
+        return self.app._tree_rows.get(self.tree_src, {})
+
+    def _selected_iids(self) -> list:
+        """Selected process iids; chọn một dòng nhóm (container) = mọi process trong nhóm."""
+        out = []
+        for iid in self.tree_src.selection():
+            if iid.startswith("grp:"):
+                out.extend(self.tree_src.get_children(iid))
+            else:
+                out.append(iid)
+        return list(dict.fromkeys(out))
+
+    def _scope_rows(self) -> list[tuple]:
+        """[(pid, start_time, name)] chụp lại lúc bấm Run."""
+        rows = self._rows()
+        iids = list(rows) if self.scope.get() == "matching" else self._selected_iids()
+        out = []
+        for iid in iids:
+            r = rows.get(iid)
+            if r is not None:
+                out.append((r.pid, r.start_time, r.name))
+            elif iid.isdigit():
+                out.append((int(iid), 0.0, ""))
+        return out
+
+    def _action_changed(self):
+        action = self.action.get()
+        if action == RENICE:
+            self.value_label.set("Nice (-20..19):")
+            self.value.set("10")
+            self.value_entry.state(["!disabled"])
+        elif action == AFFINITY:
+            self.value_label.set("CPUs (vd 0,2-3 hoặc *):")
+            self.value.set("*")
+            self.value_entry.state(["!disabled"])
+        else:
+            self.value_label.set("")
+            self.value.set("")
+            self.value_entry.state(["disabled"])
+
+    def _parse_action(self):
+        """(kind, value, mô tả) hoặc ValueError."""
+        action = self.action.get()
+        if action == RENICE:
+            nice = int(self.value.get().strip())
+            if not -20 <= nice <= 19:
+                raise ValueError("nice phải trong khoảng -20..19")
+            return "nice", nice, f"renice tới {nice}"
+        if action == AFFINITY:
+            cpus = parse_cpu_list(self.value.get(), psutil.cpu_count(logical=True) or 1)
+            return "affinity", cpus, f"đặt CPU affinity {sorted(cpus)}"
+        return "signal", dict(SIGNALS)[action], f"gửi {action}"
+
+    # ------------------------------------------------------------
+    # Run: resolve (nền) -> một lần xác nhận -> thực thi (nền)
+    # ------------------------------------------------------------
+    def start(self):
+        if self._task is not None and self._task.running:
+            return
+        try:
+            kind, value, desc = self._parse_action()
+        except ValueError as e:
+            messagebox.showerror("Bulk action", str(e), parent=self.win)
+            return
+        rows = self._scope_rows()
+        if not rows:
+            messagebox.showinfo("Bulk action", "Không có process nào trong phạm vi đã chọn.", parent=self.win)
+            return
+        root = getattr(self.app.source, "root", procfs.PROC_ROOT)
+        subtree = self.scope.get() == "subtree"
+        self.status_var.set("Đang xác định danh sách process...")
+        self.run_btn.state(["disabled"])
+        self._task = run_async(self.app, lambda: resolve_targets(rows, subtree, root),
+                               lambda res, err: self._confirm(kind, value, desc, root, res, err),
+                               timeout_s=30.0, name="bulk-resolve")
+
+    def _confirm(self, kind, value, desc, root, result, error):
+        self._task = None
+        if not self.win.winfo_exists():
+            return
+        self.run_btn.state(["!disabled"])
+        if error is not None:
+            self.status_var.set(f"Lỗi: {error}")
+            return
+        targets, gone = result
+        if not targets:
+            self.status_var.set(f"Không còn process nào để xử lý ({gone} đã thoát).")
+            return
+        names = Counter(t.name for t in targets).most_common(6)
+        listing = ", ".join(f"{n} ×{c}" if c > 1 else n for n, c in names)
+        if len(names) == 6:
+            listing += ", ..."
+        extra = f"\n({gone} process đã thoát hoặc PID đã bị dùng lại, bỏ qua.)" if gone else ""
+        if not messagebox.askyesno("Confirm", f"{desc.capitalize()} cho {len(targets)} process?\n\n{listing}{extra}",
+                                   parent=self.win):
+            self.status_var.set("Đã hủy.")
+            return
+        self._execute(BulkRun(targets, kind, value, root), desc)
+
+    def _execute(self, runner: BulkRun, desc: str):
+        self._runner = runner
+        self.tree.delete(*self.tree.get_children())
+        self.progress.configure(maximum=len(runner.targets), value=0)
+        self.run_btn.state(["disabled"])
+        self.cancel_btn.state(["!disabled"])
+        self._task = run_async(self.app, runner.run, lambda res, err: self._finished(desc, err),
+                               timeout_s=None, name="bulk-action")
+        self._progress()
+
+    def _progress(self):
+        runner = self._runner
+        if runner is None or not self.win.winfo_exists():
+            return
+        self.progress.configure(value=runner.done)
+        self.status_var.set(f"Đang xử lý {runner.done}/{len(runner.targets)}...")
+        if self._task is not None and self._task.running:
+            self.win.after(PROGRESS_MS, self._progress)
+
+    def _stop(self):
+        if self._runner is not None:
+            self._runner.cancelled = True
+
+    def _finished(self, desc: str, error):
+        self._task = None
+        runner = self._runner
+        if not self.win.winfo_exists():
+            return
+        self.run_btn.state(["!disabled"])
+        self.cancel_btn.state(["disabled"])
+        self.progress.configure(value=runner.done)
+        # lỗi lên đầu: với 500 dòng "ok" người dùng cần thấy ngay cái gì thất bại
+        for i, (pid, name, result, detail) in enumerate(sorted(runner.results, key=lambda r: r[2] == OK)):
+            self.tree.insert("", "end", iid=str(i), values=(pid, name, result, detail))
+        summary = ", ".join(f"{n} {r}" for r, n in runner.summary().items())
+        left = len(runner.targets) - runner.done
+        msg = f"Đã {desc}: {summary or 'không có gì'}."
+        if left:
+            msg += f" Dừng giữa chừng, {left} process chưa xử lý."
+        if runner.via_pidfd:
+            msg += f" ({runner.via_pidfd} signal qua pidfd)"
+        if error is not None:
+            msg += f" Lỗi: {error}"
+        self.status_var.set(msg)
+        self.app.refresh_processes(force=True)
+        self.app.refresh_details(force=True)
+
+    def close(self):
+        # đóng cửa sổ = dừng các PID còn lại (không để thao tác chạy tiếp mà không thấy kết quả)
+        self._stop()
+        if self._task is not None:
+            self._task.cancel()
+        self.win.destroy()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Bulk process actions (signal / renice / affinity) on many PIDs, chạy trong thread nền
+
+Một target là (pid, start_time, name): start_time (btime + starttime/CLK_TCK, cùng công thức
+với ProcRow.start_time) là "danh tính" của process lúc người dùng xác nhận. Trước mỗi thao
+tác start_time được đọc lại; khác -> PID đã bị dùng lại cho process khác, bỏ qua.
+
+Signal đi qua pidfd (Linux >= 5.3, Python >= 3.9): pidfd được mở *trước* khi kiểm tra danh
+tính, nên nếu kiểm tra khớp thì pidfd chắc chắn trỏ đúng process đó, và signal gửi qua nó
+không thể rơi vào process mới mang cùng PID. Không có pidfd thì dùng os.kill ngay sau bước
+kiểm tra (vẫn còn một khe race rất nhỏ). setpriority / sched_setaffinity không có bản pidfd:
+chúng chỉ được bảo vệ bằng bước kiểm tra danh tính ngay trước đó.
+
+Phạm vi target:
+  * các dòng đang chọn (multi-select) hoặc mọi dòng khớp filter hiện tại của bảng,
+  * subtree: process đã chọn + toàn bộ con cháu (theo ppid trong /proc/<pid>/stat).
+Chính app (os.getpid()) và PID 1 không bao giờ nằm trong target.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+from typing import NamedTuple
+
+from . import procfs
+
+SIGNALS = (("SIGTERM", signal.SIGTERM), ("SIGKILL", signal.SIGKILL), ("SIGSTOP", signal.SIGSTOP),
+           ("SIGCONT", signal.SIGCONT), ("SIGHUP", signal.SIGHUP), ("SIGINT", signal.SIGINT))
+
+# kết quả cho từng PID
+OK = "ok"
+EXITED = "exited"
+REUSED = "PID reused"
+DENIED = "denied"
+ERROR = "error"
+
+HAVE_PIDFD = hasattr(os, "pidfd_open") and hasattr(signal, "pidfd_send_signal")
+
+
+class Target(NamedTuple):
+    pid: int
+    start_time: float
+    name: str
+
+
+def _read_identity(pid: int, root: str, btime: float) -> tuple[str, int, float]:
+    """(comm, ppid, start_time) từ /proc/<pid>/stat."""
+    comm, f = procfs.read_stat(pid, root)
+    return comm, int(f[procfs.STAT_PPID]), btime + int(f[procfs.STAT_STARTTIME]) / procfs.CLK_TCK
+
+
+def _same_start(a: float, b: float) -> bool:
+    return abs(a - b) < 0.5 / procfs.CLK_TCK
+
+
+def _excluded(pid: int) -> bool:
+    return pid <= 1 or pid == os.getpid()
+
+
+def resolve_targets(rows, subtree: bool = False, root: str = procfs.PROC_ROOT) -> tuple[list[Target], int]:
+    """(targets, số process đã thoát / đổi danh tính) cho các (pid, start_time, name) đã chọn.
+
+    `subtree` thêm mọi con cháu đang sống của các process đó (đọc ppid của toàn bộ /proc một lần).
+    """
+    btime = procfs.boot_time(root)
+    out = {}
+    gone = 0
+    for pid, start_time, name in rows:
+        if _excluded(pid):
+            continue
+        try:
+            comm, _ppid, now = _read_identity(pid, root, btime)
+        except (OSError, ValueError, IndexError):
+            gone += 1
+            continue
+        if start_time and not _same_start(start_time, now):
+            gone += 1
+            continue
+        out[pid] = Target(pid, now, name or comm)
+    if subtree and out:
+        children = {}
+        info = {}
+        for pid in procfs.list_pids(root):
+            try:
+                comm, ppid, start = _read_identity(pid, root, btime)
+            except (OSError, ValueError, IndexError):
+                continue
+            children.setdefault(ppid, []).append(pid)
+            info[pid] = (comm, start)
+        stack = list(out)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in out and not _excluded(child):
+                    comm, start = info[child]
+                    out[child] = Target(child, start, comm)
+                    stack.append(child)
+    return list(out.values()), gone
+
+
+def parse_cpu_list(text: str, ncpu: int) -> set[int]:
+    """"0,2-5" / "*" -> {0, 2, 3, 4, 5}; ValueError khi sai cú pháp hoặc ngoài [0, ncpu)."""
+    text = text.strip()
+    if text == "*":
+        return set(range(ncpu))
+    cpus = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        lo = int(lo)
+        hi = int(hi) if hi else lo
+        if lo > hi:
+            raise ValueError(f"khoảng CPU sai: {part}")
+        cpus.update(range(lo, hi + 1))
+    if not cpus or max(cpus) >= ncpu or min(cpus) < 0:
+        raise ValueError(f"CPU phải nằm trong 0..{ncpu - 1}")
+    return cpus
+
+
+class BulkRun:
+    """One action applied to many targets; `run()` chạy nền, UI đọc `done` để hiện tiến độ.
+
+    kind: "signal" (value = số signal), "nice" (value = nice) hoặc "affinity" (value = set CPU).
+    """
+
+    def __init__(self, targets: list[Target], kind: str, value, root: str = procfs.PROC_ROOT):
+        self.targets = targets
+        self.kind = kind
+        self.value = value
+        self.root = root
+        self.done = 0
+        self.cancelled = False
+        self.results = []  # [(pid, name, result, detail)]
+        self.via_pidfd = 0
+        self._btime = procfs.boot_time(root)
+
+    def run(self) -> list[tuple]:
+        for t in self.targets:
+            if self.cancelled:
+                break
+            result, detail = self._apply(t)
+            self.results.append((t.pid, t.name, result, detail))
+            self.done += 1
+        return self.results
+
+    def _apply(self, t: Target) -> tuple[str, str]:
+        fd = None
+        if HAVE_PIDFD and self.kind == "signal":
+            try:
+                fd = os.pidfd_open(t.pid)
+            except ProcessLookupError:
+                return EXITED, ""
+            except OSError:
+                fd = None  # kernel cũ (ENOSYS) / seccomp: quay về os.kill
+        try:
+            try:
+                _comm, _ppid, now = _read_identity(t.pid, self.root, self._btime)
+            except (OSError, ValueError, IndexError):
+                return EXITED, ""
+            if not _same_start(t.start_time, now):
+                return REUSED, "PID thuộc về process khác, bỏ qua"
+            if self.kind == "signal":
+                if fd is not None:
+                    signal.pidfd_send_signal(fd, self.value)
+                    self.via_pidfd += 1
+                else:
+                    os.kill(t.pid, self.value)
+            elif self.kind == "nice":
+                os.setpriority(os.PRIO_PROCESS, t.pid, self.value)
+            else:
+                os.sched_setaffinity(t.pid, self.value)
+            return OK, ""
+        except PermissionError:
+            return DENIED, "không đủ quyền"
+        except ProcessLookupError:
+            return EXITED, ""
+        except OSError as e:
+            return ERROR, e.strerror or str(e)
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def summary(self) -> dict:
+        """{result: count} theo thứ tự OK, EXITED, REUSED, DENIED, ERROR (bỏ mục 0)."""
+        counts = {}
+        for _pid, _name, result, _detail in self.results:
+            counts[result] = counts.get(result, 0) + 1
+        return {r: counts[r] for r in (OK, EXITED, REUSED, DENIED, ERROR) if r in counts}
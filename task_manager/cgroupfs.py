@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""cgroup v2 resource accounting (đọc thẳng /sys/fs/cgroup, không gọi subprocess)
+
+Mỗi systemd unit có một cgroup riêng, vd `system.slice/nginx.service`, unit template nằm
+trong slice con: `system.slice/system-getty.slice/getty@tty1.service`. Các file được đọc:
+
+  cpu.stat        usage_usec (tổng CPU time, µs)
+  memory.current  bytes đang dùng
+  memory.peak     đỉnh bytes (kernel >= 5.19; không có thì để trống)
+  io.stat         rbytes= / wbytes= cộng qua mọi device
+  pids.current    số task
+  *.pressure      PSI "some" avg10 (%) của cpu / memory / io
+
+CPU % và I/O bytes/s tính từ delta giữa hai lần đọc (cpuacct.RateTracker). Trên máy
+cgroup v1 (không có cgroup.controllers ở gốc) mọi giá trị là None.
+
+CgroupTree đi cả cây (slice, scope, container...) cho tab Cgroups, đọc thêm PSI
+(`*.pressure`), throttling (`cpu.stat`) và số process (`cgroup.procs`). Danh sách thư mục
+con chỉ được đọc lại khi (mtime, nlink) của thư mục đổi: kernfs không phải lúc nào cũng
+cập nhật mtime, nhưng nlink = 2 + số thư mục con luôn đúng; thêm một lần quét đầy đủ
+định kỳ cho trường hợp vừa thêm vừa xóa trong cùng một nhịp.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from .cpuacct import CpuAccounting, RateTracker
+from .procfs import PSI_RESOURCES, parse_pressure
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+SYSTEM_SLICE = "system.slice"
+
+
+def is_cgroup2(root: str = CGROUP_ROOT) -> bool:
+    return os.path.exists(os.path.join(root, "cgroup.controllers"))
+
+
+def _escape(name: str) -> str:
+    """systemd unit-name escaping for a slice component ("-" -> "\\x2d")."""
+    return name.replace("-", "\\x2d")
+
+
+def unit_cgroup_dir(unit: str, root: str = CGROUP_ROOT) -> str:
+    """cgroup directory of a system service unit (template instances live in system-<name>.slice)."""
+    if "@" in unit:
+        prefix = unit.split("@", 1)[0]
+        return os.path.join(root, SYSTEM_SLICE, f"system-{_escape(prefix)}.slice", unit)
+    return os.path.join(root, SYSTEM_SLICE, unit)
+
+
+def _read_int(path: str):
+    try:
+        with open(path, "rb") as f:
+            data = f.read().strip()
+    except OSError:
+        return None
+    if data == b"max":
+        return None
+    try:
+        return int(data)
+    except ValueError:
+        return None
+
+
+def parse_flat_keyed(data: bytes) -> dict:
+    """`key value` lines (cpu.stat, memory.stat...) -> {key: int}."""
+    out = {}
+    for line in data.splitlines():
+        k, _, v = line.partition(b" ")
+        try:
+            out[k.decode()] = int(v)
+        except ValueError:
+            pass
+    return out
+
+
+def pressure_avg10(data: bytes, kind: str = "some"):
+    """avg10 of the "some" (or "full") line of a PSI file (cpu/memory/io.pressure), or None."""
+    vals = parse_pressure(data).get(kind)
+    return vals[0] if vals else None
+
+
+def _read_bytes(path: str):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def read_procs(path: str) -> list[int]:
+    """PIDs directly in one cgroup (cgroup.procs)."""
+    data = _read_bytes(os.path.join(path, "cgroup.procs"))
+    return [int(x) for x in data.split()] if data else []
+
+
+def cgroup_pids(path: str) -> set[int]:
+    """PIDs of a cgroup and all of its descendants."""
+    pids = set()
+    for dirpath, _dirs, _files in os.walk(path):
+        pids.update(read_procs(dirpath))
+    return pids
+
+
+def subtree_pids(nodes: dict, rel: str) -> set[int]:
+    """PIDs of node `rel` and its descendants in a CgroupTree.scan() result (không đọc lại cgroupfs)."""
+    pids = set()
+    stack = [rel]
+    while stack:
+        node = nodes.get(stack.pop())
+        if node is not None:
+            pids.update(node["pids"])
+            stack.extend(node["children"])
+    return pids
+
+
+def parse_io_stat(data: bytes) -> tuple[int, int]:
+    """(rbytes, wbytes) summed over every device line of io.stat."""
+    rbytes = wbytes = 0
+    for line in data.splitlines():
+        for kv in line.split()[1:]:
+            if kv.startswith(b"rbytes="):
+                rbytes += int(kv[7:])
+            elif kv.startswith(b"wbytes="):
+                wbytes += int(kv[7:])
+    return rbytes, wbytes
+
+
+def read_cgroup_pressure(path: str) -> dict:
+    """{psi_cpu, psi_memory, psi_io}: "some" avg10 (%) of one cgroup; None khi không có PSI."""
+    out = {}
+    for res in PSI_RESOURCES:
+        data = _read_bytes(os.path.join(path, f"{res}.pressure"))
+        out[f"psi_{res}"] = pressure_avg10(data) if data else None
+    return out
+
+
+def read_cgroup(path: str):
+    """Raw counters of one cgroup dir, or None when it does not exist (unit inactive / cgroup v1).
+
+    Returns dict(cpu_usec, throttled_usec, nr_throttled, mem_current, mem_peak, io_rbytes,
+    io_wbytes, tasks); các file riêng lẻ thiếu (controller không bật cho unit) -> None.
+    """
+    try:
+        with open(os.path.join(path, "cpu.stat"), "rb") as f:
+            cpu_stat = parse_flat_keyed(f.read())
+    except FileNotFoundError:
+        if not os.path.isdir(path):
+            return None
+        cpu_stat = {}
+    except OSError:
+        cpu_stat = {}
+    try:
+        with open(os.path.join(path, "io.stat"), "rb") as f:
+            io = parse_io_stat(f.read())
+    except OSError:
+        io = (None, None)
+    return {
+        "cpu_usec": cpu_stat.get("usage_usec"),
+        "throttled_usec": cpu_stat.get("throttled_usec"),
+        "nr_throttled": cpu_stat.get("nr_throttled"),
+        "mem_current": _read_int(os.path.join(path, "memory.current")),
+        "mem_peak": _read_int(os.path.join(path, "memory.peak")),
+        "io_rbytes": io[0],
+        "io_wbytes": io[1],
+        "tasks": _read_int(os.path.join(path, "pids.current")),
+    }
+
+
+class UnitAccounting:
+    """Per-unit CPU %, memory, I/O bytes/s and task count from successive cgroup reads.
+
+    `sample(units)` chạy được trong thread nền (không đụng Tk); chỉ một lần sample được
+    chạy tại một thời điểm (Services tab gộp các lần refresh chồng nhau).
+    """
+
+    def __init__(self, root: str = CGROUP_ROOT, cpu_mode: str = "core"):
+        self.root = root
+        self.cpu = CpuAccounting(cpu_mode)
+        self.io_read = RateTracker()
+        self.io_write = RateTracker()
+
+    def sample(self, units) -> dict:
+        """{unit: dict(cpu, mem, peak, io_r, io_w, tasks, psi_cpu, psi_memory, psi_io)}; unit không có cgroup bị bỏ qua."""
+        if not is_cgroup2(self.root):
+            return {}
+        out = {}
+        live = []
+        trackers = (self.cpu, self.io_read, self.io_write)
+        for t in trackers:
+            t.begin()
+        for unit in units:
+            path = unit_cgroup_dir(unit, self.root)
+            raw = read_cgroup(path)
+            if raw is None:
+                continue
+            # key (unit, None): lần đầu thấy -> rate 0 (không biết tuổi cgroup), từ lần sau là delta
+            key = (unit, None)
+            live.append(key)
+            cpu_usec, rb, wb = raw["cpu_usec"], raw["io_rbytes"], raw["io_wbytes"]
+            out[unit] = {
+                "cpu": self.cpu.update(key, cpu_usec / 1e6) if cpu_usec is not None else None,
+                "mem": raw["mem_current"],
+                "peak": raw["mem_peak"],
+                "io_r": self.io_read.update(key, rb) if rb is not None else None,
+                "io_w": self.io_write.update(key, wb) if wb is not None else None,
+                "tasks": raw["tasks"],
+                **read_cgroup_pressure(path),
+            }
+        for t in trackers:
+            t.end(live)
+        return out
+
+
+class CgroupTree:
+    """Incremental walk of the whole cgroup v2 hierarchy with per-node rates.
+
+    `scan()` chạy được trong thread nền; trả về {rel: node}, rel "" là gốc, "user.slice/..."
+    là con. node = dict(name, parent, children, cpu, mem, io_r, io_w, psi_cpu, psi_memory,
+    psi_io, throttled, nr_throttled, pids, procs, procs_total).
+    """
+
+    def __init__(self, root: str = CGROUP_ROOT, cpu_mode: str = "core", full_rescan_s: float = 30.0):
+        self.root = root
+        self.full_rescan_s = full_rescan_s
+        self.cpu = CpuAccounting(cpu_mode)
+        self.io_read = RateTracker()
+        self.io_write = RateTracker()
+        self.throttled = RateTracker()
+        self._dirs = {}  # rel -> ((mtime_ns, nlink), children rel tuple)
+        self._last_full = 0.0
+        self.listed = 0  # số thư mục phải listdir ở lần scan gần nhất
+
+    def _children(self, rel: str, full: bool) -> tuple:
+        path = os.path.join(self.root, rel) if rel else self.root
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_nlink)
+        cached = self._dirs.get(rel)
+        if cached is not None and cached[0] == sig and not full:
+            return cached[1]
+        self.listed += 1
+        with os.scandir(path) as it:
+            kids = tuple(sorted(f"{rel}/{e.name}" if rel else e.name
+                                for e in it if e.is_dir(follow_symlinks=False)))
+        self._dirs[rel] = (sig, kids)
+        return kids
+
+    def _walk(self) -> dict:
+        """rel -> (parent rel, children) for every reachable cgroup."""
+        now = time.monotonic()
+        full = now - self._last_full >= self.full_rescan_s
+        if full:
+            self._last_full = now
+        self.listed = 0
+        tree = {}
+        stack = [("", None)]
+        while stack:
+            rel, parent = stack.pop()
+            try:
+                kids = self._children(rel, full)
+            except OSError:
+                continue  # cgroup vừa bị xóa
+            tree[rel] = (parent, kids)
+            stack.extend((k, rel) for k in kids)
+        for rel in self._dirs.keys() - tree.keys():
+            del self._dirs[rel]
+        return tree
+
+    def scan(self) -> dict:
+        if not is_cgroup2(self.root):
+            return {}
+        tree = self._walk()
+        trackers = (self.cpu, self.io_read, self.io_write, self.throttled)
+        for t in trackers:
+            t.begin()
+        nodes = {}
+        live = []
+        for rel, (parent, kids) in tree.items():
+            path = os.path.join(self.root, rel) if rel else self.root
+            raw = read_cgroup(path)
+            if raw is None:
+                continue
+            key = (rel, None)
+            live.append(key)
+            node = {
+                "name": rel.rsplit("/", 1)[-1] if rel else "/",
+                "parent": parent, "children": kids,
+                "cpu": self._rate(self.cpu, key, raw["cpu_usec"], 1e6),
+                "mem": raw["mem_current"],
+                "io_r": self._rate(self.io_read, key, raw["io_rbytes"]),
+                "io_w": self._rate(self.io_write, key, raw["io_wbytes"]),
+                # ms bị throttle mỗi giây
+                "throttled": self._rate(self.throttled, key, raw["throttled_usec"], 1e3),
+                "nr_throttled": raw["nr_throttled"],
+                "tasks": raw["tasks"],
+                "pids": read_procs(path),
+            }
+            node["procs"] = len(node["pids"])
+            node.update(read_cgroup_pressure(path))
+            nodes[rel] = node
+        for t in trackers:
+            t.end(live)
+        # số process của cả cây con (cgroup.procs chỉ có thành viên trực tiếp)
+        for rel in sorted(nodes, key=lambda r: r.count("/") if r else -1, reverse=True):
+            node = nodes[rel]
+            node["procs_total"] = node["procs"] + sum(nodes[k]["procs_total"] for k in node["children"]
+                                                      if k in nodes)
+        return nodes
+
+    @staticmethod
+    def _rate(tracker, key, counter, divisor: float = 1.0):
+        return tracker.update(key, counter / divisor) if counter is not None else None
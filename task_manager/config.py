@@ -15,22 +15,59 @@ DEFAULT_CFG = {
     "show_system_processes": True,
     "columns": {  # tab Processes
         "pid": True, "name": True, "user": True,
-        "cpu": True, "mem": True, "status": True,
+        "cpu": True, "mem": True, "pss": False, "uss": False, "swap": False, "status": True,
         "nice": True, "threads": False, "fds": False,
-        "start": False, "cmd": True,
+        "ctx_v": False, "ctx_i": False, "rq_wait": False,
+        "start": False, "io_r": False, "io_w": False,
+        "exe": False, "cgroup": False, "container": False, "cmd": True,
     },
     "details_columns": {  # tab Details
         "pid": True, "name": True, "user": True, "status": True,
-        "cpu": True, "mem": True, "nice": True, "threads": True,
-        "fds": True, "start": True, "cmd": True,
+        "cpu": True, "mem": True, "pss": False, "uss": False, "swap": False, "nice": True, "threads": True,
+        "fds": True, "ctx_v": False, "ctx_i": False, "rq_wait": False,
+        "start": True, "io_r": False, "io_w": False,
+        "exe": False, "cgroup": False, "container": False, "cmd": True,
     },
     "geometry": "1180x720",
+    "data_source": "psutil",  # psutil | procfs | recorded
+    "recording_path": "",     # file .jsonl cho data_source = recorded
+    "cpu_mode": "core",       # CPU %: core (% của 1 core, top) | machine (% cả máy, Windows)
+    "parallel_scan": "auto",  # procfs: off | auto | on (chia PID cho process pool)
+    "parallel_min_pids": 3000,  # auto: dưới số PID này scan serial (song song không có lợi)
+    "parallel_workers": 0,      # 0 = số CPU
+    "trace_buffer_events": 50000,  # số event tối đa giữ trong RAM trước khi ghi ra file
+    "stall_watchdog": True,
+    "stall_threshold_ms": 250,
+    "enrich_budget_ms": 8,         # thời gian tối đa mỗi lần lấp field lazy trong nền
+    "enrich_max_age_s": 5.0,       # giá trị lazy cũ hơn thế này sẽ được đọc lại
+    "enrich_viewport_margin": 20,  # số dòng ngoài viewport vẫn được đọc ngay
+    "smaps_budget_ms": 15,         # PSS/USS/Swap: thời gian tối đa đọc smaps_rollup mỗi tick
+    "smaps_max_age_s": 10.0,       # giá trị PSS/USS/Swap cũ hơn thế này sẽ được đọc lại
+    "users_mem_metric": "rss",     # tab Users cộng Memory theo rss | pss
+    "props_refresh_ms": 1000,      # Properties: nhịp tự refresh các field hay đổi
+    "props_section_timeout_s": 5.0,  # Properties: timeout cho open files / connections
+    "threads_refresh_ms": 1000,    # Threads: nhịp refresh riêng của cửa sổ
+    "memmap_budget_ms": 20,        # Memory map: thời gian parse smaps mỗi lượt (UI vẫn mượt)
+    "services_max_age_s": 5.0,     # Services: danh sách unit cũ hơn thế này mới tải lại (tải nền)
+    "services_timeout_s": 5.0,     # Services: timeout cho systemctl list-units
+    "cgroup_root": "/sys/fs/cgroup",  # Services/Cgroups: gốc cgroup v2
+    "cgroup_full_rescan_s": 30.0,  # Cgroups: listdir lại toàn cây sau mỗi khoảng này
+    "group_by_container": False,   # Processes: gộp process theo container / pod
+    "psi_alert_cpu": 50.0,         # cảnh báo khi PSI "some" avg10 (%) vượt ngưỡng (0 = tắt)
+    "psi_alert_memory": 10.0,
+    "psi_alert_io": 30.0,
+    "conn_scan_budget_ms": 50,     # Connections: thời gian tối đa quét lại fd của process cũ mỗi tick
+    "conn_max_rows": 5000,         # Connections: số dòng tối đa trên bảng (lọc/sort trước khi cắt)
+    "fd_index_full_rescan_s": 60.0,  # Who holds this file: đọc lại mọi fd sau mỗi khoảng này
+    "net_hidden_kinds": ["loopback", "veth"],  # Performance: loại interface không hiện (bridge, virtual...)
 }
 
 HISTORY_LEN = 60  # Lưu lịch sử 60 điểm cho biểu đồ
 
 USER_AUTOSTART_DIR = Path.home() / ".config" / "autostart"
 SYS_AUTOSTART_DIRS = [Path("/etc/xdg/autostart")]
+USER_SYSTEMD_DIR = Path.home() / ".config" / "systemd" / "user"
+SYS_USER_SYSTEMD_DIRS = [Path("/etc/systemd/user")]
 
 PROC_STATUS_LABEL = {
     "running": "Running",
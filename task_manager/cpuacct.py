@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Per-process CPU accounting from utime+stime deltas
+
+Không dùng p.cpu_percent() nữa (state nằm trong từng psutil.Process, process mới luôn 0.0 ở tick đầu).
+Mỗi tick source đưa vào tổng CPU time (giây) của từng process, key là (pid, create_time):
+  - đã thấy ở tick trước -> delta CPU time / delta thời gian (monotonic)
+  - lần đầu thấy        -> trung bình cả đời: CPU time / tuổi process (create_time -> bây giờ)
+
+Hai chế độ hiển thị:
+  core    : % của một core (process dùng hết 2 core = 200%)
+  machine : % của cả máy (chia cho số CPU, tổng mọi process <= 100%)
+
+RateTracker là phần delta dùng chung, cũng dùng cho các bộ đếm khác (context switch,
+thời gian chờ run-queue...).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+CPU_MODES = {"core": "Percent of one core", "machine": "Percent of machine"}
+
+# khoảng thời gian quá nhỏ để chia (process vừa sinh / vừa đo) -> tránh số ảo kiểu 5000%
+MIN_AGE_S = 0.05
+
+
+class RateTracker:
+    """Per-second rate of a monotonically increasing per-process counter."""
+
+    def __init__(self):
+        self._prev = {}  # (pid, create_time) -> (counter, monotonic ts, raw rate)
+        self._cur = {}
+        self._now = time.monotonic()
+        self._wall = time.time()
+
+    def _scale(self, rate: float) -> float:
+        return max(0.0, rate)
+
+    def begin(self) -> None:
+        """Start a sampling pass (one timestamp shared by every process of the tick)."""
+        self._now = time.monotonic()
+        self._wall = time.time()
+        self._cur = {}
+
+    def update(self, key, counter: float) -> float:
+        """Record this tick's counter value for `key` and return its rate."""
+        last = self._prev.get(key)
+        if last is not None and self._now - last[1] < MIN_AGE_S:
+            # hai tick sát nhau (refresh ép ngay sau tick thường): delta quá ngắn để tin,
+            # giữ baseline cũ và trả lại rate đã đo
+            self._cur[key] = last
+            return self._scale(last[2])
+        raw = self._raw(key, counter, self._now, self._wall)
+        self._cur[key] = (counter, self._now, raw)
+        return self._scale(raw)
+
+    def end(self, live_keys=None) -> None:
+        """Finish the pass: samples of this tick become the baseline.
+
+        Process còn sống nhưng không được đo tick này (vd: bị filter loại trước khi đọc CPU)
+        giữ mẫu cũ, để khi hiện lại vẫn có delta đúng.
+        """
+        cur = self._cur
+        if live_keys is not None:
+            prev = self._prev
+            for key in live_keys:
+                if key not in cur and key in prev:
+                    cur[key] = prev[key]
+        self._prev = cur
+        self._cur = {}
+
+    def estimate(self, key, counter: float) -> float:
+        """Rate for one process right now, without touching the tick baseline (Properties...)."""
+        now = time.monotonic()
+        last = self._prev.get(key)
+        if last is not None and now - last[1] < MIN_AGE_S:
+            return self._scale(last[2])  # vừa đo ở tick này -> dùng luôn giá trị tick
+        return self._scale(self._raw(key, counter, now, time.time()))
+
+    def _raw(self, key, counter: float, now: float, wall: float) -> float:
+        """Delta since the last sample per second, else average over the process lifetime."""
+        last = self._prev.get(key)
+        if last is not None and now > last[1]:
+            return (counter - last[0]) / (now - last[1])
+        age = wall - float(key[1] or 0.0)
+        if not key[1] or age < MIN_AGE_S:
+            return 0.0
+        return counter / age
+
+
+class CpuAccounting(RateTracker):
+    """CPU % from total CPU seconds (utime+stime), in "core" or "machine" mode."""
+
+    def __init__(self, mode: str = "core", ncpu: int | None = None):
+        super().__init__()
+        self.mode = mode if mode in CPU_MODES else "core"
+        self.ncpu = max(1, ncpu or os.cpu_count() or 1)
+
+    def _scale(self, rate: float) -> float:
+        """Raw CPU seconds per second -> percent in the selected mode (clamped to the machine)."""
+        pct = max(0.0, min(rate * 100.0, 100.0 * self.ncpu))
+        return pct / self.ncpu if self.mode == "machine" else pct
+
+    def percent(self, rate: float) -> float:
+        """CPU seconds per second measured by the caller -> percent in the current mode."""
+        return self._scale(rate)
+
+    def to_machine(self, value: float) -> float:
+        """Convert a value produced in the current mode to percent of machine."""
+        return value if self.mode == "machine" else value / self.ncpu
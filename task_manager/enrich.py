@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Lazy enrichment of expensive per-process fields
+
+Các field đắt (số FD, exe, cgroup, tốc độ I/O) không đọc cho mọi process mỗi tick nữa:
+chỉ đọc cho các dòng đang nằm trong (hoặc gần) viewport của Treeview, cộng với mọi dòng
+nếu đang sort theo field đó. Phần còn lại được lấp dần trong nền với ngân sách thời gian nhỏ.
+Mỗi giá trị lưu kèm thời điểm đọc, key là (pid, start_time) để PID tái sử dụng không lẫn cache.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+
+from . import procfs
+from .utils import fmt_bytes
+
+# cột lazy -> "source" đọc ra nó (io_r / io_w chung một lần đọc /proc/<pid>/io)
+LAZY_COLUMNS = {"fds": "fds", "exe": "exe", "cgroup": "cgroup", "io_r": "io", "io_w": "io",
+                "pss": "smaps", "uss": "smaps", "swap": "smaps"}
+
+# cột -> attribute trên ProcRow
+ROW_ATTR = {"fds": "fds", "exe": "exe", "cgroup": "cgroup", "io_r": "io_read_rate", "io_w": "io_write_rate",
+            "pss": "pss", "uss": "uss", "swap": "swap"}
+
+# source quá đắt để đọc theo viewport: chỉ lấy mẫu mỗi tick trong một ngân sách thời gian (sample())
+BUDGETED_SOURCES = frozenset({"smaps"})
+SMAPS_COLUMNS = ("pss", "uss", "swap")
+
+
+class Enricher:
+    def __init__(self, root: str = procfs.PROC_ROOT, max_age: float = 5.0, denials=None,
+                 source_max_age: dict | None = None):
+        self.root = root
+        self.denials = denials
+        self.max_age = max_age
+        self.source_max_age = dict(source_max_age or {})  # vd: smaps để lâu hơn
+        self.last_sample = (0, 0)  # (số process đã có giá trị, tổng) của lần sample() gần nhất
+        self._cache = {}     # key -> {source: (value, ts)}
+        self._io_prev = {}   # key -> (read_bytes, write_bytes, ts)
+        self._pending = deque()
+        self._pending_sources = set()
+        self.fetches = 0
+
+    # ------------------------------------------------------------
+    # Fetchers (mỗi source một hàm, lỗi -> None, vẫn được đóng dấu thời gian)
+    # ------------------------------------------------------------
+    def _fetch_source(self, key, source: str, now: float):
+        pid = key[0]
+        root = self.root
+        if source == "fds":
+            return procfs.count_fds(pid, root)
+        if source == "exe":
+            return procfs.read_exe(pid, root)
+        if source == "cgroup":
+            return procfs.read_cgroup(pid, root)
+        if source == "smaps":
+            return procfs.read_smaps_rollup(pid, root)
+        if source == "io":
+            rd, wr = procfs.read_io(pid, root)
+            prev = self._io_prev.get(key)
+            self._io_prev[key] = (rd, wr, now)
+            if prev is None or now <= prev[2]:
+                return (0.0, 0.0)
+            dt = now - prev[2]
+            return (max(0.0, (rd - prev[0]) / dt), max(0.0, (wr - prev[1]) / dt))
+        raise KeyError(source)
+
+    def fetch(self, key, sources) -> bool:
+        """Read the given sources for one process now. Returns False if the process is gone."""
+        now = time.monotonic()
+        entry = self._cache.setdefault(key, {})
+        denials = self.denials
+        for source in sources:
+            if denials is not None and denials.should_skip(key, source):
+                entry[source] = (None, now)
+                continue
+            try:
+                entry[source] = (self._fetch_source(key, source, now), now)
+            except (FileNotFoundError, ProcessLookupError):
+                # kernel thread không có exe -> ENOENT nhưng process vẫn sống
+                if not os.path.exists(f"{self.root}/{key[0]}"):
+                    self._cache.pop(key, None)
+                    return False
+                entry[source] = (None, now)
+            except PermissionError:
+                if denials is not None:
+                    denials.mark(key, source)
+                entry[source] = (None, now)
+            except OSError:
+                entry[source] = (None, now)
+            self.fetches += 1
+        return True
+
+    # ------------------------------------------------------------
+    # Cache queries
+    # ------------------------------------------------------------
+    @staticmethod
+    def sources_for(cols) -> set:
+        return {LAZY_COLUMNS[c] for c in cols if c in LAZY_COLUMNS}
+
+    def missing(self, key, sources, now: float | None = None) -> list:
+        """Sources that are not cached or older than max_age."""
+        now = time.monotonic() if now is None else now
+        entry = self._cache.get(key)
+        if entry is None:
+            return list(sources)
+        ages = self.source_max_age
+        return [s for s in sources if s not in entry or now - entry[s][1] > ages.get(s, self.max_age)]
+
+    def ensure(self, keys, sources) -> list:
+        """Synchronously fetch stale/missing sources for `keys`; returns keys that changed."""
+        if not sources:
+            return []
+        now = time.monotonic()
+        changed = []
+        for key in keys:
+            miss = self.missing(key, sources, now)
+            if miss and self.fetch(key, miss):
+                changed.append(key)
+        return changed
+
+    def age(self, key, source: str):
+        entry = self._cache.get(key, {}).get(source)
+        return None if entry is None else time.monotonic() - entry[1]
+
+    def apply(self, row) -> None:
+        """Copy cached values onto a ProcRow (fields with no cache keep their defaults)."""
+        entry = self._cache.get((row.pid, row.start_time))
+        if not entry:
+            return
+        for source, (value, _ts) in entry.items():
+            if value is None:
+                continue
+            if source == "io":
+                row.io_read_rate, row.io_write_rate = value
+            elif source == "smaps":
+                row.pss, row.uss, row.swap = value
+            else:
+                setattr(row, source, value)
+
+    # ------------------------------------------------------------
+    # Background fill
+    # ------------------------------------------------------------
+    def queue(self, keys, sources) -> None:
+        """Replace the background queue (mỗi tick xếp lại theo thứ tự hiển thị mới)."""
+        self._pending = deque(keys)
+        self._pending_sources = set(sources)
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def run_budget(self, budget_s: float) -> list:
+        """Fetch queued rows until the time budget is used up; returns keys that changed."""
+        deadline = time.perf_counter() + budget_s
+        now = time.monotonic()
+        changed = []
+        sources = self._pending_sources
+        while self._pending and time.perf_counter() < deadline:
+            key = self._pending.popleft()
+            miss = self.missing(key, sources, now)
+            if miss and self.fetch(key, miss):
+                changed.append(key)
+        return changed
+
+    def sample(self, keys, source: str, budget_s: float) -> list:
+        """Refresh one budgeted source for `keys` in priority order until the budget runs out.
+
+        Returns the keys that were read; self.last_sample = (keys có giá trị, tổng số keys).
+        """
+        deadline = time.perf_counter() + budget_s
+        now = time.monotonic()
+        changed = []
+        for key in keys:
+            if time.perf_counter() >= deadline:
+                break
+            if self.missing(key, (source,), now) and self.fetch(key, (source,)):
+                changed.append(key)
+        have = 0
+        for key in keys:
+            entry = self._cache.get(key)
+            if entry is not None and entry.get(source, (None,))[0] is not None:
+                have += 1
+        self.last_sample = (have, len(keys))
+        return changed
+
+    def prune(self, live_keys) -> None:
+        live = set(live_keys)
+        for k in [k for k in self._cache if k not in live]:
+            del self._cache[k]
+        for k in [k for k in self._io_prev if k not in live]:
+            del self._io_prev[k]
+
+
+def make_enricher(source, cfg: dict):
+    """Enricher reading the same procfs root as `source`; None for sources with no live /proc (recorded)."""
+    if getattr(source, "name", "") == "recorded":
+        return None
+    return Enricher(root=getattr(source, "root", procfs.PROC_ROOT),
+                    max_age=float(cfg.get("enrich_max_age_s", 5.0)),
+                    denials=getattr(source, "denials", None),
+                    source_max_age={"smaps": float(cfg.get("smaps_max_age_s", 10.0))})
+
+
+def lazy_cell_text(row, col: str) -> str:
+    """Display text of a lazy column for one ProcRow."""
+    if col == "fds":
+        return str(row.fds) if row.fds else ""
+    if col == "io_r":
+        return f"{fmt_bytes(int(row.io_read_rate))}/s" if row.io_read_rate else ""
+    if col == "io_w":
+        return f"{fmt_bytes(int(row.io_write_rate))}/s" if row.io_write_rate else ""
+    if col in SMAPS_COLUMNS:
+        value = getattr(row, col)
+        return fmt_bytes(value) if value else ""
+    if col == "exe":
+        return row.exe
+    if col == "cgroup":
+        return row.cgroup
+    return ""
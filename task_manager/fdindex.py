@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Incremental index of open file descriptors (kiểu lsof: "process nào đang giữ file này?")
+
+FdIndex giữ {pid: {fd: target}} giữa các lần tìm. Mỗi lần `refresh()` chỉ readlink lại fd
+của process mà tập fd đã đổi, nhận biết qua:
+  * stat của /proc/<pid>/fd: mtime_ns (đổi khi PID được dùng lại cho process khác) và
+    st_size (kernel >= 6.2: số fd đang mở; kernel cũ luôn 0),
+  * danh sách tên fd (listdir rẻ hơn nhiều so với một readlink mỗi fd).
+Một fd bị đóng rồi mở lại với cùng số (kernel cấp số nhỏ nhất còn trống) thì không đổi tập
+fd, nên cứ `full_rescan_s` giây toàn bộ index được đọc lại một lần.
+
+Index được dùng chung giữa các cửa sổ (mỗi cửa sổ tìm trong thread nền riêng): refresh và
+các truy vấn giữ `lock` (RLock); giữ lock quanh refresh + truy vấn để kết quả nhất quán.
+
+Các truy vấn:
+  find_path(path)   fd trỏ tới path hoặc file nằm dưới path (thư mục / mount point), cùng
+                    cwd, root và exe của process (thứ hay giữ mount point mà lsof vẫn báo)
+  find_device(dev)  mở trực tiếp block device + mọi thứ nằm dưới các mount point của nó
+  deleted()         file đã xóa nhưng còn mở ("... (deleted)"), kèm kích thước thật
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from . import procfs
+
+DELETED_SUFFIX = " (deleted)"
+# link riêng của process (không phải fd) cũng giữ file / mount point
+PROC_LINKS = ("cwd", "root", "exe")
+
+
+def _unescape_mount(path: str) -> str:
+    """mountinfo escapes space, tab, newline and backslash as \\ooo."""
+    return (path.replace("\\040", " ").replace("\\011", "\t")
+            .replace("\\012", "\n").replace("\\134", "\\"))
+
+
+def mount_points(device: str, root: str = procfs.PROC_ROOT) -> list[str]:
+    """Mount points of a block device (theo mountinfo của chính app, vd /dev/sdb1 -> ["/mnt/usb"])."""
+    try:
+        real = os.path.realpath(device)  # /dev/disk/by-uuid/... -> /dev/sdb1
+    except OSError:
+        real = device
+    out = []
+    for name in ("self", "1"):
+        try:
+            with open(f"{root}/{name}/mountinfo", "r", encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+            break
+        except OSError:
+            lines = []
+    for line in lines:
+        pre, _, post = line.partition(" - ")
+        fields, src = pre.split(), post.split()
+        if len(fields) >= 5 and len(src) >= 2 and src[1] in (device, real):
+            out.append(_unescape_mount(fields[4]))
+    return out
+
+
+def _under(target: str, path: str) -> bool:
+    if not target.startswith("/"):
+        return False  # socket:[...], pipe:[...], anon_inode:...
+    if target.endswith(DELETED_SUFFIX):
+        target = target[:-len(DELETED_SUFFIX)]
+    return target == path or target.startswith(path.rstrip("/") + "/") or path == "/"
+
+
+class FdIndex:
+    """Open-fd index refreshed incrementally; chạy được trong thread nền (không đụng Tk)."""
+
+    def __init__(self, root: str = procfs.PROC_ROOT, full_rescan_s: float = 60.0):
+        self.root = root
+        self.full_rescan_s = full_rescan_s
+        self._procs = {}  # pid -> [signature, name, {fd: target}]
+        self._last_full = 0.0
+        self.lock = threading.RLock()
+        # thống kê lần refresh gần nhất
+        self.reread = 0
+        self.readlinks = 0
+        self.denied = 0
+
+    def _read_fds(self, pid: int, fd_dir: str, names) -> dict:
+        fds = {}
+        for fd in names:
+            try:
+                fds[fd] = os.readlink(f"{fd_dir}/{fd}")
+            except OSError:
+                continue
+        self.readlinks += len(names)
+        return fds
+
+    def refresh(self) -> None:
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        full = now - self._last_full >= self.full_rescan_s
+        if full:
+            self._last_full = now
+        self.reread = self.readlinks = self.denied = 0
+        live = set(procfs.list_pids(self.root))
+        for pid in [p for p in self._procs if p not in live]:
+            del self._procs[pid]
+        for pid in live:
+            fd_dir = f"{self.root}/{pid}/fd"
+            try:
+                st = os.stat(fd_dir)
+                names = os.listdir(fd_dir)
+            except PermissionError:
+                self.denied += 1
+                continue
+            except OSError:
+                continue  # process vừa thoát
+            rec = self._procs.get(pid)
+            sig = (st.st_mtime_ns, st.st_size)
+            if not full and rec is not None and rec[0] == sig and len(names) == len(rec[2]) \
+                    and all(fd in rec[2] for fd in names):
+                continue
+            if rec is None or rec[0][0] != sig[0]:
+                try:
+                    with open(f"{self.root}/{pid}/comm", "rb") as f:
+                        name = f.read().strip().decode("utf-8", "replace")
+                except OSError:
+                    continue
+            else:
+                name = rec[1]
+            self._procs[pid] = [sig, name, self._read_fds(pid, fd_dir, names)]
+            self.reread += 1
+
+    @property
+    def processes(self) -> int:
+        return len(self._procs)
+
+    def _links(self, pid: int) -> dict:
+        out = {}
+        for link in PROC_LINKS:
+            try:
+                out[link] = os.readlink(f"{self.root}/{pid}/{link}")
+            except OSError:
+                pass
+        return out
+
+    def find_path(self, path: str) -> list[tuple]:
+        """[(pid, name, fd | "cwd"/"root"/"exe", target)] holding `path` or anything below it."""
+        path = os.path.normpath(path)
+        out = []
+        with self.lock:
+            procs = list(self._procs.items())
+        for pid, (_sig, name, fds) in procs:
+            for fd, target in fds.items():
+                if _under(target, path):
+                    out.append((pid, name, fd, target))
+            for link, target in self._links(pid).items():
+                # root "/" của mọi process nằm "dưới" path "/" -> chỉ báo khi path khác "/"
+                if _under(target, path) and not (link == "root" and target == "/"):
+                    out.append((pid, name, link, target))
+        return out
+
+    def find_device(self, device: str) -> tuple[list[str], list[tuple]]:
+        """(mount points, holders) of a block device."""
+        mounts = mount_points(device, self.root)
+        out = self.find_path(device)
+        for mnt in mounts:
+            out.extend(self.find_path(mnt))
+        return mounts, out
+
+    def deleted(self) -> list[tuple]:
+        """[(pid, name, fd, path, size bytes, inode)] of deleted-but-open files, lớn nhất trước.
+
+        Kích thước là st_blocks * 512 của file (dung lượng đĩa thực sự bị giữ), đọc qua
+        /proc/<pid>/fd/<fd> vì đường dẫn gốc không còn.
+        """
+        out = []
+        with self.lock:
+            procs = list(self._procs.items())
+        for pid, (_sig, name, fds) in procs:
+            for fd, target in fds.items():
+                if not target.endswith(DELETED_SUFFIX) or not target.startswith("/"):
+                    continue  # memfd:/anon ... (deleted) không chiếm đĩa
+                try:
+                    st = os.stat(f"{self.root}/{pid}/fd/{fd}")
+                except OSError:
+                    continue
+                out.append((pid, name, fd, target[:-len(DELETED_SUFFIX)], st.st_blocks * 512, st.st_ino))
+        out.sort(key=lambda r: -r[4])
+        return out
+
+    @staticmethod
+    def deleted_by_process(rows: list[tuple], top: int | None = 20) -> list[tuple]:
+        """[(pid, name, files, bytes)] top processes by deleted-but-open space.
+
+        Một file mở bằng nhiều fd (dup, process con kế thừa) chỉ được tính một lần mỗi process.
+        """
+        agg = {}
+        seen = set()
+        for pid, name, _fd, _path, size, ino in rows:
+            key = (pid, ino)
+            if key in seen:
+                continue
+            seen.add(key)
+            a = agg.setdefault(pid, [name, 0, 0])
+            a[1] += 1
+            a[2] += size
+        ranked = sorted(agg.items(), key=lambda kv: -kv[1][2])[:top]
+        return [(pid, name, files, size) for pid, (name, files, size) in ranked]
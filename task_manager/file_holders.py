@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+""""Who holds this file?" window (lsof-style search over fdindex.FdIndex)
+
+Ba kiểu tìm: một path (file, thư mục hoặc mount point, kể cả cwd/root/exe của process), một
+block device (theo các mount point của nó), hoặc mọi file đã xóa nhưng còn mở, kèm bảng
+process giữ nhiều dung lượng "ma" nhất. Index fd dùng chung trong app (app.fd_index), nên
+lần tìm sau chỉ đọc lại fd của process có tập fd thay đổi; việc tìm chạy trong thread nền.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+
+from . import procfs
+from .bgtask import run_async
+from .fdindex import FdIndex
+from .utils import fmt_bytes
+
+MODES = (("path", "Path"), ("device", "Device"), ("deleted", "Deleted files"))
+
+
+class FileHoldersWindow:
+    COLS = (("pid", "PID", 80), ("name", "Process", 160), ("fd", "FD", 70),
+            ("path", "Path", 480), ("size", "Size", 100))
+
+    def __init__(self, app, path: str = ""):
+        self.app = app
+        self._task = None
+
+        self.win = win = tk.Toplevel(app)
+        win.title("Who holds this file")
+        win.geometry("980x600")
+        win.protocol("WM_DELETE_WINDOW", self.close)
+
+        top = ttk.Frame(win)
+        top.pack(fill="x", padx=10, pady=8)
+        self.mode = tk.StringVar(value="path")
+        for value, label in MODES:
+            ttk.Radiobutton(top, text=label, value=value, variable=self.mode,
+                            command=self._mode_changed).pack(side="left", padx=(0, 6))
+        self.query = tk.StringVar(value=path)
+        self.entry = ttk.Entry(top, textvariable=self.query, width=50)
+        self.entry.pack(side="left", fill="x", expand=True, padx=6)
+        self.entry.bind("<Return>", lambda e: self.search())
+        ttk.Button(top, text="Search", command=self.search).pack(side="left")
+
+        self.status_var = tk.StringVar(value="Nhập path (/var/log/app.log, /mnt/usb) hoặc device (/dev/sdb1).")
+        ttk.Label(win, textvariable=self.status_var, foreground="#555555").pack(fill="x", padx=10)
+
+        # chỉ hiện ở chế độ Deleted files: process giữ nhiều dung lượng đã xóa nhất
+        self.top_frame = ttk.Frame(win)
+        ttk.Label(self.top_frame, text="Top processes by deleted-but-open space",
+                  font=("Arial", 10, "bold")).pack(anchor="w")
+        self.top_tree = ttk.Treeview(self.top_frame, columns=("pid", "name", "files", "size"),
+                                     show="headings", height=5)
+        for cid, heading, width in (("pid", "PID", 80), ("name", "Process", 200), ("files", "Files", 80),
+                                    ("size", "Space held", 120)):
+            self.top_tree.heading(cid, text=heading)
+            self.top_tree.column(cid, width=width, anchor="w")
+        self.top_tree.pack(fill="x")
+        self.top_tree.bind("<Double-1>", lambda e: self._open_properties(self.top_tree))
+
+        self.tree = ttk.Treeview(win, columns=[c[0] for c in self.COLS], show="headings")
+        for cid, heading, width in self.COLS:
+            self.tree.heading(cid, text=heading)
+            self.tree.column(cid, width=width, anchor="w")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(6, 10))
+        self.tree.bind("<Double-1>", lambda e: self._open_properties(self.tree))
+        ysb = ttk.Scrollbar(win, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=ysb.set)
+        ysb.place(in_=self.tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        if path:
+            self.search()
+
+    def _index(self) -> FdIndex:
+        app = self.app
+        if app.fd_index is None:
+            app.fd_index = FdIndex(getattr(app.source, "root", procfs.PROC_ROOT),
+                                   float(app.cfg.get("fd_index_full_rescan_s", 60.0)))
+        return app.fd_index
+
+    def _mode_changed(self):
+        if self.mode.get() == "deleted":
+            self.entry.state(["disabled"])
+            self.search()
+        else:
+            self.entry.state(["!disabled"])
+            self.top_frame.pack_forget()
+
+    # ------------------------------------------------------------
+    # Search (thread nền)
+    # ------------------------------------------------------------
+    def search(self):
+        if self._task is not None and self._task.running:
+            return
+        mode = self.mode.get()
+        query = self.query.get().strip()
+        if mode != "deleted" and not query:
+            return
+        index = self._index()
+
+        def run():
+            # index dùng chung giữa các cửa sổ: refresh + truy vấn dưới cùng một lock
+            with index.lock:
+                index.refresh()
+                if mode == "path":
+                    return None, index.find_path(query)
+                if mode == "device":
+                    return index.find_device(query)
+                return None, index.deleted()
+
+        self.status_var.set("Đang tìm...")
+        self._task = run_async(self.app, run, lambda res, err: self._show(mode, index, res, err),
+                               timeout_s=30.0, name="fd-search")
+
+    def _show(self, mode: str, index: FdIndex, result, error):
+        self._task = None
+        if not self.win.winfo_exists():
+            return
+        if error is not None:
+            self.status_var.set(f"Lỗi: {error}")
+            return
+        mounts, rows = result
+        self.tree.delete(*self.tree.get_children())
+        for i, r in enumerate(rows):
+            size = fmt_bytes(r[4]) if len(r) > 4 else ""
+            self.tree.insert("", "end", iid=str(i), values=(r[0], r[1], r[2], r[3], size))
+
+        stats = (f"index: {index.processes} processes, đọc lại {index.reread}"
+                 + (f", {index.denied} không đủ quyền (chạy với root để thấy hết)" if index.denied else ""))
+        if mode == "deleted":
+            per_proc = FdIndex.deleted_by_process(rows, top=None)
+            top = per_proc[:20]
+            self.top_tree.delete(*self.top_tree.get_children())
+            for i, (pid, name, files, size) in enumerate(top):
+                self.top_tree.insert("", "end", iid=str(i), values=(pid, name, files, fmt_bytes(size)))
+            self.top_frame.pack(fill="x", padx=10, pady=(6, 0), before=self.tree)
+            total = sum(t[3] for t in per_proc)
+            self.status_var.set(f"{len(rows)} file đã xóa còn mở, giữ {fmt_bytes(total)}. {stats}")
+        else:
+            where = f" (mount: {', '.join(mounts)})" if mounts else ""
+            self.status_var.set(f"{len(rows)} fd / link giữ {self.query.get().strip()}{where}. {stats}")
+
+    def _open_properties(self, tree):
+        sel = tree.selection()
+        if sel:
+            self.app._show_proc_properties(int(tree.item(sel[0], "values")[0]))
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        self.win.destroy()
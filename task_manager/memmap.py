@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""Memory map viewer (/proc/<pid>/smaps, gộp theo mapping path)
+
+SmapsAggregator đọc smaps từng đoạn theo ngân sách thời gian (file giữ mở giữa các lần),
+nên process có hàng chục nghìn mapping (JVM...) không làm treo UI: bảng được lấp dần
+trong lúc parse. Các mapping cùng path được gộp (heap, stack, anon, từng .so...).
+Có thể giữ một lần chụp làm baseline để xem mapping nào đang tăng (cột Δ).
+"""
+
+from __future__ import annotations
+
+import time
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from . import procfs
+from .utils import fmt_bytes
+
+# giá trị (kB) gộp cho mỗi path; "dirty" = Shared_Dirty + Private_Dirty
+FIELDS = ("size", "rss", "pss", "swap", "dirty")
+_KEYS = {b"Size:": "size", b"Rss:": "rss", b"Pss:": "pss", b"Swap:": "swap",
+         b"Shared_Dirty:": "dirty", b"Private_Dirty:": "dirty"}
+_HEX = b"0123456789abcdef"
+
+
+def mapping_name(header: bytes) -> str:
+    """Path of one smaps header line ("addr perms offset dev inode path"); anon -> "[anon]"."""
+    parts = header.split(None, 5)
+    if len(parts) < 6:
+        return "[anon]"
+    return parts[5].strip().decode("utf-8", "replace") or "[anon]"
+
+
+class SmapsAggregator:
+    def __init__(self, pid: int, root: str = procfs.PROC_ROOT):
+        self.pid = pid
+        self.totals = {}      # path -> {"count": n, "size": kB, ...}
+        self.changed = set()  # path thay đổi từ lần take_changed() trước
+        self.mappings = 0
+        self.done = False
+        self._cur = None
+        self._cur_path = None
+        self._fh = open(f"{root}/{pid}/smaps", "rb")
+
+    def step(self, budget_s: float) -> bool:
+        """Parse lines until the budget is used up; returns True when the whole file is read."""
+        if self.done:
+            return True
+        deadline = time.perf_counter() + budget_s
+        fh = self._fh
+        totals = self.totals
+        keys = _KEYS
+        cur = self._cur
+        path = self._cur_path
+        n = 0
+        while True:
+            line = fh.readline()
+            if not line:
+                self.close()
+                break
+            if line[0] in _HEX:
+                path = mapping_name(line)
+                cur = totals.get(path)
+                if cur is None:
+                    cur = totals[path] = {"count": 0, "size": 0, "rss": 0, "pss": 0, "swap": 0, "dirty": 0}
+                cur["count"] += 1
+                self.mappings += 1
+                self.changed.add(path)
+            elif cur is not None:
+                key, _, rest = line.partition(b" ")
+                field = keys.get(key)
+                if field is not None:
+                    cur[field] += int(rest.split()[0])
+            n += 1
+            if n & 255 == 0 and time.perf_counter() >= deadline:
+                break
+        self._cur = cur
+        self._cur_path = path
+        if path is not None:
+            self.changed.add(path)  # mapping đang dở có thể còn field ở lượt sau
+        return self.done
+
+    def take_changed(self) -> set:
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def close(self) -> None:
+        self.done = True
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+
+class MemoryMapWindow:
+    COLS = (("path", "Mapping", 380), ("count", "Maps", 60), ("size", "Size", 90), ("rss", "RSS", 90),
+            ("pss", "PSS", 90), ("swap", "Swap", 90), ("dirty", "Dirty", 90),
+            ("d_rss", "Δ RSS", 90), ("d_pss", "Δ PSS", 90), ("d_swap", "Δ Swap", 90))
+
+    def __init__(self, app, pid: int):
+        self.app = app
+        self.pid = pid
+        self.root = getattr(app.source, "root", procfs.PROC_ROOT)
+        self.budget_s = float(app.cfg.get("memmap_budget_ms", 20)) / 1000.0
+        self.agg = None
+        self.baseline = None   # {path: totals} của lần chụp trước
+        self.sort_col = "rss"
+        self.sort_desc = True
+        self._job = None
+        self._t0 = 0.0
+
+        self.win = win = tk.Toplevel(app)
+        win.title(f"Memory map - PID {pid}")
+        win.geometry("1100x600")
+        win.protocol("WM_DELETE_WINDOW", self.close)
+
+        top = ttk.Frame(win)
+        top.pack(fill="x", padx=10, pady=8)
+        ttk.Button(top, text="Capture again", command=self.capture).pack(side="left")
+        ttk.Button(top, text="Set as baseline", command=self.set_baseline).pack(side="left", padx=6)
+        ttk.Button(top, text="Clear baseline", command=self.clear_baseline).pack(side="left")
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(top, textvariable=self.status_var, foreground="#555555").pack(side="left", padx=12)
+
+        cols = [c[0] for c in self.COLS]
+        self.tree = ttk.Treeview(win, columns=cols, show="headings")
+        for cid, heading, width in self.COLS:
+            self.tree.heading(cid, text=heading, command=lambda c=cid: self._sort_by(c))
+            self.tree.column(cid, width=width, anchor="w" if cid == "path" else "e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        ysb = ttk.Scrollbar(win, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=ysb.set)
+        ysb.place(in_=self.tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        self.capture()
+
+    # ------------------------------------------------------------
+    # Capture (parse từng đoạn bằng after())
+    # ------------------------------------------------------------
+    def capture(self):
+        self._stop()
+        try:
+            self.agg = SmapsAggregator(self.pid, self.root)
+        except FileNotFoundError:
+            self.status_var.set("Process không còn tồn tại.")
+            return
+        except PermissionError:
+            self.status_var.set("Không đủ quyền đọc smaps của process này.")
+            return
+        except OSError as e:
+            self.status_var.set(str(e))
+            return
+        for iid in self.tree.get_children(""):
+            self.tree.delete(iid)
+        self._t0 = time.monotonic()
+        self._step()
+
+    def _step(self):
+        self._job = None
+        agg = self.agg
+        try:
+            done = agg.step(self.budget_s)
+        except (OSError, ValueError) as e:
+            agg.close()
+            self.status_var.set(f"Dừng đọc smaps: {e}")
+            done = True
+        for path in agg.take_changed():
+            self._set_row(path)
+        state = "done" if done else "parsing..."
+        self.status_var.set(f"{agg.mappings} mappings, {len(agg.totals)} paths - {state} "
+                            f"({time.monotonic() - self._t0:.1f}s)"
+                            + ("  [diff vs baseline]" if self.baseline is not None else ""))
+        if done:
+            if self.baseline is not None:
+                # mapping có trong baseline nhưng đã biến mất -> hiện với giá trị 0 (Δ âm)
+                for path in self.baseline.keys() - agg.totals.keys():
+                    agg.totals[path] = dict.fromkeys(("count",) + FIELDS, 0)
+                    self._set_row(path)
+            self._resort()
+        else:
+            self._job = self.win.after(1, self._step)
+
+    def _stop(self):
+        if self._job is not None:
+            self.win.after_cancel(self._job)
+            self._job = None
+        if self.agg is not None:
+            self.agg.close()
+
+    # ------------------------------------------------------------
+    # Bảng + diff
+    # ------------------------------------------------------------
+    def _row_values(self, path: str, t: dict) -> tuple:
+        vals = [path, t["count"]] + [fmt_bytes(t[f] * 1024) for f in FIELDS]
+        if self.baseline is not None:
+            b = self.baseline.get(path, {})
+            for f in ("rss", "pss", "swap"):
+                d = t[f] - b.get(f, 0)
+                vals.append(("+" if d > 0 else "-" if d < 0 else "") + fmt_bytes(abs(d) * 1024) if d else "")
+        else:
+            vals += ["", "", ""]
+        return tuple(vals)
+
+    def _set_row(self, path: str):
+        t = self.agg.totals[path]
+        if self.tree.exists(path):
+            self.tree.item(path, values=self._row_values(path, t))
+        else:
+            self.tree.insert("", "end", iid=path, values=self._row_values(path, t))
+
+    def _sort_key(self, path: str):
+        col = self.sort_col
+        t = self.agg.totals.get(path, {})
+        if col == "path":
+            return path
+        if col.startswith("d_"):
+            f = col[2:]
+            return t.get(f, 0) - (self.baseline or {}).get(path, {}).get(f, 0)
+        return t.get(col, 0)
+
+    def _resort(self):
+        if self.agg is None:
+            return
+        order = sorted(self.agg.totals, key=self._sort_key, reverse=self.sort_desc)
+        for i, path in enumerate(order):
+            if self.tree.exists(path):
+                self.tree.move(path, "", i)
+
+    def _sort_by(self, col: str):
+        if self.sort_col == col:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_col = col
+            self.sort_desc = col != "path"
+        self._resort()
+
+    def set_baseline(self):
+        if self.agg is None or not self.agg.done:
+            messagebox.showinfo("Memory map", "Chờ đọc xong lần chụp hiện tại rồi mới đặt baseline.",
+                                parent=self.win)
+            return
+        self.baseline = {p: dict(t) for p, t in self.agg.totals.items() if t["count"]}
+        self.capture()
+
+    def clear_baseline(self):
+        self.baseline = None
+        if self.agg is not None:
+            for path in self.agg.totals:
+                self._set_row(path)
+
+    def close(self):
+        self._stop()
+        self.win.destroy()
@@ -2,7 +2,7 @@
 """Data models"""
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class ProcRow:
@@ -17,3 +17,41 @@ class ProcRow:
     fds: int
     start_time: float
     cmd: str
+    # field "đắt", được điền lazy theo viewport (xem enrich.py)
+    io_read_rate: float = 0.0
+    io_write_rate: float = 0.0
+    exe: str = ""
+    cgroup: str = ""
+    # smaps_rollup (bytes), lấy mẫu theo ngân sách mỗi tick
+    pss: int = 0
+    uss: int = 0
+    swap: int = 0
+    # scheduler: context switch / giây và thời gian chờ run-queue (ms mỗi giây), plan field "sched"
+    ctx_vol_rate: float = 0.0
+    ctx_invol_rate: float = 0.0
+    rq_wait: float = 0.0
+    # container / pod (containers.ContainerResolver, cache theo (pid, start_time))
+    container: str = ""
+    pod: str = ""
+
+
+# Các field "tùy chọn" của ProcRow mà collector có thể bỏ qua (pid, name luôn được đọc)
+PLAN_FIELDS = ("user", "cpu", "mem", "status", "nice", "threads", "fds", "start", "cmd", "sched")
+
+# cột -> plan field khi tên khác nhau (3 cột scheduler đọc chung một lần)
+PLAN_ALIASES = {"ctx_v": "sched", "ctx_i": "sched", "rq_wait": "sched"}
+
+@dataclass(frozen=True)
+class CollectPlan:
+    """Which ProcRow fields one collection pass must fill; the rest keep default values."""
+    fields: frozenset = field(default_factory=lambda: frozenset(PLAN_FIELDS))
+
+    def needs(self, col: str) -> bool:
+        return col in self.fields
+
+    @classmethod
+    def of(cls, cols) -> "CollectPlan":
+        fields = (PLAN_ALIASES.get(c, c) for c in cols)
+        return cls(frozenset(f for f in fields if f in PLAN_FIELDS))
+
+FULL_PLAN = CollectPlan()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""System-wide TCP/UDP connections for the Connections tab (đọc thẳng /proc/net, chạy nền)
+
+`read_connections()` parse /proc/net/{tcp,tcp6,udp,udp6}: mỗi dòng có địa chỉ hex
+(little-endian theo từng word 32 bit), state hex, uid và inode của socket.
+
+Process sở hữu một socket chỉ biết được qua symlink `socket:[<inode>]` trong /proc/<pid>/fd.
+Đọc lại mọi fd của mọi process mỗi tick là quá đắt (hàng trăm nghìn readlink trên load
+balancer), nên SocketIndex giữ bảng inode -> pid và chỉ đọc fd của:
+  * process mới xuất hiện (lần đầu: toàn bộ process),
+  * process cũ khi còn socket chưa rõ chủ: trước hết các process vừa mở socket mới ở tick
+    trước, sau đó theo vòng (round-robin) trong ngân sách `budget_ms`, ưu tiên process cùng
+    uid với socket; socket còn lại được tìm tiếp ở tick sau.
+Với process đã biết, chỉ fd mới / fd không phải socket / fd của socket đã đóng mới phải
+readlink, nên process giữ 100k socket chỉ tốn một listdir khi ít socket thay đổi.
+Socket có chủ là process đã chết (vd fd được kế thừa bởi process con) được tìm lại.
+Socket TIME_WAIT (inode 0) không thuộc process nào.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+from typing import NamedTuple
+
+from . import procfs
+
+NET_TABLES = ("tcp", "tcp6", "udp", "udp6")
+
+TCP_STATES = {
+    b"01": "ESTABLISHED", b"02": "SYN_SENT", b"03": "SYN_RECV", b"04": "FIN_WAIT1",
+    b"05": "FIN_WAIT2", b"06": "TIME_WAIT", b"07": "CLOSE", b"08": "CLOSE_WAIT",
+    b"09": "LAST_ACK", b"0A": "LISTEN", b"0B": "CLOSING", b"0C": "NEW_SYN_RECV",
+}
+# UDP không có state thật: 07 = chưa connect (như `ss`: UNCONN)
+UDP_STATES = {b"01": "ESTABLISHED", b"07": "UNCONN"}
+
+
+class Conn(NamedTuple):
+    proto: str
+    laddr: str
+    raddr: str
+    state: str
+    uid: int
+    inode: int
+
+    @property
+    def key(self) -> str:
+        """Unique per table: (proto, local, remote) + inode khi có.
+
+        Inode phân biệt các listener SO_REUSEPORT cùng địa chỉ; nó có thể là 0 (TIME_WAIT),
+        khi đó (proto, local, remote) đã đủ.
+        """
+        key = f"{self.proto} {self.laddr} {self.raddr}"
+        return f"{key} #{self.inode}" if self.inode else key
+
+
+_addr_cache = {}  # hex address -> "ip:port" (IP local/remote lặp lại rất nhiều)
+
+
+def decode_addr(hex_addr: bytes) -> str:
+    """"0100007F:0035" -> "127.0.0.1:53"; IPv6 -> "[::1]:53"."""
+    s = _addr_cache.get(hex_addr)
+    if s is not None:
+        return s
+    ip_hex, _, port_hex = hex_addr.partition(b":")
+    raw = bytes.fromhex(ip_hex.decode())
+    # kernel in từng word 32 bit theo byte order của máy (little-endian)
+    raw = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    port = int(port_hex, 16)
+    if len(raw) == 4:
+        s = f"{socket.inet_ntop(socket.AF_INET, raw)}:{port}"
+    else:
+        s = f"[{socket.inet_ntop(socket.AF_INET6, raw)}]:{port}"
+    if len(_addr_cache) > 200_000:
+        _addr_cache.clear()
+    _addr_cache[hex_addr] = s
+    return s
+
+
+def parse_net_table(data: bytes, proto: str) -> list[Conn]:
+    """Rows of one /proc/net/<proto> file (dòng đầu là header)."""
+    states = UDP_STATES if proto.startswith("udp") else TCP_STATES
+    out = []
+    for line in data.splitlines()[1:]:
+        f = line.split()
+        if len(f) < 10:
+            continue
+        st = f[3]
+        out.append(Conn(proto, decode_addr(f[1]), decode_addr(f[2]),
+                        states.get(st, st.decode()), int(f[7]), int(f[9])))
+    return out
+
+
+def read_connections(root: str = procfs.PROC_ROOT, tables=NET_TABLES) -> list[Conn]:
+    """Sockets of the network namespace `root` belongs to; bảng không có (IPv6 tắt) bị bỏ qua."""
+    out = []
+    for proto in tables:
+        try:
+            with open(f"{root}/net/{proto}", "rb") as f:
+                out.extend(parse_net_table(f.read(), proto))
+        except OSError:
+            pass
+    return out
+
+
+class SocketIndex:
+    """Incrementally maintained socket inode -> pid map (xem docstring module)."""
+
+    def __init__(self, root: str = procfs.PROC_ROOT, budget_ms: float = 50.0):
+        self.root = root
+        self.budget_ms = budget_ms
+        self.owner = {}   # inode -> pid
+        self._procs = {}  # pid -> [uid, name, denied]
+        self._fds = {}    # pid -> {fd: socket inode | 0}
+        self._cursor = 0  # vị trí round-robin trong danh sách pid cũ
+        self._hot = set()  # pid có socket mới ở lần update trước: được quét lại trước tiên
+        # thống kê lần update gần nhất (hiện ở hint của tab)
+        self.scanned = 0
+        self.readlinks = 0
+        self.unresolved = 0
+
+    def _scan_fds(self, pid: int, alive: set) -> list[int]:
+        """Record the socket fds of one process; returns the socket inodes found.
+
+        Chỉ readlink fd mới, fd không phải socket và fd mà socket cũ đã đóng (số fd được
+        dùng lại): process có 100k socket đang mở chỉ tốn một listdir.
+        """
+        rec = self._procs[pid]
+        fd_dir = f"{self.root}/{pid}/fd"
+        try:
+            names = os.listdir(fd_dir)
+        except PermissionError:
+            rec[2] = True  # không đủ quyền: đừng tốn ngân sách cho process này nữa
+            return []
+        except OSError:
+            return []
+        self.scanned += 1
+        owner = self.owner
+        known = self._fds.get(pid, {})
+        fds = {}
+        found = []
+        for name in names:
+            ino = known.get(name)
+            if not ino or ino not in alive:
+                try:
+                    link = os.readlink(f"{fd_dir}/{name}")
+                except OSError:
+                    continue
+                self.readlinks += 1
+                ino = int(link[8:-1]) if link.startswith("socket:[") else 0
+                if ino:
+                    owner[ino] = pid
+                    found.append(ino)
+            fds[name] = ino
+        self._fds[pid] = fds
+        return found
+
+    def _add_proc(self, pid: int, alive: set) -> None:
+        try:
+            uid = procfs.owner_uid(pid, self.root)
+            with open(f"{self.root}/{pid}/comm", "rb") as f:
+                name = f.read().strip().decode("utf-8", "replace")
+        except OSError:
+            return
+        self._procs[pid] = [uid, name, False]
+        self._scan_fds(pid, alive)
+
+    def update(self, conns: list[Conn]) -> None:
+        self.scanned = self.readlinks = 0
+        alive = {c.inode for c in conns}
+        live = set(procfs.list_pids(self.root))
+        for pid in [p for p in self._procs if p not in live]:
+            del self._procs[pid]
+            self._fds.pop(pid, None)
+        old = sorted(self._procs)
+        for pid in live:
+            if pid not in self._procs:
+                self._add_proc(pid, alive)
+
+        procs = self._procs
+        owner = self.owner
+        missing = {c.inode: c.uid for c in conns if c.inode and owner.get(c.inode) not in procs}
+        hot = set()
+        if missing and old:
+            uids = set(missing.values())
+            start = self._cursor % len(old)
+            usable = [p for p in old[start:] + old[:start] if p in procs and not procs[p][2]]
+            # process vừa mở socket mới ở tick trước (load balancer) trước, rồi round-robin:
+            # cùng uid với socket chưa rõ chủ trước, thứ tự vòng giữ nguyên trong mỗi nhóm
+            first = [p for p in usable if p in self._hot]
+            rest = [p for p in usable if p not in self._hot]
+            rest.sort(key=lambda p: procs[p][0] not in uids)
+            deadline = None
+            for pid in first + rest:
+                if deadline is None and pid not in self._hot:
+                    # ngân sách chỉ tính cho phần round-robin: process "nóng" luôn được quét
+                    deadline = time.perf_counter() + self.budget_ms / 1000.0
+                for ino in self._scan_fds(pid, alive):
+                    if missing.pop(ino, None) is not None:
+                        hot.add(pid)
+                if deadline is not None:
+                    self._cursor = old.index(pid) + 1
+                if not missing or (deadline is not None and time.perf_counter() >= deadline):
+                    break
+        self._hot = hot
+        self.unresolved = len(missing)
+
+        if len(owner) > len(alive) * 2 + 1024:
+            for ino in [i for i in owner if i not in alive]:
+                del owner[ino]
+
+    def lookup(self, inode: int) -> tuple[int | None, str]:
+        """(pid, process name) owning a socket inode; (None, "?") chưa rõ chủ, (None, "") khi inode 0."""
+        if not inode:
+            return None, ""
+        pid = self.owner.get(inode)
+        rec = self._procs.get(pid)
+        if rec is None:
+            return None, "?"
+        return pid, rec[1]
+
+
+class ConnectionTable:
+    """Sockets + owners in one call; `snapshot()` chạy được trong thread nền (không đụng Tk)."""
+
+    def __init__(self, root: str = procfs.PROC_ROOT, budget_ms: float = 50.0):
+        self.root = root
+        self.index = SocketIndex(root, budget_ms)
+
+    def snapshot(self) -> list[tuple]:
+        """[(key, proto, laddr, raddr, state, pid, name)], pid None khi chưa rõ chủ."""
+        conns = read_connections(self.root)
+        self.index.update(conns)
+        lookup = self.index.lookup
+        return [(c.key, c.proto, c.laddr, c.raddr, c.state) + lookup(c.inode) for c in conns]
+
+
+# cột của tab Connections -> vị trí trong một dòng của snapshot()
+CONN_COLS = {"proto": 1, "local": 2, "remote": 3, "state": 4, "pid": 5, "process": 6}
+
+
+def connection_view(rows: list, text: str = "", state: str = "", sort_col: str | None = None,
+                    desc: bool = False, limit: int = 0) -> tuple[dict, dict]:
+    """Filter/sort/cap snapshot rows for display (chạy nền: 100k dòng vẫn không chặn UI).
+
+    Returns ({key: values} theo thứ tự hiển thị, {state: count} của mọi dòng). `text` khớp
+    (không phân biệt hoa thường) địa chỉ, state, PID hoặc tên process.
+    """
+    counts = {}
+    for r in rows:
+        counts[r[4]] = counts.get(r[4], 0) + 1
+    text = text.strip().lower()
+    if state:
+        rows = [r for r in rows if r[4] == state]
+    if text:
+        rows = [r for r in rows if text in f"{r[2]} {r[3]} {r[4]} {r[5]} {r[6]}".lower()]
+    if sort_col in CONN_COLS:
+        idx = CONN_COLS[sort_col]
+        if sort_col == "pid":
+            key = lambda r: -1 if r[5] is None else r[5]
+        else:
+            key = lambda r: r[idx]
+        rows = sorted(rows, key=key, reverse=desc)
+    if limit > 0:
+        rows = rows[:limit]
+    return {r[0]: (r[1], r[2], r[3], r[4], "" if r[5] is None else r[5], r[6]) for r in rows}, counts
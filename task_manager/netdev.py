@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Per-interface network rates (bytes, packets, errors, drops) from /proc/net/dev deltas
+
+Mỗi interface được xếp loại để lọc trên máy chạy container (hàng trăm veth + bridge
+nhân đôi lưu lượng của card thật):
+
+  loopback  lo
+  veth      veth*, cali* (Calico), lxc* (Cilium): đầu host của cặp veth
+  bridge    có /sys/class/net/<if>/bridge, hoặc docker0, br-*, virbr*, cni*
+  physical  có /sys/class/net/<if>/device (card mạng thật)
+  virtual   còn lại: tun/tap, wireguard, bond, vlan...
+
+Rate là delta giữa hai lần đọc (cpuacct.RateTracker); lần đầu thấy interface -> 0.
+"""
+
+from __future__ import annotations
+
+import os
+
+from . import procfs
+from .cpuacct import RateTracker
+
+SYS_NET = "/sys/class/net"
+IFACE_KINDS = ("physical", "bridge", "veth", "virtual", "loopback")
+
+VETH_PREFIXES = ("veth", "cali", "lxc")
+BRIDGE_PREFIXES = ("docker", "br-", "virbr", "cni", "cbr", "kube-bridge")
+
+# field hiển thị -> vị trí trong procfs.NET_DEV_FIELDS
+RATE_FIELDS = {
+    "rx_bytes": 0, "tx_bytes": 8, "rx_packets": 1, "tx_packets": 9,
+    "rx_errs": 2, "tx_errs": 10, "rx_drop": 3, "tx_drop": 11,
+}
+
+
+def iface_kind(name: str, sys_root: str = SYS_NET) -> str:
+    if name == "lo":
+        return "loopback"
+    if name.startswith(VETH_PREFIXES):
+        return "veth"
+    base = os.path.join(sys_root, name)
+    if os.path.isdir(os.path.join(base, "bridge")) or name.startswith(BRIDGE_PREFIXES):
+        return "bridge"
+    if os.path.exists(os.path.join(base, "device")):
+        return "physical"
+    return "virtual"
+
+
+class NetDevRates:
+    """`sample()` -> {iface: dict(kind, rx_bytes, tx_bytes, ..., tx_drop)} in units per second."""
+
+    def __init__(self, root: str = procfs.PROC_ROOT, sys_root: str = SYS_NET):
+        self.root = root
+        self.sys_root = sys_root
+        self.trackers = {f: RateTracker() for f in RATE_FIELDS}
+        self._kinds = {}  # iface -> kind (cache, bỏ khi interface biến mất)
+
+    def kind(self, iface: str) -> str:
+        k = self._kinds.get(iface)
+        if k is None:
+            k = self._kinds[iface] = iface_kind(iface, self.sys_root)
+        return k
+
+    def sample(self) -> dict:
+        counters = procfs.read_net_dev(self.root)
+        for t in self.trackers.values():
+            t.begin()
+        out = {}
+        for iface, vals in counters.items():
+            key = (iface, None)
+            row = {"kind": self.kind(iface)}
+            for field, idx in RATE_FIELDS.items():
+                row[field] = self.trackers[field].update(key, vals[idx])
+            out[iface] = row
+        live = [(iface, None) for iface in counters]
+        for t in self.trackers.values():
+            t.end(live)
+        for iface in [i for i in self._kinds if i not in counters]:
+            del self._kinds[iface]
+        return out
@@ -21,6 +21,12 @@ from .config import (
 )
 from .utils import fmt_bytes, safe_call, is_system_process, dt_from_ts, readlink_exe, run_cmd
 from .models import ProcRow
+from .tracing import TRACER, traced
+from .backends import SOURCES, make_source
+from .enrich import make_enricher
+from .cpuacct import CPU_MODES
+from .containers import ContainerResolver
+from .procfs import PROC_ROOT
 
 # ============================================================
 # PERSON 1 — CORE / APP SHELL
@@ -52,6 +58,8 @@ class CoreMixin:
         self.tab_details = ttk.Frame(self.nb)
         self.tab_services = ttk.Frame(self.nb)
         self.tab_startup = ttk.Frame(self.nb)
+        self.tab_cgroups = ttk.Frame(self.nb)
+        self.tab_connections = ttk.Frame(self.nb)
 
         self.nb.add(self.tab_processes, text="Processes")
         self.nb.add(self.tab_performance, text="Performance")
@@ -59,6 +67,8 @@ class CoreMixin:
         self.nb.add(self.tab_details, text="Details")
         self.nb.add(self.tab_services, text="Services")
         self.nb.add(self.tab_startup, text="Startup")
+        self.nb.add(self.tab_cgroups, text="Cgroups")
+        self.nb.add(self.tab_connections, text="Connections")
 
         self._build_processes_tab(self.tab_processes)
         self._build_performance_tab(self.tab_performance)
@@ -66,6 +76,8 @@ class CoreMixin:
         self._build_details_tab(self.tab_details)
         self._build_services_tab(self.tab_services)
         self._build_startup_tab(self.tab_startup)
+        self._build_cgroups_tab(self.tab_cgroups)
+        self._build_connections_tab(self.tab_connections)
 
         # Status bar
         self.status_var = tk.StringVar(value="")
@@ -100,6 +112,25 @@ class CoreMixin:
             variable=self.var_show_system,
             command=self._toggle_show_system
         )
+        m_src = tk.Menu(m_opt, tearoff=0)
+        self.var_data_source = tk.StringVar(value=self.source.name)
+        for kind in SOURCES:
+            m_src.add_radiobutton(label=kind, value=kind, variable=self.var_data_source,
+                                  command=lambda k=kind: self._set_data_source(k))
+        m_opt.add_cascade(label="Data source", menu=m_src)
+        m_cpu = tk.Menu(m_opt, tearoff=0)
+        self.var_cpu_mode = tk.StringVar(value=self.source.cpu.mode)
+        for mode, label in CPU_MODES.items():
+            m_cpu.add_radiobutton(label=label, value=mode, variable=self.var_cpu_mode,
+                                  command=lambda m=mode: self._set_cpu_mode(m))
+        m_opt.add_cascade(label="CPU %", menu=m_cpu)
+        m_opt.add_separator()
+        self.var_trace = tk.BooleanVar(value=TRACER.enabled)
+        m_opt.add_checkbutton(
+            label="Record trace (Chrome JSON)...",
+            variable=self.var_trace,
+            command=self._toggle_trace
+        )
         menubar.add_cascade(label="Options", menu=m_opt)
 
         # View
@@ -113,10 +144,14 @@ class CoreMixin:
         m_view.add_separator()
         m_view.add_command(label="Select columns (Processes)...", command=self._choose_columns_processes)
         m_view.add_command(label="Select columns (Details)...", command=self._choose_columns_details)
+        m_view.add_separator()
+        m_view.add_command(label="Who holds this file...", command=self._show_file_holders)
         menubar.add_cascade(label="View", menu=m_view)
 
         # Help
         m_help = tk.Menu(menubar, tearoff=0)
+        m_help.add_command(label="Diagnostics...", command=self._show_diagnostics)
+        m_help.add_separator()
         m_help.add_command(label="About", command=self._about)
         menubar.add_cascade(label="Help", menu=m_help)
 
@@ -170,6 +205,7 @@ class CoreMixin:
     # ------------------------------------------------------------
     # [P1][REFRESH LOOP] Tkinter after() tick scheduler
     # ------------------------------------------------------------
+    @traced("tick", "loop")
     def _tick(self):
         self.refresh_all(force=False)
         self.after(self.cfg.get("refresh_ms", 2000), self._tick)
@@ -177,6 +213,7 @@ class CoreMixin:
     # ------------------------------------------------------------
     # [P1][REFRESH] Refresh current tab / all tabs (manual/auto)
     # ------------------------------------------------------------
+    @traced("refresh_all", "loop")
     def refresh_all(self, force=False):
         # cập nhật tab đang xem trước để mượt hơn, nhưng vẫn có status + perf
         self.refresh_performance()
@@ -186,7 +223,7 @@ class CoreMixin:
             return
 
         current = self.nb.index("current")
-        # 0: Processes, 1: Perf, 2: Users, 3: Details, 4: Services, 5: Startup
+        # 0: Processes, 1: Perf, 2: Users, 3: Details, 4: Services, 5: Startup, 6: Cgroups, 7: Connections
         if current == 0:
             self.refresh_processes(force=force)
         elif current == 2:
@@ -197,6 +234,10 @@ class CoreMixin:
             self.refresh_services(force=force)
         elif current == 5:
             self.refresh_startup(force=force)
+        elif current == 6:
+            self.refresh_cgroups(force=force)
+        elif current == 7:
+            self.refresh_connections(force=force)
         else:
             # perf tab already refreshed
             pass
@@ -206,10 +247,10 @@ class CoreMixin:
     # ------------------------------------------------------------
     def refresh_statusbar(self):
         try:
-            cpu = psutil.cpu_percent(interval=None)
-            vm = psutil.virtual_memory()
-            procs = len(psutil.pids())
-            self.status_var.set(f"Processes: {procs}    CPU: {cpu:.1f}%    Memory: {vm.percent:.1f}%")
+            snap = self.source.system_snapshot()
+            self.status_var.set(f"Processes: {snap['procs']}    CPU: {snap['cpu']:.1f}%    "
+                                f"Memory: {snap['mem_percent']:.1f}%"
+                                + (f"    {self.psi_alert.get()}" if self.psi_alert.get() else ""))
         except Exception:
             self.status_var.set("")
 
@@ -232,16 +273,119 @@ class CoreMixin:
         self.refresh_details(force=True)
         self.refresh_users(force=True)
 
+    def _set_data_source(self, kind: str):
+        if kind == "recorded":
+            path = filedialog.askopenfilename(
+                title="Open recording", initialfile=self.cfg.get("recording_path", ""),
+                filetypes=[("Task Manager recording", "*.jsonl"), ("All files", "*")]
+            )
+            if not path:
+                self.var_data_source.set(self.source.name)
+                return
+            self.cfg["recording_path"] = path
+        self.cfg["data_source"] = kind
+        new_source = make_source(self.cfg)
+        if new_source.name != kind:
+            messagebox.showerror("Data source", f"Không mở được data source '{kind}', vẫn dùng {new_source.name}.")
+            self.cfg["data_source"] = new_source.name
+        self.source.close()
+        self.source = new_source
+        self.source.prime()
+        self.enricher = make_enricher(self.source, self.cfg)
+        # cache theo (pid, start_time) của nguồn cũ, gắn với root /proc cũ
+        self.containers = ContainerResolver(getattr(self.source, "root", PROC_ROOT))
+        self._conn_table = None  # SocketIndex đọc /proc của nguồn cũ
+        self.fd_index = None
+        # NetDevRates giữ counter /proc/net/dev của root cũ: delta đầu tiên sẽ sai
+        self._net_dev = None
+        self.iface_hist = {}
+        self.var_data_source.set(self.source.name)
+        save_cfg(self.cfg)
+        self.refresh_all(force=True)
+
+    def _set_cpu_mode(self, mode: str):
+        self.cfg["cpu_mode"] = mode
+        self.source.cpu.mode = mode
+        save_cfg(self.cfg)
+        self.refresh_all(force=True)
+
+    def _toggle_trace(self):
+        if TRACER.enabled:
+            TRACER.stop()
+            self.var_trace.set(False)
+            messagebox.showinfo("Trace", f"Đã ghi {TRACER.written} events vào:\n{TRACER.path}\n"
+                                         f"(bị bỏ do buffer đầy: {TRACER.dropped})")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Chrome trace", defaultextension=".json",
+            initialfile=f"task_manager_trace_{time.strftime('%Y%m%d_%H%M%S')}.json",
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*")]
+        )
+        if not path:
+            self.var_trace.set(False)
+            return
+        try:
+            TRACER.start(path, max_events=int(self.cfg.get("trace_buffer_events", 50000)))
+        except Exception as e:
+            self.var_trace.set(False)
+            messagebox.showerror("Trace", str(e))
+            return
+        self.var_trace.set(True)
+
+    # ------------------------------------------------------------
+    # [P1][UI] Diagnostics dialog (watchdog, trace, ...)
+    # ------------------------------------------------------------
+    def _diagnostics_info(self) -> dict:
+        info = {}
+        info["Trace"] = f"ON -> {TRACER.path} ({TRACER.written} events, dropped {TRACER.dropped})" \
+            if TRACER.enabled else "OFF"
+        info["Data source"] = self.source.name
+        info.update(self.source.denials.summary())
+        wd = getattr(self, "watchdog", None)
+        if wd is not None:
+            info.update(wd.summary())
+        else:
+            info["UI stall watchdog"] = "OFF"
+        return info
+
+    def _show_diagnostics(self):
+        win = tk.Toplevel(self)
+        win.title("Diagnostics")
+        win.geometry("760x420")
+        win.transient(self)
+
+        frm = ttk.Frame(win)
+        frm.pack(fill="both", expand=True, padx=12, pady=12)
+
+        tree = ttk.Treeview(frm, columns=("k", "v"), show="headings")
+        tree.heading("k", text="Field")
+        tree.heading("v", text="Value")
+        tree.column("k", width=220, anchor="w")
+        tree.column("v", width=500, anchor="w")
+        tree.pack(fill="both", expand=True)
+
+        def fill():
+            tree.delete(*tree.get_children())
+            for k, v in self._diagnostics_info().items():
+                tree.insert("", "end", values=(k, v))
+        fill()
+
+        btns = ttk.Frame(win)
+        btns.pack(fill="x", padx=12, pady=(0, 12))
+        ttk.Button(btns, text="Close", command=win.destroy).pack(side="right")
+        ttk.Button(btns, text="Refresh", command=fill).pack(side="right", padx=8)
+
     def _about(self):
         messagebox.showinfo(
             "About",
             f"{APP_NAME}\n\n"
             "Tkinter + psutil\n"
-            "Tabs: Processes, Performance, Users, Details, Services, Startup\n"
+            "Tabs: Processes, Performance, Users, Details, Services, Startup, Cgroups, Connections\n"
             "Mục tiêu: giống Task Manager Windows nhất có thể trên Linux."
         )
 
     def _on_close(self):
+        TRACER.stop()
         try:
             self.cfg["geometry"] = self.geometry()
         except Exception:
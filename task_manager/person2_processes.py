@@ -14,13 +14,18 @@ from tkinter import ttk, messagebox, simpledialog, filedialog
 
 import psutil
 
-from .config import DEFAULT_CFG, HISTORY_LEN, USER_AUTOSTART_DIR, SYS_AUTOSTART_DIRS, PROC_STATUS_LABEL
-from .utils import fmt_bytes, safe_call, is_system_process, dt_from_ts, readlink_exe, run_cmd
-from .models import ProcRow
+from .config import DEFAULT_CFG, HISTORY_LEN, USER_AUTOSTART_DIR, SYS_AUTOSTART_DIRS, PROC_STATUS_LABEL, save_cfg
+from .utils import fmt_bytes, safe_call, is_system_process, is_system_user, dt_from_ts, readlink_exe, run_cmd
+from .models import ProcRow, CollectPlan, FULL_PLAN
+from .tracing import traced
+from .cgroupfs import cgroup_pids, subtree_pids
+from .bgtask import run_async
+from .containers import ALL_CONTAINERS, HOST_LABEL, group_label, cell_text as container_cell_text
+from .enrich import LAZY_COLUMNS, ROW_ATTR, BUDGETED_SOURCES, SMAPS_COLUMNS, lazy_cell_text
 # ============================================================
 # PERSON 2 — PROCESSES TAB
 #   - UI: treeview, filter/search, column chooser, context menu
-#   - Logic: collect rows from psutil, refresh, sort/filter
+#   - Logic: collect rows from the data source, refresh, sort/filter
 # Deliverable: explain 1 process row source + filter + columns
 # ============================================================
 
@@ -42,6 +47,21 @@ class ProcessesTabMixin:
         ttk.Checkbutton(top, text="Auto refresh", variable=self.auto_refresh).pack(side="left", padx=10)
         ttk.Button(top, text="Refresh Now", command=lambda: self.refresh_all(force=True)).pack(side="left")
 
+        ttk.Label(top, text="Container:").pack(side="left", padx=(10, 2))
+        self.container_combo = ttk.Combobox(top, textvariable=self.container_filter, state="readonly", width=26,
+                                            values=(ALL_CONTAINERS, HOST_LABEL))
+        self.container_combo.pack(side="left")
+        self.container_combo.bind("<<ComboboxSelected>>", lambda e: self.refresh_all(force=True))
+        ttk.Checkbutton(top, text="Group by container", variable=self.group_by_container,
+                        command=self._toggle_group_by_container).pack(side="left", padx=6)
+
+        # lọc theo cgroup (đặt từ tab Cgroups), chỉ hiện khi đang lọc
+        self.cgroup_filter_var = tk.StringVar(value="")
+        self.cgroup_filter_frame = ttk.Frame(top)
+        ttk.Label(self.cgroup_filter_frame, textvariable=self.cgroup_filter_var,
+                  foreground="#0078d7").pack(side="left", padx=(10, 4))
+        ttk.Button(self.cgroup_filter_frame, text="Clear", command=lambda: self._set_cgroup_filter(None)).pack(side="left")
+
         btns = ttk.Frame(top)
         btns.pack(side="right")
         ttk.Button(btns, text="End task", command=self.end_task_sigterm).pack(side="right", padx=4)
@@ -49,14 +69,20 @@ class ProcessesTabMixin:
         ttk.Button(btns, text="Properties", command=self.proc_properties).pack(side="right", padx=4)
         ttk.Button(btns, text="Set priority", command=self.set_priority).pack(side="right", padx=4)
 
-        cols = ("pid", "name", "user", "cpu", "mem", "status", "nice", "threads", "fds", "start", "cmd")
-        self.proc_tree = ttk.Treeview(parent, columns=cols, show="headings", height=20)
+        cols = ("pid", "name", "user", "cpu", "mem", "pss", "uss", "swap", "status", "nice", "threads",
+                "fds", "ctx_v", "ctx_i", "rq_wait", "start", "io_r", "io_w", "exe", "cgroup", "container", "cmd")
+        self.proc_tree = ttk.Treeview(parent, columns=cols, height=20,
+                                      show="tree headings" if self.group_by_container.get() else "headings")
         self.proc_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         headings = {
             "pid": "PID", "name": "Name", "user": "User", "cpu": "CPU %",
-            "mem": "Memory", "status": "Status", "nice": "Nice",
-            "threads": "Threads", "fds": "FDs", "start": "Start time", "cmd": "Command",
+            "mem": "Memory", "pss": "Memory (PSS)", "uss": "Private (USS)", "swap": "Swap",
+            "status": "Status", "nice": "Nice",
+            "threads": "Threads", "fds": "FDs", "ctx_v": "Ctx sw vol/s", "ctx_i": "Ctx sw invol/s",
+            "rq_wait": "Run-queue wait ms/s", "start": "Start time",
+            "io_r": "Disk read", "io_w": "Disk write", "exe": "Executable", "cgroup": "Cgroup",
+            "container": "Container", "cmd": "Command",
         }
 
         for c in cols:
@@ -64,16 +90,22 @@ class ProcessesTabMixin:
             w = 90
             if c in ("pid", "nice", "threads", "fds"): w = 70
             if c == "cpu": w = 80
-            if c == "mem": w = 110
+            if c in ("mem", "pss", "uss", "swap"): w = 110
             if c in ("name", "user", "status"): w = 140
             if c == "start": w = 160
+            if c in ("io_r", "io_w", "ctx_v", "ctx_i"): w = 100
+            if c == "rq_wait": w = 130
+            if c in ("exe", "cgroup"): w = 260
+            if c == "container": w = 220
             if c == "cmd": w = 520
             self.proc_tree.column(c, width=w, anchor="w")
+        self.proc_tree.column("#0", width=240, stretch=False)
 
         self._apply_process_columns_visibility()
 
         ysb = ttk.Scrollbar(parent, orient="vertical", command=self.proc_tree.yview)
-        self.proc_tree.configure(yscrollcommand=ysb.set)
+        self.proc_tree.configure(
+            yscrollcommand=lambda f, l: self._on_tree_scroll(self.proc_tree, ysb, "columns", f, l))
         ysb.place(in_=self.proc_tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
 
         # right-click menu
@@ -83,8 +115,11 @@ class ProcessesTabMixin:
         self.proc_menu.add_separator()
         self.proc_menu.add_command(label="Set priority (nice)", command=self.set_priority)
         self.proc_menu.add_command(label="Set CPU affinity", command=self.set_affinity)
+        self.proc_menu.add_command(label="Bulk action...", command=self.bulk_action)
         self.proc_menu.add_separator()
         self.proc_menu.add_command(label="Properties", command=self.proc_properties)
+        self.proc_menu.add_command(label="Memory map", command=self.memory_map)
+        self.proc_menu.add_command(label="Threads", command=self.threads)
         self.proc_menu.add_command(label="Open exe folder", command=self.open_exe_folder)
 
         self.proc_tree.bind("<Button-3>", self._popup_proc_menu)
@@ -97,7 +132,9 @@ class ProcessesTabMixin:
     def _popup_proc_menu(self, event):
         iid = self.proc_tree.identify_row(event.y)
         if iid:
-            self.proc_tree.selection_set(iid)
+            # giữ multi-select khi click phải vào một dòng đã chọn (cho Bulk action)
+            if iid not in self.proc_tree.selection():
+                self.proc_tree.selection_set(iid)
             try:
                 self.proc_menu.tk_popup(event.x_root, event.y_root)
             finally:
@@ -135,89 +172,118 @@ class ProcessesTabMixin:
     # Tabs: Details
     # -------------------------
     # ------------------------------------------------------------
-    # [P2][LOGIC] Collect process rows from psutil
+    # [P2][LOGIC] Collect process rows from the data source (self.source)
     #   - This is the canonical source for Processes + Details tables
     # ------------------------------------------------------------
 
-    def _collect_process_rows(self):
-        rows = []
+    @traced("collect", "collect")
+    def _collect_process_rows(self, plan: CollectPlan = FULL_PLAN):
         search = self.filter_text.get().strip().lower()
         show_system = bool(self.cfg.get("show_system_processes", True))
-
-        for p in psutil.process_iter():
-            try:
-                pid = p.pid
-                name = p.name()
-                user = p.username() if hasattr(p, "username") else ""
-                if (not show_system) and is_system_process(user):
-                    continue
-
-                # filter (name/cmd/user/pid)
-                cmdline = ""
-                try:
-                    cmdline = " ".join(p.cmdline()) if p.cmdline() else ""
-                except Exception:
-                    cmdline = ""
-                if search:
-                    hay = f"{pid} {name} {user} {cmdline}".lower()
-                    if search not in hay:
-                        continue
-
-                cpu = 0.0
-                try:
-                    cpu = float(p.cpu_percent(interval=None) or 0.0)
-                except Exception:
-                    cpu = 0.0
-
-                mem_rss = 0
-                try:
-                    mem_rss = int(p.memory_info().rss)
-                except Exception:
-                    mem_rss = 0
-
-                status = ""
-                try:
-                    st = p.status()
-                    status = PROC_STATUS_LABEL.get(st, st)
-                except Exception:
-                    status = ""
-
-                nice = 0
-                try:
-                    nice = int(p.nice())
-                except Exception:
-                    nice = 0
-
-                threads = 0
-                try:
-                    threads = int(p.num_threads())
-                except Exception:
-                    threads = 0
-
-                fds = 0
-                if hasattr(p, "num_fds"):
-                    try:
-                        fds = int(p.num_fds())
-                    except Exception:
-                        fds = 0
-
-                start_time = 0.0
-                try:
-                    start_time = float(p.create_time())
-                except Exception:
-                    start_time = 0.0
-
-                rows.append(ProcRow(
-                    pid=pid, name=name, user=user or "",
-                    cpu=cpu, mem_rss=mem_rss, status=status, nice=nice,
-                    threads=threads, fds=fds, start_time=start_time, cmd=cmdline
-                ))
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-            except Exception:
-                continue
+        # thành viên cgroup: tập của lần đọc nền gần nhất, được đọc lại nền mỗi tick
+        members = None
+        if self.cgroup_filter:
+            self._refresh_cgroup_members()
+            members = self._cgroup_members
+
+        def match(pid, name, user, cmdline):
+            if members is not None and pid not in members:
+                return False
+            if (not show_system) and is_system_user(pid, user):
+                return False
+            # filter (name/cmd/user/pid)
+            if search and not self._row_matches(search, pid, name, user, cmdline):
+                return False
+            return True
+
+        rows = self.source.collect_rows(match if (search or not show_system or members is not None) else None, plan)
+        if self._need_containers():
+            # recording đã mang sẵn container/pod; /proc của máy hiện tại không liên quan
+            if self.source.name != "recorded":
+                self.containers.tag(rows)
+            self._container_groups = {group_label(r.container, r.pod) for r in rows}
+            wanted = self.container_filter.get()
+            if wanted and wanted != ALL_CONTAINERS:
+                rows = [r for r in rows if group_label(r.container, r.pod) == wanted]
         return rows
 
+    def _need_containers(self) -> bool:
+        """Container tags are resolved only when a column, sort, filter or grouping uses them."""
+        if self.group_by_container.get() or self.container_filter.get() not in ("", ALL_CONTAINERS):
+            return True
+        if "container" in (self.sort_col, self.details_sort_col):
+            return True
+        return any(self.cfg.get(k, {}).get("container") for k in ("columns", "details_columns"))
+
+    def _set_cgroup_filter(self, label: str | None, path: str | None = None):
+        """Show only processes of one cgroup subtree in Processes/Details (None = clear)."""
+        self.cgroup_filter = (label, path) if label else None
+        self._cgroup_members = self._cgroup_members_from_scan(path) if label else set()
+        if label:
+            self.cgroup_filter_var.set(f"Cgroup: {label}")
+            self.cgroup_filter_frame.pack(side="left")
+        else:
+            self.cgroup_filter_var.set("")
+            self.cgroup_filter_frame.pack_forget()
+        self.refresh_all(force=True)
+
+    def _cgroup_members_from_scan(self, path: str) -> set:
+        """Seed the filter from the Cgroups tab's last scan (có sẵn, không phải đọc cgroupfs)."""
+        tree = getattr(self, "_cgroup_tree", None)
+        nodes = getattr(self, "_cgroup_nodes", None)
+        if tree is None or not nodes:
+            return set()
+        rel = os.path.relpath(path, tree.root)
+        return subtree_pids(nodes, "" if rel == "." else rel)
+
+    def _refresh_cgroup_members(self):
+        """Re-read the filtered cgroup subtree in the background (os.walk trên "/" rất đắt)."""
+        task = self._cgroup_members_task
+        if task is not None and task.busy:
+            return
+        path = self.cgroup_filter[1]
+
+        def done(pids, error):
+            if error is not None or not self.cgroup_filter or self.cgroup_filter[1] != path:
+                return
+            first = not self._cgroup_members
+            self._cgroup_members = pids
+            if first and pids:
+                self.refresh_all(force=True)  # lần đọc đầu: hiện ngay, không chờ tick sau
+
+        self._cgroup_members_task = run_async(self, lambda: cgroup_pids(path), done, timeout_s=10.0,
+                                              name="cgroup-members")
+
+    # ------------------------------------------------------------
+    # [P2][LOGIC] Collection plan: chỉ đọc những field thực sự cần
+    #   = cột đang hiện + cột đang sort + field mà filter cần
+    # ------------------------------------------------------------
+    def _build_collect_plan(self, columns=(), sort_col: str | None = None) -> CollectPlan:
+        need = set(columns)
+        if sort_col:
+            need.add(sort_col)
+        if self.filter_text.get().strip():
+            need.update(("user", "cmd"))
+        if not self.cfg.get("show_system_processes", True):
+            need.add("user")
+        # start_time là một nửa key (pid, start_time) của cache lazy -> luôn cần
+        need.add("start")
+        if need.intersection(SMAPS_COLUMNS):
+            need.add("mem")  # smaps_rollup được lấy mẫu theo thứ hạng RSS
+        if self.enricher is not None:
+            # field đắt do Enricher đọc theo viewport, collector không đọc cho mọi process nữa
+            need.difference_update(LAZY_COLUMNS)
+        return CollectPlan.of(need)
+
+    def _visible_columns(self, cfg_key: str) -> list:
+        return [c for c, visible in self.cfg.get(cfg_key, {}).items() if visible]
+
+    @staticmethod
+    def _row_matches(search: str, pid, name: str, user: str, cmdline: str) -> bool:
+        """Search filter (pid/name/user/cmd); `search` must already be lowercased."""
+        hay = f"{pid} {name} {user} {cmdline}".lower()
+        return search in hay
+
     # -------------------------
     # Refresh: Processes tree
     # -------------------------
@@ -225,36 +291,125 @@ class ProcessesTabMixin:
     # [P2][LOGIC] Refresh table rows (apply filter + format + insert)
     # ------------------------------------------------------------
 
+    @traced("refresh_processes", "tab")
     def refresh_processes(self, force=False):
-        rows = self._collect_process_rows()
+        plan = self._build_collect_plan(self._visible_columns("columns"), self.sort_col)
+        rows = self._collect_process_rows(plan)
+        self._enrich_rows(rows, self.sort_col, self.proc_tree, "columns")
         rows = self._sort_rows(rows, self.sort_col, self.sort_desc)
-
+        self._fill_process_tree(rows)
+        self._enrich_viewport(self.proc_tree, "columns")
+
+    def _fill_process_tree(self, rows):
+        self._tree_rows[self.proc_tree] = {str(r.pid): r for r in rows}
+        if hasattr(self, "container_combo"):
+            groups = sorted(getattr(self, "_container_groups", ()), key=lambda g: (g != HOST_LABEL, g))
+            self.container_combo["values"] = [ALL_CONTAINERS] + groups
+        if self.group_by_container.get():
+            self._fill_grouped_tree(rows)
+            return
         existing = set(self.proc_tree.get_children(""))
         new_ids = set()
 
         for r in rows:
             iid = str(r.pid)
             new_ids.add(iid)
-            values = (
+            values = self._process_values(r)
+            if iid in existing:
+                self.proc_tree.item(iid, values=values)
+            else:
+                self.proc_tree.insert("", "end", iid=iid, values=values)
+
+        for iid in existing - new_ids:
+            self.proc_tree.delete(iid)
+
+    @staticmethod
+    def _process_values(r) -> tuple:
+        return (
                 r.pid,
                 r.name,
                 r.user,
                 f"{r.cpu:.1f}",
                 fmt_bytes(r.mem_rss),
+                lazy_cell_text(r, "pss"),
+                lazy_cell_text(r, "uss"),
+                lazy_cell_text(r, "swap"),
                 r.status,
                 str(r.nice),
                 str(r.threads),
-                str(r.fds) if r.fds else "",
+                lazy_cell_text(r, "fds"),
+                f"{r.ctx_vol_rate:.0f}",
+                f"{r.ctx_invol_rate:.0f}",
+                f"{r.rq_wait:.1f}",
                 dt_from_ts(r.start_time) if r.start_time else "",
+                lazy_cell_text(r, "io_r"),
+                lazy_cell_text(r, "io_w"),
+                r.exe,
+                r.cgroup,
+                container_cell_text(r),
                 r.cmd
             )
-            if iid in existing:
-                self.proc_tree.item(iid, values=values)
+
+    def _fill_grouped_tree(self, rows):
+        """Processes grouped by container / pod (Host = không thuộc container), CPU/RSS cộng theo nhóm."""
+        tree = self.proc_tree
+        groups = {}
+        for r in rows:  # rows đã sort -> thứ tự trong nhóm giữ nguyên
+            groups.setdefault(group_label(r.container, r.pod), []).append(r)
+        if self.sort_col in ("cpu", "mem"):
+            attr = "cpu" if self.sort_col == "cpu" else "mem_rss"
+            order = sorted(groups, key=lambda g: sum(getattr(r, attr) for r in groups[g]), reverse=self.sort_desc)
+        else:
+            order = sorted(groups, key=lambda g: (g != HOST_LABEL, g))
+
+        ncols = len(tree["columns"])
+        keep = set()
+        for gi, label in enumerate(order):
+            members = groups[label]
+            giid = "grp:" + label
+            values = ["", f"{len(members)} processes", "", f"{sum(r.cpu for r in members):.1f}",
+                      fmt_bytes(sum(r.mem_rss for r in members))]
+            values += [""] * (ncols - len(values))
+            if tree.exists(giid):
+                tree.item(giid, values=values)
+                if tree.index(giid) != gi:
+                    tree.move(giid, "", gi)
             else:
-                self.proc_tree.insert("", "end", iid=iid, values=values)
+                tree.insert("", gi, iid=giid, text=label, values=values, open=True)
+            keep.add(giid)
+            for i, r in enumerate(members):
+                iid = str(r.pid)
+                if tree.exists(iid):
+                    tree.item(iid, values=self._process_values(r))
+                    if tree.parent(iid) != giid or tree.index(iid) != i:
+                        tree.move(iid, giid, i)
+                else:
+                    tree.insert(giid, i, iid=iid, values=self._process_values(r))
+                keep.add(iid)
+        for giid in tree.get_children(""):
+            for iid in tree.get_children(giid):
+                if iid not in keep:
+                    tree.delete(iid)
+            if giid not in keep:
+                tree.delete(giid)
+
+    def _toggle_group_by_container(self):
+        self.cfg["group_by_container"] = bool(self.group_by_container.get())
+        save_cfg(self.cfg)
+        tree = self.proc_tree
+        tree.delete(*tree.get_children(""))
+        tree.configure(show="tree headings" if self.group_by_container.get() else "headings")
+        self.refresh_processes(force=True)
 
-        for iid in existing - new_ids:
-            self.proc_tree.delete(iid)
+    @staticmethod
+    def _tree_row_iids(tree: ttk.Treeview) -> list:
+        """Displayed rows top to bottom (con của nhóm đang mở được tính) — khớp với yview()."""
+        out = []
+        for iid in tree.get_children(""):
+            out.append(iid)
+            if tree.get_children(iid) and tree.item(iid, "open"):
+                out.extend(tree.get_children(iid))
+        return out
 
     # -------------------------
     # Refresh: Details tree
@@ -267,8 +422,9 @@ class ProcessesTabMixin:
         reverse = bool(desc)
         colmap = {
             "pid": "pid", "name": "name", "user": "user", "cpu": "cpu", "mem": "mem_rss",
-            "status": "status", "nice": "nice", "threads": "threads", "fds": "fds",
-            "start": "start_time", "cmd": "cmd"
+            "status": "status", "nice": "nice", "threads": "threads",
+            "start": "start_time", "cmd": "cmd", "ctx_v": "ctx_vol_rate", "ctx_i": "ctx_invol_rate",
+            "rq_wait": "rq_wait", "container": "container", **ROW_ATTR
         }
         attr = colmap.get(col, col)
         def key_func(x):
@@ -283,3 +439,101 @@ class ProcessesTabMixin:
     # Actions (Processes)
     # -------------------------
 
+    # ------------------------------------------------------------
+    # [P2][LOGIC] Lazy enrichment theo viewport (dùng chung Processes/Details)
+    # ------------------------------------------------------------
+    def _enrich_rows(self, rows, sort_col, tree: ttk.Treeview | None = None, cfg_key: str | None = None):
+        """Before sort/fill: if sorting by a lazy column every row needs it; then copy cache onto rows."""
+        if self.enricher is None:
+            return
+        keys = [(r.pid, r.start_time) for r in rows]
+        if sort_col in LAZY_COLUMNS:
+            self.enricher.ensure(keys, self.enricher.sources_for([sort_col]) - BUDGETED_SOURCES)
+        self.enricher.prune(keys)
+        shown = self._visible_columns(cfg_key) if cfg_key else ()
+        if sort_col in SMAPS_COLUMNS or any(c in SMAPS_COLUMNS for c in shown):
+            self._sample_smaps(rows, tree)
+        for r in rows:
+            self.enricher.apply(r)
+
+    def _sample_smaps(self, rows, tree: ttk.Treeview | None = None):
+        """Read smaps_rollup (PSS/USS/Swap) within the per-tick budget.
+
+        Thứ tự ưu tiên: dòng đang hiện trên Treeview trước, sau đó theo RSS giảm dần
+        (process lớn nhất là nơi PSS khác RSS nhiều nhất).
+        """
+        if self.enricher is None:
+            return
+        by_rss = sorted(rows, key=lambda r: r.mem_rss, reverse=True)
+        order = [(r.pid, r.start_time) for r in by_rss]
+        if tree is not None:
+            children = self._tree_row_iids(tree)
+            if children:
+                first, last = tree.yview()
+                n = len(children)
+                visible = set(children[int(first * n):int(last * n + 0.999)])
+                order = ([(r.pid, r.start_time) for r in by_rss if str(r.pid) in visible]
+                         + [(r.pid, r.start_time) for r in by_rss if str(r.pid) not in visible])
+        budget = float(self.cfg.get("smaps_budget_ms", 15)) / 1000.0
+        self.enricher.sample(order, "smaps", budget)
+
+    def _enrich_viewport(self, tree: ttk.Treeview, cfg_key: str):
+        """Fetch lazy fields for rows on screen (+ margin) now; queue the rest for background fill."""
+        if self.enricher is None:
+            return
+        lazy = [c for c in self._visible_columns(cfg_key) if c in LAZY_COLUMNS]
+        # smaps không đọc theo viewport mà lấy mẫu mỗi tick (_sample_smaps)
+        sources = self.enricher.sources_for(lazy) - BUDGETED_SOURCES
+        rows = self._tree_rows.get(tree)
+        if not sources or not rows:
+            return
+        children = self._tree_row_iids(tree)
+        n = len(children)
+        if n == 0:
+            return
+        first, last = tree.yview()
+        margin = int(self.cfg.get("enrich_viewport_margin", 20))
+        lo = max(0, int(first * n) - margin)
+        hi = min(n, int(last * n + 0.999) + margin)
+
+        def key_of(iid):
+            r = rows.get(iid)
+            return None if r is None else (r.pid, r.start_time)
+
+        in_view = [k for k in map(key_of, children[lo:hi]) if k]
+        self._update_lazy_cells(tree, rows, self.enricher.ensure(in_view, sources), lazy)
+
+        rest = [k for k in map(key_of, children[hi:] + children[:lo]) if k]
+        self.enricher.queue(rest, sources)
+        if rest and self._enrich_job is None:
+            self._enrich_job = self.after(30, lambda: self._enrich_background_step(tree, cfg_key))
+
+    def _enrich_background_step(self, tree: ttk.Treeview, cfg_key: str):
+        self._enrich_job = None
+        if self.enricher is None:
+            return
+        budget = float(self.cfg.get("enrich_budget_ms", 8)) / 1000.0
+        changed = self.enricher.run_budget(budget)
+        lazy = [c for c in self._visible_columns(cfg_key) if c in LAZY_COLUMNS]
+        self._update_lazy_cells(tree, self._tree_rows.get(tree, {}), changed, lazy)
+        if self.enricher.has_pending():
+            self._enrich_job = self.after(30, lambda: self._enrich_background_step(tree, cfg_key))
+
+    def _update_lazy_cells(self, tree: ttk.Treeview, rows: dict, keys, lazy_cols):
+        for pid, _start in keys:
+            iid = str(pid)
+            r = rows.get(iid)
+            if r is None or not tree.exists(iid):
+                continue
+            self.enricher.apply(r)
+            for c in lazy_cols:
+                tree.set(iid, c, lazy_cell_text(r, c))
+
+    def _on_tree_scroll(self, tree: ttk.Treeview, scrollbar, cfg_key: str, first, last):
+        """yscrollcommand: move the scrollbar, then (debounced) enrich newly visible rows."""
+        scrollbar.set(first, last)
+        if self._viewport_jobs.get(tree) is None:
+            def run():
+                self._viewport_jobs[tree] = None
+                self._enrich_viewport(tree, cfg_key)
+            self._viewport_jobs[tree] = self.after(60, run)
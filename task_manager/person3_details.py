@@ -17,6 +17,9 @@ import psutil
 from .config import DEFAULT_CFG, HISTORY_LEN, USER_AUTOSTART_DIR, SYS_AUTOSTART_DIRS, PROC_STATUS_LABEL
 from .utils import fmt_bytes, safe_call, is_system_process, dt_from_ts, readlink_exe, run_cmd
 from .models import ProcRow
+from .tracing import traced
+from .enrich import lazy_cell_text
+from .containers import cell_text as container_cell_text
 # ============================================================
 # PERSON 3 — DETAILS TAB
 #   - UI: treeview, column chooser, context menu
@@ -47,30 +50,41 @@ class DetailsTabMixin:
         ttk.Button(btns, text="Kill", command=self.kill_process_details).pack(side="right", padx=4)
         ttk.Button(btns, text="Properties", command=self.proc_properties_details).pack(side="right", padx=4)
 
-        cols = ("pid", "name", "user", "status", "cpu", "mem", "nice", "threads", "fds", "start", "cmd")
+        cols = ("pid", "name", "user", "status", "cpu", "mem", "pss", "uss", "swap", "nice", "threads",
+                "fds", "ctx_v", "ctx_i", "rq_wait", "start", "io_r", "io_w", "exe", "cgroup", "container",
+                "cmd")
         self.details_tree = ttk.Treeview(parent, columns=cols, show="headings", height=20)
         self.details_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         headings = {
             "pid": "PID", "name": "Image Name", "user": "User Name", "status": "Status",
-            "cpu": "CPU %", "mem": "Memory (RSS)", "nice": "Nice",
-            "threads": "Threads", "fds": "FDs", "start": "Start time", "cmd": "Command line",
+            "cpu": "CPU %", "mem": "Memory (RSS)", "pss": "Memory (PSS)", "uss": "Private (USS)",
+            "swap": "Swap", "nice": "Nice",
+            "threads": "Threads", "fds": "FDs", "ctx_v": "Ctx sw vol/s", "ctx_i": "Ctx sw invol/s",
+            "rq_wait": "Run-queue wait ms/s", "start": "Start time",
+            "io_r": "Disk read", "io_w": "Disk write", "exe": "Executable", "cgroup": "Cgroup",
+            "container": "Container", "cmd": "Command line",
         }
         for c in cols:
             self.details_tree.heading(c, text=headings[c], command=lambda cc=c: self._sort_details(cc))
             w = 90
             if c in ("pid", "nice", "threads", "fds"): w = 70
             if c == "cpu": w = 80
-            if c == "mem": w = 120
+            if c in ("mem", "pss", "uss", "swap"): w = 120
             if c in ("name", "user", "status"): w = 160
             if c == "start": w = 160
+            if c in ("io_r", "io_w", "ctx_v", "ctx_i"): w = 100
+            if c == "rq_wait": w = 130
+            if c in ("exe", "cgroup"): w = 260
+            if c == "container": w = 220
             if c == "cmd": w = 560
             self.details_tree.column(c, width=w, anchor="w")
 
         self._apply_details_columns_visibility()
 
         ysb = ttk.Scrollbar(parent, orient="vertical", command=self.details_tree.yview)
-        self.details_tree.configure(yscrollcommand=ysb.set)
+        self.details_tree.configure(
+            yscrollcommand=lambda f, l: self._on_tree_scroll(self.details_tree, ysb, "details_columns", f, l))
         ysb.place(in_=self.details_tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
 
         self.details_menu = tk.Menu(self, tearoff=0)
@@ -78,7 +92,10 @@ class DetailsTabMixin:
         self.details_menu.add_command(label="Kill (SIGKILL)", command=self.kill_process_details)
         self.details_menu.add_separator()
         self.details_menu.add_command(label="Set priority (nice)", command=self.set_priority_details)
+        self.details_menu.add_command(label="Bulk action...", command=self.bulk_action_details)
         self.details_menu.add_command(label="Properties", command=self.proc_properties_details)
+        self.details_menu.add_command(label="Memory map", command=self.memory_map_details)
+        self.details_menu.add_command(label="Threads", command=self.threads_details)
 
         self.details_tree.bind("<Button-3>", self._popup_details_menu)
         self.details_tree.bind("<Double-1>", lambda e: self.proc_properties_details())
@@ -90,7 +107,8 @@ class DetailsTabMixin:
     def _popup_details_menu(self, event):
         iid = self.details_tree.identify_row(event.y)
         if iid:
-            self.details_tree.selection_set(iid)
+            if iid not in self.details_tree.selection():
+                self.details_tree.selection_set(iid)
             try:
                 self.details_menu.tk_popup(event.x_root, event.y_root)
             finally:
@@ -131,9 +149,13 @@ class DetailsTabMixin:
     # [P3][LOGIC] Refresh Details rows (uses shared collector)
     # ------------------------------------------------------------
 
+    @traced("refresh_details", "tab")
     def refresh_details(self, force=False):
-        rows = self._collect_process_rows()
+        plan = self._build_collect_plan(self._visible_columns("details_columns"), self.details_sort_col)
+        rows = self._collect_process_rows(plan)
+        self._enrich_rows(rows, self.details_sort_col, self.details_tree, "details_columns")
         rows = self._sort_rows(rows, self.details_sort_col, self.details_sort_desc)
+        self._tree_rows[self.details_tree] = {str(r.pid): r for r in rows}
 
         existing = set(self.details_tree.get_children(""))
         new_ids = set()
@@ -147,10 +169,21 @@ class DetailsTabMixin:
                 r.status,
                 f"{r.cpu:.1f}",
                 fmt_bytes(r.mem_rss),
+                lazy_cell_text(r, "pss"),
+                lazy_cell_text(r, "uss"),
+                lazy_cell_text(r, "swap"),
                 str(r.nice),
                 str(r.threads),
-                str(r.fds) if r.fds else "",
+                lazy_cell_text(r, "fds"),
+                f"{r.ctx_vol_rate:.0f}",
+                f"{r.ctx_invol_rate:.0f}",
+                f"{r.rq_wait:.1f}",
                 dt_from_ts(r.start_time) if r.start_time else "",
+                lazy_cell_text(r, "io_r"),
+                lazy_cell_text(r, "io_w"),
+                r.exe,
+                r.cgroup,
+                container_cell_text(r),
                 r.cmd
             )
             if iid in existing:
@@ -161,4 +194,4 @@ class DetailsTabMixin:
         for iid in existing - new_ids:
             self.details_tree.delete(iid)
 
-
+        self._enrich_viewport(self.details_tree, "details_columns")
@@ -17,6 +17,11 @@ import psutil
 from .config import DEFAULT_CFG, HISTORY_LEN, USER_AUTOSTART_DIR, SYS_AUTOSTART_DIRS, PROC_STATUS_LABEL
 from .utils import fmt_bytes, safe_call, is_system_process, dt_from_ts, readlink_exe, run_cmd
 from .models import ProcRow
+from .proc_properties import ProcPropertiesWindow
+from .memmap import MemoryMapWindow
+from .threads_view import ThreadsWindow
+from .file_holders import FileHoldersWindow
+from .bulk_actions import BulkActionWindow
 # ============================================================
 # PERSON 4 — PROCESS ACTIONS & PROPERTIES
 #   - End/Kill/Signal
@@ -44,12 +49,20 @@ class ActionsMixin:
                 return int(vals[0])
             except Exception:
                 return None
+
+    def _multi_selected(self, tree: ttk.Treeview) -> bool:
+        """Nhiều dòng được chọn (hoặc một dòng nhóm container) -> thao tác đi qua Bulk action."""
+        sel = tree.selection()
+        return len(sel) > 1 or any(iid.startswith("grp:") for iid in sel)
     # ------------------------------------------------------------
     # [P4][ACTION] End task (SIGTERM)
     # ------------------------------------------------------------
 
 
     def end_task_sigterm(self):
+        if self._multi_selected(self.proc_tree):
+            self._show_bulk_actions(self.proc_tree, "SIGTERM", run=True)
+            return
         pid = self._selected_pid(self.proc_tree)
         if pid is None:
             return
@@ -60,6 +73,9 @@ class ActionsMixin:
 
 
     def kill_process(self):
+        if self._multi_selected(self.proc_tree):
+            self._show_bulk_actions(self.proc_tree, "SIGKILL", run=True)
+            return
         pid = self._selected_pid(self.proc_tree)
         if pid is None:
             return
@@ -70,6 +86,9 @@ class ActionsMixin:
 
 
     def set_priority(self):
+        if self._multi_selected(self.proc_tree):
+            self._show_bulk_actions(self.proc_tree, "Renice")
+            return
         pid = self._selected_pid(self.proc_tree)
         if pid is None:
             return
@@ -80,6 +99,9 @@ class ActionsMixin:
 
 
     def set_affinity(self):
+        if self._multi_selected(self.proc_tree):
+            self._show_bulk_actions(self.proc_tree, "Set CPU affinity")
+            return
         pid = self._selected_pid(self.proc_tree)
         if pid is None:
             return
@@ -94,6 +116,19 @@ class ActionsMixin:
         if pid is None:
             return
         self._show_proc_properties(pid)
+
+    def memory_map(self):
+        pid = self._selected_pid(self.proc_tree)
+        if pid is None:
+            return
+        self._show_memory_map(pid)
+
+    def threads(self):
+        pid = self._selected_pid(self.proc_tree)
+        if pid is None:
+            return
+        self._show_threads(pid)
+
     # ------------------------------------------------------------
     # [P4][ACTION] Open executable folder (xdg-open)
     # ------------------------------------------------------------
@@ -117,7 +152,13 @@ class ActionsMixin:
     # Actions (Details)
     # -------------------------
 
+    def bulk_action(self):
+        self._show_bulk_actions(self.proc_tree)
+
     def end_task_sigterm_details(self):
+        if self._multi_selected(self.details_tree):
+            self._show_bulk_actions(self.details_tree, "SIGTERM", run=True)
+            return
         pid = self._selected_pid(self.details_tree)
         if pid is None:
             return
@@ -125,6 +166,9 @@ class ActionsMixin:
 
 
     def kill_process_details(self):
+        if self._multi_selected(self.details_tree):
+            self._show_bulk_actions(self.details_tree, "SIGKILL", run=True)
+            return
         pid = self._selected_pid(self.details_tree)
         if pid is None:
             return
@@ -132,18 +176,39 @@ class ActionsMixin:
 
 
     def set_priority_details(self):
+        if self._multi_selected(self.details_tree):
+            self._show_bulk_actions(self.details_tree, "Renice")
+            return
         pid = self._selected_pid(self.details_tree)
         if pid is None:
             return
         self._set_nice(pid)
 
 
+    def bulk_action_details(self):
+        self._show_bulk_actions(self.details_tree)
+
+
     def proc_properties_details(self):
         pid = self._selected_pid(self.details_tree)
         if pid is None:
             return
         self._show_proc_properties(pid)
 
+
+    def memory_map_details(self):
+        pid = self._selected_pid(self.details_tree)
+        if pid is None:
+            return
+        self._show_memory_map(pid)
+
+
+    def threads_details(self):
+        pid = self._selected_pid(self.details_tree)
+        if pid is None:
+            return
+        self._show_threads(pid)
+
     # -------------------------
     # Signal / priority helpers
     # -------------------------
@@ -225,49 +290,8 @@ class ActionsMixin:
 
     def _show_proc_properties(self, pid: int):
         try:
-            p = psutil.Process(pid)
-            # gather info (best-effort)
-            info = {}
-            info["PID"] = str(pid)
-            info["Name"] = p.name()
-            try: info["Executable"] = p.exe()
-            except Exception: info["Executable"] = ""
-            try: info["CWD"] = p.cwd()
-            except Exception: info["CWD"] = ""
-            try: info["User"] = p.username()
-            except Exception: info["User"] = ""
-            try: info["Status"] = PROC_STATUS_LABEL.get(p.status(), p.status())
-            except Exception: info["Status"] = ""
-            try: info["Started"] = dt_from_ts(p.create_time())
-            except Exception: info["Started"] = ""
-            try: info["Nice"] = str(p.nice())
-            except Exception: info["Nice"] = ""
-            try: info["CPU %"] = f"{p.cpu_percent(interval=None):.1f}"
-            except Exception: info["CPU %"] = ""
-            try: info["Memory (RSS)"] = fmt_bytes(p.memory_info().rss)
-            except Exception: info["Memory (RSS)"] = ""
-            try: info["Threads"] = str(p.num_threads())
-            except Exception: info["Threads"] = ""
-            if hasattr(p, "num_fds"):
-                try: info["FDs"] = str(p.num_fds())
-                except Exception: info["FDs"] = ""
-            try:
-                cmd = p.cmdline()
-                info["Command line"] = " ".join(cmd) if cmd else ""
-            except Exception:
-                info["Command line"] = ""
-
-            try:
-                files = p.open_files()
-                info["Open files (count)"] = str(len(files))
-            except Exception:
-                info["Open files (count)"] = ""
-            try:
-                conns = p.connections(kind="inet") if hasattr(p, "connections") else []
-                info["Connections (count)"] = str(len(conns))
-            except Exception:
-                info["Connections (count)"] = ""
-
+            # chỉ field rẻ: cửa sổ mở ngay, phần đắt (open files, connections) nạp nền
+            d = self.source.process_info(pid, expensive=False)
         except psutil.NoSuchProcess:
             messagebox.showwarning("Not found", "Process không còn tồn tại.")
             return
@@ -277,30 +301,64 @@ class ActionsMixin:
         except Exception as e:
             messagebox.showerror("Error", str(e))
             return
+        ProcPropertiesWindow(self, pid, d)
 
-        win = tk.Toplevel(self)
-        win.title(f"Properties - PID {pid}")
-        win.geometry("760x520")
-        win.transient(self)
-
-        frm = ttk.Frame(win)
-        frm.pack(fill="both", expand=True, padx=12, pady=12)
-
-        tree = ttk.Treeview(frm, columns=("k", "v"), show="headings")
-        tree.heading("k", text="Field")
-        tree.heading("v", text="Value")
-        tree.column("k", width=180, anchor="w")
-        tree.column("v", width=540, anchor="w")
-        tree.pack(fill="both", expand=True)
+    def _show_memory_map(self, pid: int):
+        if self.source.name == "recorded":
+            messagebox.showinfo("Memory map", "Recording không có /proc/<pid>/smaps.")
+            return
+        MemoryMapWindow(self, pid)
 
-        for k, v in info.items():
-            tree.insert("", "end", values=(k, v))
+    def _show_threads(self, pid: int):
+        if self.source.name == "recorded":
+            messagebox.showinfo("Threads", "Recording không có /proc/<pid>/task.")
+            return
+        try:
+            ThreadsWindow(self, pid)
+        except OSError as e:
+            messagebox.showerror("Threads", str(e))
 
-        btns = ttk.Frame(win)
-        btns.pack(fill="x", padx=12, pady=(0, 12))
-        ttk.Button(btns, text="Copy selected", command=lambda: self._copy_tree_selection(tree)).pack(side="right")
-        ttk.Button(btns, text="Close", command=win.destroy).pack(side="right", padx=8)
+    def _show_file_holders(self, path: str = ""):
+        if self.source.name == "recorded":
+            messagebox.showinfo("Who holds this file", "Recording không có /proc/<pid>/fd.")
+            return
+        FileHoldersWindow(self, path)
 
+    def _show_bulk_actions(self, tree: ttk.Treeview, action: str = "SIGTERM", run: bool = False):
+        if self.source.name == "recorded":
+            messagebox.showinfo("Bulk action", "Recording không có process thật để gửi signal.")
+            return
+        BulkActionWindow(self, tree, action, run=run)
+
+    @staticmethod
+    def _format_proc_info(d: dict) -> dict:
+        """Raw process_info() dict -> ordered {label: text} for the Properties table."""
+        def txt(key, fmt=str):
+            v = d.get(key)
+            if v is None:
+                return ""
+            try:
+                return fmt(v)
+            except Exception:
+                return ""
+
+        info = {}
+        info["PID"] = str(d["pid"])
+        info["Name"] = txt("name")
+        info["Executable"] = txt("exe")
+        info["CWD"] = txt("cwd")
+        info["User"] = txt("user")
+        info["Status"] = txt("status", lambda v: PROC_STATUS_LABEL.get(v, v))
+        info["Started"] = txt("create_time", dt_from_ts)
+        info["Nice"] = txt("nice")
+        info["CPU %"] = txt("cpu", lambda v: f"{v:.1f}")
+        info["Memory (RSS)"] = txt("rss", fmt_bytes)
+        info["Threads"] = txt("threads")
+        info["FDs"] = txt("fds")
+        info["Command line"] = txt("cmdline")
+        info["Open files (count)"] = txt("open_files")
+        info["Connections (count)"] = txt("connections")
+        return info
 
     def _copy_tree_selection(self, tree: ttk.Treeview):
         sel = tree.selection()
@@ -4,7 +4,6 @@ from __future__ import annotations
 import os
 import time
 import subprocess
-import shutil
 from collections import deque, defaultdict
 from pathlib import Path
 
@@ -14,11 +13,22 @@ from tkinter import ttk, messagebox
 import psutil
 
 # Các import nội bộ từ project của bạn
-from .config import USER_AUTOSTART_DIR, SYS_AUTOSTART_DIRS
+from .config import USER_AUTOSTART_DIR, HISTORY_LEN, save_cfg
 from .utils import fmt_bytes, safe_call
+from .tracing import traced
+from .bgtask import run_async
+from .services import find_systemctl, list_units, unit_action, diff_units
+from .cgroupfs import CGROUP_ROOT, UnitAccounting, CgroupTree
+from .netconns import CONN_COLS, ConnectionTable, connection_view
+from .procfs import PROC_ROOT
+from .netdev import IFACE_KINDS, NetDevRates
+from .startup import StartupScanner
+
+# cột chữ của tab Services -> vị trí trong values (các cột còn lại sort theo số cgroup)
+SERVICE_TEXT_COLS = {"unit": 0, "load": 1, "active": 2, "sub": 3, "description": 13}
 
 # ============================================================
-# PERSON 5 — PERFORMANCE + USERS + SERVICES + STARTUP
+# PERSON 5 — PERFORMANCE + USERS + SERVICES + STARTUP + CGROUPS + CONNECTIONS
 # ============================================================
 
 class OtherTabsMixin:
@@ -62,6 +72,7 @@ class OtherTabsMixin:
         grid.columnconfigure(1, weight=1)
         grid.rowconfigure(0, weight=1)
         grid.rowconfigure(1, weight=1)
+        grid.rowconfigure(2, weight=1)
 
         self.canvas_cpu = tk.Canvas(grid, height=220, bg="#f0f0f0", highlightthickness=1, highlightbackground="#cccccc")
         self.canvas_mem = tk.Canvas(grid, height=220, bg="#f0f0f0", highlightthickness=1, highlightbackground="#cccccc")
@@ -80,6 +91,59 @@ class OtherTabsMixin:
         ttk.Label(grid, text="Swap Usage", font=("Arial", 10, "bold")).grid(row=1, column=1, sticky="w")
         self.canvas_swap.grid(row=1, column=1, sticky="nsew", pady=(20, 0))
 
+        # PSI: % thời gian có task bị stall (delta total "some"), cùng lịch sử với các biểu đồ khác
+        self.canvas_psi = tk.Canvas(grid, height=160, bg="#f0f0f0", highlightthickness=1, highlightbackground="#cccccc")
+        psi_head = ttk.Frame(grid)
+        psi_head.grid(row=2, column=0, columnspan=2, sticky="nw", pady=(8, 0))
+        ttk.Label(psi_head, text="Pressure stall (% time, some)", font=("Arial", 10, "bold")).pack(side="left")
+        self.psi_alert = tk.StringVar(value="")
+        ttk.Label(psi_head, textvariable=self.psi_alert, foreground="#cc0000",
+                  font=("Arial", 10, "bold")).pack(side="left", padx=12)
+        self.canvas_psi.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(28, 0))
+
+        self._build_net_ifaces(grid)
+
+    def _build_net_ifaces(self, grid):
+        """Per-interface table + charts of the selected interface (row 3 of the Performance grid)."""
+        grid.rowconfigure(3, weight=1)
+        left = ttk.Frame(grid)
+        left.grid(row=3, column=0, sticky="nsew", padx=(0, 8), pady=(8, 0))
+        head = ttk.Frame(left)
+        head.pack(fill="x")
+        ttk.Label(head, text="Network interfaces", font=("Arial", 10, "bold")).pack(side="left")
+        hidden = set(self.cfg.get("net_hidden_kinds", ["loopback", "veth"]))
+        self.net_kind_vars = {}
+        for kind in reversed(IFACE_KINDS):
+            var = tk.BooleanVar(value=kind not in hidden)
+            self.net_kind_vars[kind] = var
+            ttk.Checkbutton(head, text=kind, variable=var, command=self._toggle_net_kinds).pack(side="right")
+
+        cols = ("kind", "rx", "tx", "rx_pkt", "tx_pkt", "errs", "drops")
+        self.net_tree = ttk.Treeview(left, columns=cols, show="tree headings", height=6)
+        self.net_tree.pack(fill="both", expand=True)
+        self.net_tree.heading("#0", text="Interface")
+        self.net_tree.column("#0", width=120, anchor="w")
+        headings = {"kind": "Kind", "rx": "Recv/s", "tx": "Sent/s", "rx_pkt": "Rx pkt/s",
+                    "tx_pkt": "Tx pkt/s", "errs": "Errors/s", "drops": "Drops/s"}
+        for c in cols:
+            self.net_tree.heading(c, text=headings[c])
+            self.net_tree.column(c, width=80, anchor="w")
+        self.net_tree.bind("<<TreeviewSelect>>", lambda e: self._draw_iface_charts())
+
+        right = ttk.Frame(grid)
+        right.grid(row=3, column=1, sticky="nsew", pady=(8, 0))
+        self.net_iface_title = tk.StringVar(value="")
+        ttk.Label(right, textvariable=self.net_iface_title, font=("Arial", 10, "bold")).pack(anchor="w")
+        self.canvas_iface = tk.Canvas(right, height=90, bg="#f0f0f0", highlightthickness=1,
+                                      highlightbackground="#cccccc")
+        self.canvas_iface.pack(fill="both", expand=True)
+        self.canvas_iface_drops = tk.Canvas(right, height=70, bg="#f0f0f0", highlightthickness=1,
+                                            highlightbackground="#cccccc")
+        self.canvas_iface_drops.pack(fill="both", expand=True, pady=(4, 0))
+
+        self._net_dev = None     # netdev.NetDevRates, tạo ở lần refresh đầu
+        self._net_rates = {}     # iface -> rates của tick gần nhất
+
     # -------------------------
     # Tabs: Users
     # -------------------------
@@ -89,6 +153,13 @@ class OtherTabsMixin:
 
         ttk.Button(top, text="Refresh Now", command=lambda: self.refresh_all(force=True)).pack(side="left")
 
+        # RSS đếm trùng trang nhớ chia sẻ; PSS chia đều trang chia sẻ -> tổng theo user khớp RAM thật
+        ttk.Label(top, text="Memory:").pack(side="left", padx=(16, 4))
+        self.var_users_mem = tk.StringVar(value=self.cfg.get("users_mem_metric", "rss"))
+        for metric, label in (("rss", "RSS"), ("pss", "PSS")):
+            ttk.Radiobutton(top, text=label, value=metric, variable=self.var_users_mem,
+                            command=self._set_users_mem_metric).pack(side="left")
+
         cols = ("user", "processes", "cpu", "mem")
         self.users_tree = ttk.Treeview(parent, columns=cols, show="headings", height=20)
         self.users_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
@@ -119,7 +190,8 @@ class OtherTabsMixin:
         ttk.Button(btns, text="Stop", command=lambda: self._service_action("stop")).pack(side="right", padx=4)
         ttk.Button(btns, text="Restart", command=lambda: self._service_action("restart")).pack(side="right", padx=4)
 
-        cols = ("unit", "load", "active", "sub", "description")
+        cols = ("unit", "load", "active", "sub", "cpu", "mem", "peak", "io_r", "io_w", "tasks",
+                "psi_cpu", "psi_memory", "psi_io", "description")
         self.services_tree = ttk.Treeview(parent, columns=cols, show="headings", height=20)
         self.services_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
@@ -128,11 +200,16 @@ class OtherTabsMixin:
 
         headings = {
             "unit": "Service", "load": "Load", "active": "Active",
-            "sub": "Sub", "description": "Description",
+            "sub": "Sub", "cpu": "CPU %", "mem": "Memory", "peak": "Peak memory",
+            "io_r": "Disk read/s", "io_w": "Disk write/s", "tasks": "Tasks",
+            "psi_cpu": "CPU pressure", "psi_memory": "Mem pressure", "psi_io": "I/O pressure",
+            "description": "Description",
         }
-        widths = {"unit": 280, "load": 80, "active": 90, "sub": 120, "description": 560}
+        widths = {"unit": 280, "load": 80, "active": 90, "sub": 120, "cpu": 70, "mem": 100, "peak": 100,
+                  "io_r": 100, "io_w": 100, "tasks": 60,
+                  "psi_cpu": 90, "psi_memory": 90, "psi_io": 90, "description": 480}
         for c in cols:
-            self.services_tree.heading(c, text=headings[c])
+            self.services_tree.heading(c, text=headings[c], command=lambda cc=c: self._sort_services(cc))
             self.services_tree.column(c, width=widths[c], anchor="w")
 
         ysb = ttk.Scrollbar(parent, orient="vertical", command=self.services_tree.yview)
@@ -144,6 +221,16 @@ class OtherTabsMixin:
         )
         ttk.Label(parent, textvariable=self.services_hint, anchor="w").pack(fill="x", padx=10, pady=(0, 6))
 
+        # cache danh sách unit: tải nền, chỉ tải lại khi cũ hơn services_max_age_s
+        self._services_units = {}  # unit -> values đang hiện
+        self._services_stats = {}  # unit -> số liệu cgroup thô (để sort)
+        self._unit_acct = None     # cgroupfs.UnitAccounting, tạo ở lần tải đầu
+        self.services_sort_col = None  # None = thứ tự của systemctl
+        self.services_sort_desc = True
+        self._services_fetched_at = 0.0
+        self._services_task = None
+        self._services_pending = False
+
     # -------------------------
     # Tabs: Startup
     # -------------------------
@@ -178,33 +265,37 @@ class OtherTabsMixin:
         ysb.place(in_=self.startup_tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
 
         self.startup_hint = tk.StringVar(
-            value="Startup: đọc ~/.config/autostart và /etc/xdg/autostart. Enable/Disable chỉ áp dụng cho user scope."
+            value="Startup: đọc ~/.config/autostart, /etc/xdg/autostart và systemd user units. "
+                  "Enable/Disable chỉ áp dụng cho user scope."
         )
         ttk.Label(parent, textvariable=self.startup_hint, anchor="w").pack(fill="x", padx=10, pady=(0, 6))
 
+        self._startup_scanner = StartupScanner()
+        self._startup_rows = {}  # path -> values, theo thứ tự hiển thị
+
     # ------------------------------------------------------------
     # [P5][LOGIC] Refresh performance
     # ------------------------------------------------------------
+    @traced("refresh_performance", "tab")
     def refresh_performance(self):
-        cpu = psutil.cpu_percent(interval=None)
-        vm = psutil.virtual_memory()
-        sm = psutil.swap_memory()
+        snap = self.source.system_snapshot()
+        cpu = snap["cpu"]
 
         self.cpu_hist.append(cpu)
-        self.mem_hist.append(vm.percent)
-        self.swap_hist.append(sm.percent)
+        self.mem_hist.append(snap["mem_percent"])
+        self.swap_hist.append(snap["swap_percent"])
 
         try:
             now = time.time()
-            net = psutil.net_io_counters()
+            net = (snap["net_sent"], snap["net_recv"])
             if self._last_net is None:
                 self._last_net = net
                 self._last_net_ts = now
                 sent_kbs = recv_kbs = 0.0
             else:
                 dt = max(1e-6, now - (self._last_net_ts or now))
-                sent_kbs = (net.bytes_sent - self._last_net.bytes_sent) / 1024.0 / dt
-                recv_kbs = (net.bytes_recv - self._last_net.bytes_recv) / 1024.0 / dt
+                sent_kbs = max(0.0, (net[0] - self._last_net[0]) / 1024.0 / dt)
+                recv_kbs = max(0.0, (net[1] - self._last_net[1]) / 1024.0 / dt)
                 self._last_net = net
                 self._last_net_ts = now
             self.net_sent_hist.append(sent_kbs)
@@ -215,8 +306,8 @@ class OtherTabsMixin:
 
         self.perf_summary.set(
             f"CPU: {cpu:.1f}%    "
-            f"Memory: {vm.percent:.1f}% ({fmt_bytes(vm.used)} / {fmt_bytes(vm.total)})    "
-            f"Swap: {sm.percent:.1f}% ({fmt_bytes(sm.used)} / {fmt_bytes(sm.total)})"
+            f"Memory: {snap['mem_percent']:.1f}% ({fmt_bytes(snap['mem_used'])} / {fmt_bytes(snap['mem_total'])})    "
+            f"Swap: {snap['swap_percent']:.1f}% ({fmt_bytes(snap['swap_used'])} / {fmt_bytes(snap['swap_total'])})"
         )
 
         self._draw_line_chart(self.canvas_cpu, list(self.cpu_hist), 0, 100, suffix="%", dual=False, line_color="#0078d7")
@@ -225,9 +316,116 @@ class OtherTabsMixin:
         self._draw_line_chart(self.canvas_net, list(self.net_recv_hist), 0, None, suffix=" KB/s",
                               dual=True, series2=list(self.net_sent_hist), label1="Recv", label2="Sent",
                               line_color="#009900", line_color2="#cc0000")
-
+        self._refresh_psi(snap)
+        self._refresh_net_ifaces()
+
+    def _refresh_net_ifaces(self):
+        """/proc/net/dev deltas -> per-interface history, table and charts of the selected one."""
+        if self._net_dev is None:
+            self._net_dev = NetDevRates(getattr(self.source, "root", PROC_ROOT))
+        rates = self._net_dev.sample()
+        self._net_rates = rates
+        hist = self.iface_hist
+        for iface, r in rates.items():
+            h = hist.get(iface)
+            if h is None:
+                # interface mới: lấp 0 để thẳng hàng thời gian với các biểu đồ khác
+                h = hist[iface] = {k: deque([0.0] * (len(self.cpu_hist) - 1), maxlen=HISTORY_LEN)
+                                   for k in ("rx", "tx", "drops", "errs")}
+            h["rx"].append(r["rx_bytes"] / 1024.0)
+            h["tx"].append(r["tx_bytes"] / 1024.0)
+            h["drops"].append(r["rx_drop"] + r["tx_drop"])
+            h["errs"].append(r["rx_errs"] + r["tx_errs"])
+        for iface in [i for i in hist if i not in rates]:
+            del hist[iface]
+
+        visible = self._visible_net_ifaces()
+        drops = sum(r["rx_drop"] + r["tx_drop"] for r in visible.values())
+        errs = sum(r["rx_errs"] + r["tx_errs"] for r in visible.values())
+        if drops or errs:
+            self.perf_summary.set(self.perf_summary.get() + f"\nNetwork: drops {drops:.0f}/s, errors {errs:.0f}/s")
+        self._fill_net_tree(visible)
+
+    def _visible_net_ifaces(self) -> dict:
+        return {i: r for i, r in self._net_rates.items() if self.net_kind_vars[r["kind"]].get()}
+
+    def _fill_net_tree(self, visible: dict):
+        tree = self.net_tree
+        for iid in tree.get_children(""):
+            if iid not in visible:
+                tree.delete(iid)
+        order = sorted(visible, key=lambda i: -(visible[i]["rx_bytes"] + visible[i]["tx_bytes"]))
+        for pos, iface in enumerate(order):
+            r = visible[iface]
+            values = (r["kind"], fmt_bytes(r["rx_bytes"]) + "/s", fmt_bytes(r["tx_bytes"]) + "/s",
+                      f"{r['rx_packets']:.0f}", f"{r['tx_packets']:.0f}",
+                      f"{r['rx_errs'] + r['tx_errs']:.0f}", f"{r['rx_drop'] + r['tx_drop']:.0f}")
+            if tree.exists(iface):
+                tree.item(iface, values=values)
+                if tree.index(iface) != pos:
+                    tree.move(iface, "", pos)
+            else:
+                tree.insert("", pos, iid=iface, text=iface, values=values)
+        if order and not tree.selection():
+            tree.selection_set(order[0])  # mặc định: interface bận nhất
+        self._draw_iface_charts()
+
+    def _draw_iface_charts(self):
+        sel = self.net_tree.selection()
+        h = self.iface_hist.get(sel[0]) if sel else None
+        if h is None:
+            self.net_iface_title.set("")
+            self.canvas_iface.delete("all")
+            self.canvas_iface_drops.delete("all")
+            return
+        self.net_iface_title.set(f"{sel[0]} (KB/s; dưới: drops + errors /s)")
+        self._draw_line_chart(self.canvas_iface, list(h["rx"]), 0, None, suffix=" KB/s",
+                              dual=True, series2=list(h["tx"]), label1="Recv", label2="Sent",
+                              line_color="#009900", line_color2="#cc0000")
+        self._draw_line_chart(self.canvas_iface_drops, list(h["drops"]), 0, None, suffix="/s",
+                              line_color="#cc0000", more=((list(h["errs"]), "#ff8c00", "Errors"),),
+                              label1="Drops")
+
+    def _toggle_net_kinds(self):
+        self.cfg["net_hidden_kinds"] = [k for k, v in self.net_kind_vars.items() if not v.get()]
+        save_cfg(self.cfg)
+        self._fill_net_tree(self._visible_net_ifaces())
+
+    def _refresh_psi(self, snap: dict):
+        """PSI history/chart + alert khi "some" avg10 vượt ngưỡng psi_alert_<res> trong config."""
+        if "psi_cpu_some10" not in snap and "psi_memory_some10" not in snap:
+            self.psi_alert.set("PSI không khả dụng (kernel không có /proc/pressure)")
+            return
+        self.psi_cpu_hist.append(snap.get("psi_cpu_some_stall", 0.0))
+        self.psi_mem_hist.append(snap.get("psi_memory_some_stall", 0.0))
+        self.psi_io_hist.append(snap.get("psi_io_some_stall", 0.0))
+        self.psi_alert.set(self._psi_alert_text(snap))
+
+        def avg(res):
+            return (f"{res} some {snap.get(f'psi_{res}_some10', 0.0):.1f}/{snap.get(f'psi_{res}_some60', 0.0):.1f}"
+                    f" full {snap.get(f'psi_{res}_full10', 0.0):.1f}/{snap.get(f'psi_{res}_full60', 0.0):.1f}")
+        self.perf_summary.set(self.perf_summary.get() + "\nPSI avg10/avg60 %:  " +
+                              "    ".join(avg(r) for r in ("cpu", "memory", "io")))
+        top = max([10.0] + list(self.psi_cpu_hist) + list(self.psi_mem_hist) + list(self.psi_io_hist))
+        self._draw_line_chart(self.canvas_psi, list(self.psi_cpu_hist), 0, min(100.0, top), suffix="%",
+                              line_color="#0078d7",
+                              more=((list(self.psi_mem_hist), "#800080", "Memory"),
+                                    (list(self.psi_io_hist), "#ff8c00", "I/O")), label1="CPU")
+
+    def _psi_alert_text(self, snap: dict) -> str:
+        alerts = []
+        for res in ("cpu", "memory", "io"):
+            limit = float(self.cfg.get(f"psi_alert_{res}", 0) or 0)
+            value = snap.get(f"psi_{res}_some10")
+            if limit > 0 and value is not None and value >= limit:
+                alerts.append(f"{res} {value:.1f}% ≥ {limit:g}%")
+        return ("⚠ Pressure: " + ", ".join(alerts)) if alerts else ""
+
+    @traced("draw_chart", "chart")
     def _draw_line_chart(self, canvas: tk.Canvas, series, y_min, y_max, suffix="", dual=False,
-                         series2=None, label1="A", label2="B", line_color="black", line_color2="gray"):
+                         series2=None, label1="A", label2="B", line_color="black", line_color2="gray",
+                         more=()):
+        """`more`: extra solid series as (values, color, label) drawn on the same scale."""
         canvas.delete("all")
         w = max(1, int(canvas.winfo_width()))
         h = max(1, int(canvas.winfo_height()))
@@ -243,7 +441,7 @@ class OtherTabsMixin:
         if y_max is None:
             max_s1 = max(series) if series else 0.0
             max_s2 = max(series2) if (dual and series2) else 0.0
-            y_max = max(max_s1, max_s2, 1.0)
+            y_max = max([max_s1, max_s2, 1.0] + [max(s) for s, _c, _l in more if s])
 
         def to_xy(i, v, n):
             x = pad + i * (w - 2 * pad) / max(1, n - 1)
@@ -270,7 +468,20 @@ class OtherTabsMixin:
             if len(pts2) >= 4:
                 canvas.create_line(*pts2, smooth=True, width=2, dash=(4, 2), fill=line_color2)
 
+        for extra, color, _label in more:
+            m = min(n, len(extra))
+            pts3 = []
+            for i in range(m):
+                pts3.extend(to_xy(i, max(y_min, min(y_max, float(extra[i]))), m))
+            if len(pts3) >= 4:
+                canvas.create_line(*pts3, smooth=True, width=2, fill=color)
+
         canvas.create_text(pad + 2, pad + 2, anchor="nw", text=f"max {y_max:.1f}{suffix}", fill="#333333", font=("Arial", 9))
+        if more:
+            x = w - pad - 2
+            for values, color, label in reversed(((series, line_color, label1),) + tuple(more)):
+                item = canvas.create_text(x, pad + 2, anchor="ne", text=label, fill=color, font=("Arial", 9, "bold"))
+                x = canvas.bbox(item)[0] - 8
         if dual:
             canvas.create_text(w - pad - 2, pad + 2, anchor="ne", 
                                text=f"{label1}: solid, {label2}: dash", fill="#333333", font=("Arial", 9))
@@ -278,88 +489,187 @@ class OtherTabsMixin:
     # ------------------------------------------------------------
     # [P5][LOGIC] Users
     # ------------------------------------------------------------
+    def _set_users_mem_metric(self):
+        self.cfg["users_mem_metric"] = self.var_users_mem.get()
+        save_cfg(self.cfg)
+        self.refresh_users(force=True)
+
+    @traced("refresh_users", "tab")
     def refresh_users(self, force=False):
-        rows = self._collect_process_rows()
-        agg = defaultdict(lambda: {"cpu": 0.0, "mem": 0, "count": 0})
-        for r in rows:
-            u = r.user or "(unknown)"
-            agg[u]["cpu"] += float(r.cpu)
-            agg[u]["mem"] += int(r.mem_rss)
-            agg[u]["count"] += 1
+        rows = self._collect_process_rows(self._build_collect_plan(("user", "cpu", "mem")))
+        heading = "Memory"
+        mem_attr = "mem_rss"
+        if self.cfg.get("users_mem_metric", "rss") == "pss" and self.enricher is not None:
+            self._sample_smaps(rows)
+            for r in rows:
+                self.enricher.apply(r)
+            mem_attr = "pss"
+            have, total = self.enricher.last_sample
+            # process chưa lấy mẫu được (hết ngân sách / bị từ chối) tạm tính bằng RSS
+            heading = "Memory (PSS)" if have >= total else f"Memory (PSS, {have}/{total} sampled)"
+        self.users_tree.heading("mem", text=heading)
+        agg = self._aggregate_users(rows, mem_attr)
 
         for iid in self.users_tree.get_children(""):
             self.users_tree.delete(iid)
 
+        # tổng theo user luôn là % của cả máy (cộng % từng core thì vượt 100%)
+        to_machine = self.source.cpu.to_machine
         for user, d in sorted(agg.items(), key=lambda kv: kv[1]["cpu"], reverse=True):
             self.users_tree.insert("", "end", values=(
-                user, d["count"], f"{d['cpu']:.1f}", fmt_bytes(d["mem"])
+                user, d["count"], f"{to_machine(d['cpu']):.1f}", fmt_bytes(d["mem"])
             ))
 
+    @staticmethod
+    def _aggregate_users(rows, mem_attr: str = "mem_rss") -> dict:
+        agg = defaultdict(lambda: {"cpu": 0.0, "mem": 0, "count": 0})
+        for r in rows:
+            u = r.user or "(unknown)"
+            agg[u]["cpu"] += float(r.cpu)
+            agg[u]["mem"] += int(getattr(r, mem_attr) or r.mem_rss)
+            agg[u]["count"] += 1
+        return agg
+
     # ------------------------------------------------------------
     # [P5][LOGIC] Services
     # ------------------------------------------------------------
+    @traced("refresh_services", "tab")
     def refresh_services(self, force=False):
-        sys_cmd = shutil.which("systemctl")
-        if not sys_cmd:
-            for p in ["/bin/systemctl", "/usr/bin/systemctl", "/sbin/systemctl"]:
-                if os.path.exists(p):
-                    sys_cmd = p
-                    break
-        
+        """Start a background `systemctl list-units` unless the cached listing is still fresh.
+
+        Không bao giờ chặn UI: kết quả về qua `_services_loaded` và chỉ các dòng thay đổi
+        được sửa. Đang có một lần tải chạy thì không chạy chồng; force -> tải lại ngay sau đó.
+        """
+        task = self._services_task
+        # busy (không phải running): sau timeout thread cũ có thể vẫn đang chạy acct.sample
+        if task is not None and task.busy:
+            self._services_pending = self._services_pending or force
+            return
+        max_age = float(self.cfg.get("services_max_age_s", 5.0))
+        if not force and time.monotonic() - self._services_fetched_at < max_age:
+            return
+
+        sys_cmd = find_systemctl()
         if not sys_cmd:
             self.services_hint.set("Lỗi: Không tìm thấy systemctl.")
             self.services_tree.delete(*self.services_tree.get_children())
+            self._services_units = {}
             return
 
-        saved_selection = self.services_tree.selection()
-        saved_id = saved_selection[0] if saved_selection else None
-
-        try:
-            cmd = [sys_cmd, "list-units", "--type=service", "--all", "--no-legend", "--no-pager", "--plain"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            
-            if result.returncode != 0:
-                self.services_hint.set(f"Lỗi: {result.stderr.strip() or 'Systemd error'}")
-                return
-            out = result.stdout
-        except Exception as e:
-            self.services_hint.set(f"Lỗi Python: {str(e)}")
-            return
-
-        self.services_tree.delete(*self.services_tree.get_children())
-        
-        count = 0
-        lines = out.splitlines()
-        for line in lines:
-            line = line.strip()
-            if not line: continue
-            
-            parts = line.split()
-            if parts[0] in ['●', '*', '-']:
-                parts = parts[1:]
-            
-            if len(parts) < 4: continue
-
-            unit = parts[0]
-            load = parts[1]
-            active = parts[2]
-            sub = parts[3]
-            desc = " ".join(parts[4:]) if len(parts) > 4 else ""
-            
-            try:
-                self.services_tree.insert("", "end", iid=unit, values=(unit, load, active, sub, desc))
-                count += 1
-            except tk.TclError:
-                pass
-
-        if saved_id and self.services_tree.exists(saved_id):
-            self.services_tree.selection_set(saved_id)
-            self.services_tree.see(saved_id)
-
-        if count > 0:
-            self.services_hint.set(f"Đã tải {count} services từ {sys_cmd}. Click đúp để Restart.")
+        timeout_s = float(self.cfg.get("services_timeout_s", 5.0))
+        if self._unit_acct is None:
+            self._unit_acct = UnitAccounting(self.cfg.get("cgroup_root", CGROUP_ROOT))
+        acct = self._unit_acct
+        acct.cpu.mode = self.source.cpu.mode
+
+        def fetch():
+            units = list_units(sys_cmd, timeout_s)
+            # số liệu cgroup đọc cùng thread nền, delta = khoảng giữa hai lần tải
+            return units, acct.sample(units)
+
+        if not self._services_units:
+            self.services_hint.set(f"Đang tải danh sách services từ {sys_cmd}...")
+        self._services_task = run_async(
+            self, fetch,
+            lambda result, error: self._services_loaded(sys_cmd, result, error),
+            timeout_s=timeout_s + 1.0, name="services-list")
+
+    def _services_loaded(self, sys_cmd: str, result, error):
+        self._services_fetched_at = time.monotonic()
+        if error is not None:
+            if isinstance(error, (TimeoutError, subprocess.TimeoutExpired)):
+                self.services_hint.set(f"Lỗi: systemctl không trả lời sau {self.cfg.get('services_timeout_s', 5.0):g}s.")
+            elif isinstance(error, RuntimeError):
+                self.services_hint.set(f"Lỗi: {error}")
+            else:
+                self.services_hint.set(f"Lỗi Python: {error}")
+        else:
+            listing, self._services_stats = result
+            units = self._sort_service_units(
+                {u: self._service_values(vals, self._services_stats.get(u)) for u, vals in listing.items()})
+            added, changed, removed = self._apply_services(units)
+            if units:
+                self.services_hint.set(
+                    f"Đã tải {len(units)} services từ {sys_cmd} "
+                    f"(+{added} ~{changed} -{removed}). Click đúp để Restart.")
+            else:
+                self.services_hint.set("Không có service nào.")
+        if self._services_pending:
+            self._services_pending = False
+            self.refresh_services(force=True)
+
+    @traced("services_apply", "tab")
+    def _apply_services(self, units: dict) -> tuple[int, int, int]:
+        """Row-level diff onto services_tree (selection/scroll giữ nguyên vì dòng không bị xóa hết)."""
+        tree = self.services_tree
+        added, changed, removed = diff_units(self._services_units, units)
+        for unit in removed:
+            if tree.exists(unit):
+                tree.delete(unit)
+        for unit in changed:
+            tree.item(unit, values=units[unit])
+        if added:
+            # chèn theo vị trí trong thứ tự systemctl (dòng cũ đã đúng thứ tự tương đối)
+            new = set(added)
+            for i, unit in enumerate(units):
+                if unit in new:
+                    try:
+                        tree.insert("", i, iid=unit, values=units[unit])
+                    except tk.TclError:
+                        pass
+        self._services_units = units
+        self._order_services()
+        return len(added), len(changed), len(removed)
+
+    @staticmethod
+    def _service_values(vals: tuple, st) -> tuple:
+        """systemctl columns + cgroup columns (trống khi unit không có cgroup / cgroup v1)."""
+        unit, load, active, sub, desc = vals
+        st = st or {}
+
+        def num(k, fmt):
+            v = st.get(k)
+            return "" if v is None else fmt(v)
+
+        def psi(v):
+            return f"{v:.2f}"
+        return (unit, load, active, sub,
+                num("cpu", lambda v: f"{v:.1f}"), num("mem", fmt_bytes), num("peak", fmt_bytes),
+                num("io_r", lambda v: fmt_bytes(v) + "/s"), num("io_w", lambda v: fmt_bytes(v) + "/s"),
+                num("tasks", str), num("psi_cpu", psi), num("psi_memory", psi), num("psi_io", psi), desc)
+
+    def _sort_service_units(self, units: dict) -> dict:
+        col = self.services_sort_col
+        if col is None:
+            return units
+        idx = SERVICE_TEXT_COLS.get(col)
+        if idx is not None:
+            key = lambda u: units[u][idx].lower()
         else:
-            self.services_hint.set(f"Không có service nào.")
+            stats = self._services_stats
+            desc = self.services_sort_desc
+
+            def key(u):
+                # unit không có số liệu luôn xuống cuối, bất kể chiều sort
+                v = stats.get(u, {}).get(col)
+                return (v is not None) == desc, v or 0
+        return {u: units[u] for u in sorted(units, key=key, reverse=self.services_sort_desc)}
+
+    def _order_services(self):
+        tree = self.services_tree
+        order = list(self._services_units)
+        if list(tree.get_children("")) != order:
+            for i, unit in enumerate(order):
+                tree.move(unit, "", i)
+
+    def _sort_services(self, col: str):
+        if self.services_sort_col == col:
+            self.services_sort_desc = not self.services_sort_desc
+        else:
+            self.services_sort_col = col
+            self.services_sort_desc = col not in SERVICE_TEXT_COLS
+        self._services_units = self._sort_service_units(self._services_units)
+        self._order_services()
 
     def _selected_service(self):
         sel = self.services_tree.selection()
@@ -375,74 +685,50 @@ class OtherTabsMixin:
         if not messagebox.askyesno("Confirm", f"Bạn có chắc muốn {action.upper()} service: {unit}?"):
             return
         
-        sys_cmd = shutil.which("systemctl") or "systemctl"
-        cmd = [sys_cmd, action, unit]
+        sys_cmd = find_systemctl() or "systemctl"
+        self.services_hint.set(f"Đang {action} {unit}...")
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
-                messagebox.showerror("Lỗi", f"Lệnh thất bại:\n{result.stderr.strip()}")
-            else:
+        def done(_result, error):
+            if error is None:
                 self.services_hint.set(f"Đã gửi lệnh {action} tới {unit}...")
-        except Exception as e:
-            messagebox.showerror("Lỗi Code", str(e))
-        
-        self.services_tree.after(1000, lambda: self.refresh_services(force=True))
-        self.services_tree.after(3000, lambda: self.refresh_services(force=True))
+            elif isinstance(error, RuntimeError):
+                messagebox.showerror("Lỗi", f"Lệnh thất bại:\n{error}")
+            else:
+                messagebox.showerror("Lỗi Code", str(error) or type(error).__name__)
+            # làm mới ngay, rồi thêm một lần để thấy trạng thái sau activating/deactivating
+            self.refresh_services(force=True)
+            self.services_tree.after(2000, lambda: self.refresh_services(force=True))
+
+        run_async(self, lambda: unit_action(sys_cmd, action, unit), done, timeout_s=15.0,
+                  name=f"systemctl-{action}")
 
     # ------------------------------------------------------------
     # [P5][LOGIC] Startup
     # ------------------------------------------------------------
+    @traced("refresh_startup", "tab")
     def refresh_startup(self, force=False):
-        entries = []
-
-        def parse_desktop(path: Path):
-            data = {}
-            try:
-                text = path.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                return None
-            cur_section = None
-            for raw in text.splitlines():
-                line = raw.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if line.startswith("[") and line.endswith("]"):
-                    cur_section = line[1:-1].strip()
-                    continue
-                if "=" in line and cur_section == "Desktop Entry":
-                    k, v = line.split("=", 1)
-                    data[k.strip()] = v.strip()
-            if not data:
-                return None
-            return data
-
-        if USER_AUTOSTART_DIR.exists():
-            for p in USER_AUTOSTART_DIR.glob("*.desktop"):
-                d = parse_desktop(p)
-                if not d: continue
-                hidden = d.get("Hidden", "false").lower() == "true"
-                enabled = (not hidden)
-                name = d.get("Name", p.stem)
-                exe = d.get("Exec", "")
-                entries.append((name, "Yes" if enabled else "No", "User", exe, str(p)))
-
-        for ddir in SYS_AUTOSTART_DIRS:
-            if ddir.exists():
-                for p in ddir.glob("*.desktop"):
-                    d = parse_desktop(p)
-                    if not d: continue
-                    hidden = d.get("Hidden", "false").lower() == "true"
-                    enabled = (not hidden)
-                    name = d.get("Name", p.stem)
-                    exe = d.get("Exec", "")
-                    entries.append((name, "Yes" if enabled else "No", "System", exe, str(p)))
-
-        for iid in self.startup_tree.get_children(""):
-            self.startup_tree.delete(iid)
-
-        for i, row in enumerate(entries):
-            self.startup_tree.insert("", "end", iid=str(i), values=row)
+        scanner = self._startup_scanner
+        rows = scanner.scan(force=force)
+        if rows is self._startup_rows and not force:
+            return  # không file nào đổi: không đụng Treeview
+        # User trước System, trong mỗi scope theo tên (path là iid: duy nhất và ổn định)
+        order = sorted(rows, key=lambda p: (rows[p][2], rows[p][0].lower()))
+        tree = self.startup_tree
+        added, changed, removed = diff_units(self._startup_rows, rows)
+        for path in removed:
+            if tree.exists(path):
+                tree.delete(path)
+        for path in changed:
+            tree.item(path, values=rows[path])
+        for path in added:
+            tree.insert("", "end", iid=path, values=rows[path])
+        if list(tree.get_children("")) != order:
+            for i, path in enumerate(order):
+                tree.move(path, "", i)
+        self._startup_rows = rows
+        self.startup_hint.set(
+            f"{len(rows)} mục (+{len(added)} ~{len(changed)} -{len(removed)}, đọc {scanner.parsed} file, "
+            f"theo dõi bằng {scanner.mode}). Enable/Disable chỉ áp dụng cho user scope.")
 
     def _selected_startup_row(self):
         sel = self.startup_tree.selection()
@@ -472,6 +758,9 @@ class OtherTabsMixin:
         if not row:
             return
         scope = row[2]
+        if scope == "User unit":
+            self._toggle_user_unit(row)
+            return
         if scope != "User":
             messagebox.showinfo("Startup", "Chỉ bật/tắt được entry ở User scope.")
             return
@@ -511,4 +800,283 @@ class OtherTabsMixin:
             path.write_text("\n".join(out_lines) + "\n", encoding="utf-8")
             self.refresh_startup(force=True)
         except Exception as e:
-            messagebox.showerror("Startup", str(e))
\ No newline at end of file
+            messagebox.showerror("Startup", str(e))
+
+    def _toggle_user_unit(self, row):
+        """systemctl --user enable/disable cho unit của user (symlink trong *.target.wants)."""
+        if row[1] == "Masked":
+            messagebox.showinfo("Startup", "Unit đang bị mask (systemctl --user unmask trước).")
+            return
+        unit = str(row[0]).split(" (", 1)[0]
+        action = "disable" if row[1] == "Yes" else "enable"
+        sys_cmd = find_systemctl() or "systemctl"
+        self.startup_hint.set(f"Đang {action} {unit}...")
+
+        def done(_result, error):
+            if error is not None:
+                messagebox.showerror("Startup", str(error) or type(error).__name__)
+            self.refresh_startup(force=True)
+
+        run_async(self, lambda: unit_action(sys_cmd, action, unit, user=True), done, timeout_s=15.0,
+                  name=f"systemctl-user-{action}")
+    # -------------------------
+    # Tabs: Cgroups
+    # -------------------------
+    def _build_cgroups_tab(self, parent):
+        top = ttk.Frame(parent)
+        top.pack(fill="x", padx=10, pady=8)
+        ttk.Button(top, text="Refresh Now", command=lambda: self.refresh_cgroups(force=True)).pack(side="left")
+        ttk.Button(top, text="Show processes", command=self._cgroup_show_processes).pack(side="right", padx=4)
+
+        cols = ("procs", "cpu", "mem", "io_r", "io_w", "psi_cpu", "psi_memory", "psi_io", "throttled", "tasks")
+        self.cgroups_tree = ttk.Treeview(parent, columns=cols, show="tree headings", height=20)
+        self.cgroups_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.cgroups_tree.bind("<Double-1>", lambda e: self._cgroup_show_processes())
+
+        headings = {
+            "procs": "Processes", "cpu": "CPU %", "mem": "Memory", "io_r": "Disk read/s",
+            "io_w": "Disk write/s", "psi_cpu": "CPU pressure", "psi_memory": "Mem pressure",
+            "psi_io": "I/O pressure", "throttled": "Throttled ms/s", "tasks": "Tasks",
+        }
+        self.cgroups_tree.heading("#0", text="Cgroup")
+        self.cgroups_tree.column("#0", width=380, anchor="w")
+        for c in cols:
+            self.cgroups_tree.heading(c, text=headings[c])
+            self.cgroups_tree.column(c, width=100 if c != "procs" else 80, anchor="w")
+
+        ysb = ttk.Scrollbar(parent, orient="vertical", command=self.cgroups_tree.yview)
+        self.cgroups_tree.configure(yscrollcommand=ysb.set)
+        ysb.place(in_=self.cgroups_tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        self.cgroups_hint = tk.StringVar(
+            value="Pressure = PSI 'some' avg10 (%). Click đúp một cgroup để lọc tab Processes theo các process của nó."
+        )
+        ttk.Label(parent, textvariable=self.cgroups_hint, anchor="w").pack(fill="x", padx=10, pady=(0, 6))
+
+        self._cgroup_tree = None   # cgroupfs.CgroupTree (giữ cache thư mục + baseline delta)
+        self._cgroup_nodes = {}    # kết quả scan gần nhất (filter cgroup của tab Processes dùng lại)
+        self._cgroups_task = None
+        self._cgroups_shown = {}   # rel -> values đang hiện
+
+    # ------------------------------------------------------------
+    # [P5][LOGIC] Cgroups (quét nền, chỉ listdir thư mục đã đổi)
+    # ------------------------------------------------------------
+    @traced("refresh_cgroups", "tab")
+    def refresh_cgroups(self, force=False):
+        task = self._cgroups_task
+        if task is not None and task.busy:
+            return  # kể cả khi lần trước đã timeout: CgroupTree không thread-safe
+        if self._cgroup_tree is None:
+            self._cgroup_tree = CgroupTree(self.cfg.get("cgroup_root", CGROUP_ROOT),
+                                           full_rescan_s=float(self.cfg.get("cgroup_full_rescan_s", 30.0)))
+        tree = self._cgroup_tree
+        tree.cpu.mode = self.source.cpu.mode
+        self._cgroups_task = run_async(self, tree.scan, self._cgroups_loaded, timeout_s=10.0,
+                                       name="cgroups-scan")
+
+    def _cgroups_loaded(self, nodes, error):
+        if error is not None:
+            self.cgroups_hint.set(f"Lỗi đọc cgroup: {error}")
+            return
+        if not nodes:
+            self.cgroups_hint.set(f"Không thấy cgroup v2 tại {self._cgroup_tree.root}.")
+            return
+        self._cgroup_nodes = nodes
+        self._apply_cgroups(nodes)
+        self.cgroups_hint.set(f"{len(nodes)} cgroups ({self._cgroup_tree.listed} thư mục đọc lại). "
+                              "Click đúp để lọc tab Processes theo cgroup.")
+
+    @staticmethod
+    def _cgroup_iid(rel: str) -> str:
+        return rel or "/"
+
+    @traced("cgroups_apply", "tab")
+    def _apply_cgroups(self, nodes: dict):
+        tree = self.cgroups_tree
+        shown = self._cgroups_shown
+        iid = self._cgroup_iid
+
+        def num(v, fmt):
+            return "" if v is None else fmt(v)
+
+        for rel in [r for r in shown if r not in nodes]:
+            if tree.exists(iid(rel)):
+                tree.delete(iid(rel))  # xóa cả cây con
+            del shown[rel]
+        # cha trước con
+        for rel in sorted(nodes, key=lambda r: (r.count("/") if r else -1, r)):
+            n = nodes[rel]
+            values = (
+                n["procs_total"], num(n["cpu"], lambda v: f"{v:.1f}"), num(n["mem"], fmt_bytes),
+                num(n["io_r"], lambda v: fmt_bytes(v) + "/s"), num(n["io_w"], lambda v: fmt_bytes(v) + "/s"),
+                num(n["psi_cpu"], lambda v: f"{v:.2f}"), num(n["psi_memory"], lambda v: f"{v:.2f}"),
+                num(n["psi_io"], lambda v: f"{v:.2f}"), num(n["throttled"], lambda v: f"{v:.1f}"),
+                num(n["tasks"], str),
+            )
+            old = shown.get(rel)
+            if old is None:
+                parent = "" if n["parent"] is None else iid(n["parent"])
+                if parent and not tree.exists(parent):
+                    continue
+                tree.insert(parent, "end", iid=iid(rel), text=n["name"], values=values,
+                            open=rel.count("/") == 0)
+            elif old != values:
+                tree.item(iid(rel), values=values)
+            shown[rel] = values
+
+    def _cgroup_show_processes(self):
+        sel = self.cgroups_tree.selection()
+        if not sel:
+            return
+        rel = "" if sel[0] == "/" else sel[0]
+        root = self._cgroup_tree.root if self._cgroup_tree is not None else CGROUP_ROOT
+        self.nb.select(self.tab_processes)
+        self._set_cgroup_filter("/" + rel, os.path.join(root, rel) if rel else root)
+
+    # -------------------------
+    # Tabs: Connections
+    # -------------------------
+    def _build_connections_tab(self, parent):
+        top = ttk.Frame(parent)
+        top.pack(fill="x", padx=10, pady=8)
+        ttk.Button(top, text="Refresh Now", command=lambda: self.refresh_connections(force=True)).pack(side="left")
+
+        ttk.Label(top, text="Search:").pack(side="left", padx=(10, 2))
+        self.conn_filter = tk.StringVar(value="")
+        ent = ttk.Entry(top, textvariable=self.conn_filter, width=30)
+        ent.pack(side="left")
+        ent.bind("<Return>", lambda e: self._update_connections_view())
+
+        ttk.Label(top, text="State:").pack(side="left", padx=(10, 2))
+        self.conn_state = tk.StringVar(value="All")
+        combo = ttk.Combobox(top, textvariable=self.conn_state, state="readonly", width=14,
+                             values=("All", "ESTABLISHED", "LISTEN", "UNCONN", "TIME_WAIT", "CLOSE_WAIT",
+                                     "SYN_SENT", "SYN_RECV", "FIN_WAIT1", "FIN_WAIT2", "LAST_ACK"))
+        combo.pack(side="left")
+        combo.bind("<<ComboboxSelected>>", lambda e: self._update_connections_view())
+
+        ttk.Button(top, text="Properties", command=self._connection_properties).pack(side="right", padx=4)
+
+        cols = tuple(CONN_COLS)
+        self.conn_tree = ttk.Treeview(parent, columns=cols, show="headings", height=20)
+        self.conn_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.conn_tree.bind("<Double-1>", lambda e: self._connection_properties())
+
+        headings = {"proto": "Proto", "local": "Local address", "remote": "Remote address",
+                    "state": "State", "pid": "PID", "process": "Process"}
+        widths = {"proto": 60, "local": 260, "remote": 260, "state": 120, "pid": 80, "process": 200}
+        for c in cols:
+            self.conn_tree.heading(c, text=headings[c], command=lambda cc=c: self._sort_connections(cc))
+            self.conn_tree.column(c, width=widths[c], anchor="w")
+
+        ysb = ttk.Scrollbar(parent, orient="vertical", command=self.conn_tree.yview)
+        self.conn_tree.configure(yscrollcommand=ysb.set)
+        ysb.place(in_=self.conn_tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        self.conn_hint = tk.StringVar(value="Click đúp một dòng để mở Properties của process sở hữu socket.")
+        ttk.Label(parent, textvariable=self.conn_hint, anchor="w").pack(fill="x", padx=10, pady=(0, 6))
+
+        self._conn_table = None   # netconns.ConnectionTable (giữ index inode -> pid giữa các tick)
+        self._conn_rows = []      # snapshot gần nhất (chưa lọc)
+        self._conn_shown = {}     # key -> values đang hiện
+        self._conn_counts = {}
+        self._conn_task = None
+        self._conn_view_task = None
+        self.conn_sort_col = None  # None = thứ tự trong /proc/net
+        self.conn_sort_desc = False
+
+    # ------------------------------------------------------------
+    # [P5][LOGIC] Connections (parse /proc/net + index inode -> pid, chạy nền)
+    # ------------------------------------------------------------
+    def _conn_view_args(self) -> tuple:
+        state = self.conn_state.get()
+        return (self.conn_filter.get(), "" if state == "All" else state, self.conn_sort_col,
+                self.conn_sort_desc, int(self.cfg.get("conn_max_rows", 5000)))
+
+    @traced("refresh_connections", "tab")
+    def refresh_connections(self, force=False):
+        task = self._conn_task
+        if task is not None and task.busy:
+            return  # kể cả khi lần trước đã timeout: SocketIndex không thread-safe
+        if self._conn_table is None:
+            self._conn_table = ConnectionTable(getattr(self.source, "root", PROC_ROOT),
+                                               float(self.cfg.get("conn_scan_budget_ms", 50)))
+        table = self._conn_table
+        args = self._conn_view_args()
+
+        def fetch():
+            rows = table.snapshot()
+            return rows, connection_view(rows, *args)
+
+        if not self._conn_rows:
+            self.conn_hint.set("Đang đọc /proc/net và fd của các process...")
+        self._conn_task = run_async(self, fetch, self._connections_loaded, timeout_s=30.0,
+                                    name="connections-scan")
+
+    def _connections_loaded(self, result, error):
+        if error is not None:
+            self.conn_hint.set(f"Lỗi đọc connections: {error}")
+            return
+        self._conn_rows, view = result
+        self._apply_connections(*view)
+
+    def _update_connections_view(self):
+        """Re-filter/sort the cached snapshot (không quét lại /proc) in the background."""
+        task = self._conn_view_task
+        if task is not None and task.running:
+            task.cancel()
+        rows = self._conn_rows
+        args = self._conn_view_args()
+
+        def done(view, error):
+            self._conn_view_task = None
+            if error is None:
+                self._apply_connections(*view)
+        self._conn_view_task = run_async(self, lambda: connection_view(rows, *args), done,
+                                         name="connections-view")
+
+    @traced("connections_apply", "tab")
+    def _apply_connections(self, view: dict, counts: dict):
+        tree = self.conn_tree
+        added, changed, removed = diff_units(self._conn_shown, view)
+        for key in removed:
+            if tree.exists(key):
+                tree.delete(key)
+        for key in changed:
+            tree.item(key, values=view[key])
+        for key in added:
+            tree.insert("", "end", iid=key, values=view[key])
+        self._conn_shown = view
+        order = list(view)
+        if list(tree.get_children("")) != order:
+            for i, key in enumerate(order):
+                tree.move(key, "", i)
+
+        self._conn_counts = counts
+        total = sum(counts.values())
+        top_states = ", ".join(f"{st} {n}" for st, n in sorted(counts.items(), key=lambda kv: -kv[1])[:5])
+        limit = int(self.cfg.get("conn_max_rows", 5000))
+        shown = f"hiện {len(view)}" + (f" (tối đa conn_max_rows={limit})" if limit and len(view) >= limit else "")
+        index = self._conn_table.index if self._conn_table is not None else None
+        pending = f", {index.unresolved} chưa rõ process" if index is not None and index.unresolved else ""
+        self.conn_hint.set(f"{total} sockets ({top_states}); {shown}{pending}. "
+                           "Click đúp để mở Properties của process.")
+
+    def _sort_connections(self, col: str):
+        if self.conn_sort_col == col:
+            self.conn_sort_desc = not self.conn_sort_desc
+        else:
+            self.conn_sort_col = col
+            self.conn_sort_desc = False
+        self._update_connections_view()
+
+    def _connection_properties(self):
+        sel = self.conn_tree.selection()
+        if not sel:
+            return
+        pid = self._conn_shown.get(sel[0], ("",) * 5)[4]
+        if pid == "":
+            messagebox.showinfo("Connections", "Chưa biết process sở hữu socket này "
+                                               "(TIME_WAIT, process của user khác hoặc chưa quét tới).")
+            return
+        self._show_proc_properties(int(pid))
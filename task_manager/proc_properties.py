@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""Live Properties window for one process
+
+Mở ngay với các field rẻ (process_info(expensive=False)); các phần đắt (open files,
+connections) được nạp trong thread nền, mỗi phần có timeout riêng. Khi cửa sổ còn mở,
+các field hay đổi (status, CPU, RAM, threads, FDs...) tự refresh theo nhịp riêng, kèm
+biểu đồ CPU/RSS nhỏ của chính PID đó; lần refresh chỉ đọc các field đó (VOLATILE_INFO)
+và cũng chạy nền (đếm FDs là một listdir, có thể rất lớn).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+
+import tkinter as tk
+from tkinter import ttk
+
+import psutil
+
+from .backends import VOLATILE_INFO
+from .bgtask import run_async
+from .config import HISTORY_LEN
+
+# field cập nhật mỗi lần refresh (label trong bảng General)
+VOLATILE_FIELDS = ("Status", "Nice", "CPU %", "Memory (RSS)", "Threads", "FDs")
+
+
+def _open_files(pid: int) -> list:
+    return [(str(f.fd), f.path) for f in psutil.Process(pid).open_files()]
+
+
+def _connections(pid: int) -> list:
+    p = psutil.Process(pid)
+    conns = p.net_connections(kind="inet") if hasattr(p, "net_connections") else p.connections(kind="inet")
+
+    def addr(a):
+        return f"{a.ip}:{a.port}" if a else ""
+    return [(addr(c.laddr), addr(c.raddr), c.status) for c in conns]
+
+
+# section -> (tiêu đề tab, cột, hàm đọc chạy trong thread nền)
+SECTIONS = {
+    "open_files": ("Open files", (("fd", "FD", 60), ("path", "Path", 620)), _open_files),
+    "connections": ("Connections", (("laddr", "Local", 220), ("raddr", "Remote", 220),
+                                    ("status", "Status", 140)), _connections),
+}
+
+
+class ProcPropertiesWindow:
+    def __init__(self, app, pid: int, info: dict):
+        self.app = app
+        self.pid = pid
+        self.create_time = info.get("create_time")
+        self.refresh_ms = max(250, int(app.cfg.get("props_refresh_ms", 1000)))
+        self.timeout_s = float(app.cfg.get("props_section_timeout_s", 5.0))
+        self.cpu_hist = deque(maxlen=HISTORY_LEN)
+        self.rss_hist = deque(maxlen=HISTORY_LEN)
+        self._last_cpu = None  # (cpu_seconds, monotonic) cho delta riêng của cửa sổ
+        self._job = None
+        self._refresh_task = None
+        self._tasks = []
+        self._items = {}  # label -> iid trong bảng General
+        self.alive = True
+
+        self.win = win = tk.Toplevel(app)
+        win.title(f"Properties - PID {pid}")
+        win.geometry("780x560")
+        win.transient(app)
+        win.protocol("WM_DELETE_WINDOW", self.close)
+
+        nb = ttk.Notebook(win)
+        nb.pack(fill="both", expand=True, padx=12, pady=12)
+
+        # --- General
+        frm = ttk.Frame(nb)
+        nb.add(frm, text="General")
+        self.tree = tree = ttk.Treeview(frm, columns=("k", "v"), show="headings")
+        tree.heading("k", text="Field")
+        tree.heading("v", text="Value")
+        tree.column("k", width=180, anchor="w")
+        tree.column("v", width=540, anchor="w")
+        tree.pack(fill="both", expand=True)
+
+        # --- Performance (mini charts)
+        perf = ttk.Frame(nb)
+        nb.add(perf, text="Performance")
+        ttk.Label(perf, text="CPU %").pack(anchor="w", padx=4, pady=(8, 0))
+        self.canvas_cpu = tk.Canvas(perf, height=150, bg="#f0f0f0", highlightthickness=1,
+                                    highlightbackground="#cccccc")
+        self.canvas_cpu.pack(fill="x", padx=4)
+        ttk.Label(perf, text="Memory (RSS)").pack(anchor="w", padx=4, pady=(8, 0))
+        self.canvas_rss = tk.Canvas(perf, height=150, bg="#f0f0f0", highlightthickness=1,
+                                    highlightbackground="#cccccc")
+        self.canvas_rss.pack(fill="x", padx=4)
+
+        # --- Expensive sections (nạp nền)
+        self.section_trees = {}
+        self.section_tabs = {}
+        for key, (title, cols, _fn) in SECTIONS.items():
+            f = ttk.Frame(nb)
+            nb.add(f, text=f"{title} (loading...)")
+            t = ttk.Treeview(f, columns=[c[0] for c in cols], show="headings")
+            for cid, heading, width in cols:
+                t.heading(cid, text=heading)
+                t.column(cid, width=width, anchor="w")
+            t.pack(fill="both", expand=True)
+            self.section_trees[key] = t
+            self.section_tabs[key] = f
+        self.nb = nb
+
+        btns = ttk.Frame(win)
+        btns.pack(fill="x", padx=12, pady=(0, 12))
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(btns, textvariable=self.status_var, foreground="#555555").pack(side="left")
+        ttk.Button(btns, text="Close", command=self.close).pack(side="right")
+        ttk.Button(btns, text="Copy selected", command=lambda: app._copy_tree_selection(self.tree)).pack(side="right", padx=8)
+        ttk.Button(btns, text="Memory map...", command=lambda: app._show_memory_map(pid)).pack(side="right")
+        ttk.Button(btns, text="Threads...", command=lambda: app._show_threads(pid)).pack(side="right", padx=8)
+
+        self._show_info(info)
+        self._load_sections()
+        self._job = win.after(self.refresh_ms, self._refresh)
+
+    # ------------------------------------------------------------
+    # General table
+    # ------------------------------------------------------------
+    def _show_info(self, info: dict, only=None):
+        rows = self.app._format_proc_info(info)
+        # số lượng open files / connections do phần nạp nền điền
+        rows.pop("Open files (count)", None)
+        rows.pop("Connections (count)", None)
+        for label, value in rows.items():
+            if only is not None and label not in only:
+                continue
+            iid = self._items.get(label)
+            if iid is None:
+                self._items[label] = self.tree.insert("", "end", values=(label, value))
+            else:
+                self.tree.item(iid, values=(label, value))
+
+    def _set_field(self, label: str, value: str):
+        iid = self._items.get(label)
+        if iid is None:
+            self._items[label] = self.tree.insert("", "end", values=(label, value))
+        else:
+            self.tree.item(iid, values=(label, value))
+
+    # ------------------------------------------------------------
+    # Expensive sections: thread nền + timeout
+    # ------------------------------------------------------------
+    def _load_sections(self):
+        if getattr(self.app.source, "name", "") == "recorded":
+            for key, (title, _cols, _fn) in SECTIONS.items():
+                self.nb.tab(self.section_tabs[key], text=f"{title} (n/a)")
+            return
+        for key, (_title, _cols, fn) in SECTIONS.items():
+            t0 = time.monotonic()
+            self._tasks.append(run_async(
+                self.win, lambda fn=fn: fn(self.pid),
+                lambda result, error, key=key, t0=t0: self._section_done(key, result, error, t0),
+                timeout_s=self.timeout_s, name=f"props-{key}"))
+
+    def _section_done(self, key: str, result, error, t0: float):
+        if not self.alive:
+            return
+        title = SECTIONS[key][0]
+        tab = self.section_tabs[key]
+        tree = self.section_trees[key]
+        if error is not None:
+            if isinstance(error, TimeoutError):
+                msg = f"timed out after {self.timeout_s:g}s"
+            elif isinstance(error, psutil.AccessDenied):
+                msg = "access denied"
+            elif isinstance(error, psutil.NoSuchProcess):
+                msg = "process exited"
+            else:
+                msg = str(error) or type(error).__name__
+            self.nb.tab(tab, text=f"{title} (!)")
+            tree.insert("", "end", values=(f"({msg})",))
+            self._set_field(f"{title} (count)", f"({msg})")
+            return
+        for vals in result:
+            tree.insert("", "end", values=vals)
+        self.nb.tab(tab, text=f"{title} ({len(result)})")
+        self._set_field(f"{title} (count)", f"{len(result)}  (loaded in {time.monotonic() - t0:.2f}s)")
+
+    # ------------------------------------------------------------
+    # Auto refresh (field hay đổi + mini charts)
+    # ------------------------------------------------------------
+    def _refresh(self):
+        self._job = None
+        if not self.alive:
+            return
+        source = self.app.source
+
+        def read():
+            return source.process_info(self.pid, expensive=False, only=VOLATILE_INFO), time.monotonic()
+
+        self._refresh_task = run_async(self.win, read, self._refreshed, timeout_s=self.timeout_s,
+                                       name="props-refresh")
+
+    def _refreshed(self, result, error):
+        self._refresh_task = None
+        if not self.alive:
+            return
+        if isinstance(error, psutil.NoSuchProcess):
+            info = None
+        elif error is not None:
+            # timeout / lỗi tạm thời: giữ nguyên số liệu cũ, thử lại ở lần refresh sau
+            msg = f"timed out after {self.timeout_s:g}s" if isinstance(error, TimeoutError) else error
+            self.status_var.set(f"Refresh failed ({msg}) at {time.strftime('%H:%M:%S')}, retrying")
+            self._job = self.win.after(self.refresh_ms, self._refresh)
+            return
+        else:
+            info, now = result
+        if info is None or (self.create_time and info.get("create_time") not in (None, self.create_time)):
+            # process đã thoát (hoặc PID bị tái sử dụng) -> giữ snapshot cuối, dừng refresh
+            self._set_field("Status", "Exited")
+            self.status_var.set(f"Process exited at {time.strftime('%H:%M:%S')}")
+            return
+
+        cpu = info.get("cpu")
+        secs = info.get("cpu_seconds")
+        if secs is not None and self._last_cpu is not None and now > self._last_cpu[1]:
+            rate = (secs - self._last_cpu[0]) / (now - self._last_cpu[1])
+            info["cpu"] = cpu = self.app.source.cpu.percent(rate)
+        if secs is not None:
+            self._last_cpu = (secs, now)
+
+        self._show_info(info, only=VOLATILE_FIELDS)
+        if cpu is not None:
+            self.cpu_hist.append(cpu)
+        if info.get("rss") is not None:
+            self.rss_hist.append(info["rss"] / (1024 * 1024))
+        self._draw_charts()
+        self.status_var.set(f"Auto refresh every {self.refresh_ms / 1000:g}s - updated {time.strftime('%H:%M:%S')}")
+        self._job = self.win.after(self.refresh_ms, self._refresh)
+
+    def _draw_charts(self):
+        cpu = list(self.cpu_hist)
+        top = 100.0 if not cpu or max(cpu) <= 100.0 else None
+        self.app._draw_line_chart(self.canvas_cpu, cpu, 0, top, suffix="%", line_color="#0078d7")
+        self.app._draw_line_chart(self.canvas_rss, list(self.rss_hist), 0, None, suffix=" MB",
+                                  line_color="#800080")
+
+    def close(self):
+        self.alive = False
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        if self._job is not None:
+            try:
+                self.win.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        self.win.destroy()
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""Direct /proc readers (không qua psutil)
+
+Các hàm nhận `root` (mặc định "/proc") để benchmark có thể trỏ vào cây procfs giả.
+"""
+
+from __future__ import annotations
+
+import os
+import pwd
+from collections import Counter
+
+PROC_ROOT = "/proc"
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# /proc/<pid>/stat state letter -> psutil status string (để dùng chung PROC_STATUS_LABEL)
+STATE_MAP = {
+    "R": "running", "S": "sleeping", "D": "disk-sleep", "T": "stopped", "t": "tracing-stop",
+    "Z": "zombie", "X": "dead", "x": "dead", "K": "wake-kill", "W": "waking", "P": "parked",
+    "I": "idle",
+}
+
+# index các field sau dấu ')' trong /proc/<pid>/stat (field 3 "state" = index 0)
+STAT_STATE = 0
+STAT_PPID = 1
+STAT_UTIME = 11
+STAT_STIME = 12
+STAT_NICE = 16
+STAT_THREADS = 17
+STAT_STARTTIME = 19
+STAT_RSS = 21
+STAT_PROCESSOR = 36  # CPU chạy lần cuối
+
+_user_cache = {}
+
+
+def username(uid: int) -> str:
+    name = _user_cache.get(uid)
+    if name is None:
+        try:
+            name = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            name = str(uid)
+        _user_cache[uid] = name
+    return name
+
+
+def list_pids(root: str = PROC_ROOT) -> list[int]:
+    return [int(x) for x in os.listdir(root) if x.isdigit()]
+
+
+def boot_time(root: str = PROC_ROOT) -> float:
+    with open(f"{root}/stat", "rb") as f:
+        for line in f:
+            if line.startswith(b"btime"):
+                return float(line.split()[1])
+    return 0.0
+
+
+def parse_stat(data: bytes) -> tuple[str, list[bytes]]:
+    """Split /proc/<pid>/stat into (comm, fields after ')').
+
+    comm có thể chứa dấu cách và dấu ngoặc, nên phải tìm ')' cuối cùng.
+    """
+    lp = data.index(b"(")
+    rp = data.rindex(b")")
+    comm = data[lp + 1:rp].decode("utf-8", "replace")
+    return comm, data[rp + 2:].split()
+
+
+def read_stat(pid: int, root: str = PROC_ROOT) -> tuple[str, list[bytes]]:
+    with open(f"{root}/{pid}/stat", "rb") as f:
+        return parse_stat(f.read())
+
+
+def read_cmdline(pid: int, root: str = PROC_ROOT) -> str:
+    with open(f"{root}/{pid}/cmdline", "rb") as f:
+        data = f.read()
+    if not data:
+        return ""
+    return data.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+
+
+def count_fds(pid: int, root: str = PROC_ROOT) -> int:
+    return len(os.listdir(f"{root}/{pid}/fd"))
+
+
+def owner_uid(pid: int, root: str = PROC_ROOT) -> int:
+    return os.stat(f"{root}/{pid}").st_uid
+
+
+def read_cpu_times(root: str = PROC_ROOT) -> list[int]:
+    """Aggregate `cpu` line of /proc/stat as a list of jiffies."""
+    with open(f"{root}/stat", "rb") as f:
+        line = f.readline()
+    return [int(x) for x in line.split()[1:]]
+
+
+def read_meminfo(root: str = PROC_ROOT) -> dict:
+    """/proc/meminfo -> {key: bytes}."""
+    out = {}
+    with open(f"{root}/meminfo", "rb") as f:
+        for line in f:
+            k, _, rest = line.partition(b":")
+            parts = rest.split()
+            if parts:
+                out[k.decode()] = int(parts[0]) * (1024 if len(parts) > 1 else 1)
+    return out
+
+
+# cột của /proc/net/dev sau "iface:" (8 cột receive rồi 8 cột transmit)
+NET_DEV_FIELDS = (
+    "rx_bytes", "rx_packets", "rx_errs", "rx_drop", "rx_fifo", "rx_frame", "rx_compressed", "rx_multicast",
+    "tx_bytes", "tx_packets", "tx_errs", "tx_drop", "tx_fifo", "tx_colls", "tx_carrier", "tx_compressed",
+)
+
+
+def parse_net_dev(data: bytes) -> dict:
+    """/proc/net/dev -> {iface: [16 counters theo NET_DEV_FIELDS]} (2 dòng đầu là header)."""
+    out = {}
+    for line in data.splitlines()[2:]:
+        name, _, rest = line.partition(b":")
+        fields = rest.split()
+        if len(fields) >= 16:
+            out[name.strip().decode()] = [int(x) for x in fields[:16]]
+    return out
+
+
+def read_net_dev(root: str = PROC_ROOT) -> dict:
+    try:
+        with open(f"{root}/net/dev", "rb") as f:
+            return parse_net_dev(f.read())
+    except OSError:
+        return {}
+
+
+def read_net_totals(root: str = PROC_ROOT) -> tuple[int, int]:
+    """Sum of (bytes_sent, bytes_recv) over all interfaces in /proc/net/dev."""
+    sent = recv = 0
+    for counters in read_net_dev(root).values():
+        recv += counters[0]
+        sent += counters[8]
+    return sent, recv
+
+
+PSI_RESOURCES = ("cpu", "memory", "io")
+
+
+def parse_pressure(data: bytes) -> dict:
+    """PSI file (/proc/pressure/*, <cgroup>/*.pressure) -> {"some"|"full": (avg10, avg60, avg300, total_us)}."""
+    out = {}
+    for line in data.splitlines():
+        parts = line.split()
+        if len(parts) < 5:
+            continue
+        vals = dict(kv.split(b"=", 1) for kv in parts[1:])
+        try:
+            out[parts[0].decode()] = (float(vals[b"avg10"]), float(vals[b"avg60"]), float(vals[b"avg300"]),
+                                      int(vals[b"total"]))
+        except (KeyError, ValueError):
+            pass
+    return out
+
+
+def read_pressure(resource: str, root: str = PROC_ROOT) -> dict:
+    """/proc/pressure/<resource> (kernel >= 4.20 với CONFIG_PSI); OSError nếu không có."""
+    with open(f"{root}/pressure/{resource}", "rb") as f:
+        return parse_pressure(f.read())
+
+
+def read_exe(pid: int, root: str = PROC_ROOT) -> str:
+    return os.readlink(f"{root}/{pid}/exe")
+
+
+def read_cgroup(pid: int, root: str = PROC_ROOT) -> str:
+    """cgroup path of the process (v2 unified "0::" line, else the first hierarchy)."""
+    with open(f"{root}/{pid}/cgroup", "rb") as f:
+        lines = f.read().decode("utf-8", "replace").splitlines()
+    for line in lines:
+        if line.startswith("0::"):
+            return line[3:]
+    return lines[0].split(":", 2)[-1] if lines else ""
+
+
+def read_io(pid: int, root: str = PROC_ROOT) -> tuple[int, int]:
+    """(read_bytes, write_bytes) from /proc/<pid>/io (cần quyền với process của user khác)."""
+    rd = wr = 0
+    with open(f"{root}/{pid}/io", "rb") as f:
+        for line in f:
+            if line.startswith(b"read_bytes:"):
+                rd = int(line.split()[1])
+            elif line.startswith(b"write_bytes:"):
+                wr = int(line.split()[1])
+    return rd, wr
+
+
+def read_ctx_switches(pid: int, root: str = PROC_ROOT) -> tuple[int, int]:
+    """(voluntary, involuntary) context switches from /proc/<pid>/status."""
+    with open(f"{root}/{pid}/status", "rb") as f:
+        return _parse_ctx_switches(f.read())
+
+
+def _parse_ctx_switches(data) -> tuple[int, int]:
+    vol = invol = 0
+    # "\nvoluntary..." để không khớp nhầm vào "nonvoluntary..."
+    i = data.find(b"\nvoluntary_ctxt_switches:")
+    if i >= 0:
+        vol = int(data[i + 26:data.find(b"\n", i + 26)])
+    i = data.find(b"\nnonvoluntary_ctxt_switches:")
+    if i >= 0:
+        end = data.find(b"\n", i + 29)
+        invol = int(data[i + 29:end if end >= 0 else len(data)])
+    return vol, invol
+
+
+def read_schedstat(pid: int, root: str = PROC_ROOT) -> tuple[int, int, int]:
+    """(run_ns, runqueue_wait_ns, timeslices) from /proc/<pid>/schedstat (cần CONFIG_SCHED_INFO)."""
+    with open(f"{root}/{pid}/schedstat", "rb") as f:
+        run, wait, slices = f.read().split()[:3]
+    return int(run), int(wait), int(slices)
+
+
+def read_smaps_rollup(pid: int, root: str = PROC_ROOT) -> tuple[int, int, int]:
+    """(pss, uss, swap) in bytes from /proc/<pid>/smaps_rollup.
+
+    USS = Private_Clean + Private_Dirty. Kernel cũ (< 4.14) không có smaps_rollup -> cộng dồn smaps.
+    """
+    try:
+        f = open(f"{root}/{pid}/smaps_rollup", "rb")
+    except FileNotFoundError:
+        if not os.path.exists(f"{root}/{pid}"):
+            raise
+        f = open(f"{root}/{pid}/smaps", "rb")
+    pss = uss = swap = 0
+    with f:
+        for line in f:
+            c = line[:1]
+            if c not in (b"P", b"S"):
+                continue
+            if line.startswith(b"Pss:"):
+                pss += int(line.split()[1])
+            elif line.startswith((b"Private_Clean:", b"Private_Dirty:")):
+                uss += int(line.split()[1])
+            elif line.startswith(b"Swap:"):
+                swap += int(line.split()[1])
+    return pss * 1024, uss * 1024, swap * 1024
+
+
+class ProcReader:
+    """Hot-path reader: files are opened relative to one held `/proc` dir fd and read into a
+    reused bytearray, so the per-process loop does no path joining, no file objects and no
+    buffer allocation. Chỉ phần field thực sự cần mới được tách ra thành bytes.
+    """
+
+    def __init__(self, root: str = PROC_ROOT, bufsize: int = 4096):
+        self.root = root
+        self.dirfd = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+        self.buf = bytearray(bufsize)
+        self.view = memoryview(self.buf)
+
+    def close(self) -> None:
+        if self.dirfd >= 0:
+            self.view.release()
+            os.close(self.dirfd)
+            self.dirfd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, relpath: str) -> int:
+        """Read `<root>/<relpath>` into self.buf; returns the byte count (buffer grows if full)."""
+        fd = os.open(relpath, os.O_RDONLY, dir_fd=self.dirfd)
+        try:
+            n = os.readv(fd, [self.buf])
+            while n == len(self.buf):
+                # file dài hơn buffer (vd: cmdline rất dài) -> gấp đôi rồi đọc lại từ đầu
+                self.view.release()
+                self.buf = bytearray(len(self.buf) * 2)
+                self.view = memoryview(self.buf)
+                os.lseek(fd, 0, os.SEEK_SET)
+                n = os.readv(fd, [self.buf])
+        finally:
+            os.close(fd)
+        return n
+
+    def stat(self, pid: int, nfields: int = STAT_RSS + 1) -> tuple[str, list[bytes]]:
+        """Like read_stat(), but only the first `nfields` fields after ')' are split out."""
+        return self._stat(f"{pid}/stat", nfields)
+
+    def task_stat(self, pid: int, tid: int, nfields: int = STAT_PROCESSOR + 1) -> tuple[str, list[bytes]]:
+        """/proc/<pid>/task/<tid>/stat (cùng định dạng với stat của process)."""
+        return self._stat(f"{pid}/task/{tid}/stat", nfields)
+
+    def _stat(self, relpath: str, nfields: int) -> tuple[str, list[bytes]]:
+        n = self.read(relpath)
+        buf = self.buf
+        lp = buf.find(b"(", 0, n)
+        rp = buf.rfind(b")", 0, n)  # comm có thể chứa ' ' và ')' -> lấy ')' cuối cùng
+        if lp < 0 or rp < lp:
+            raise ValueError(f"malformed {relpath}")
+        view = self.view
+        comm = str(view[lp + 1:rp], "utf-8", "replace")
+        return comm, view[rp + 2:n].tobytes().split(None, nfields)[:nfields]
+
+    def statm(self, pid: int) -> tuple[int, int, int]:
+        """(size, resident, shared) in pages from /proc/<pid>/statm."""
+        n = self.read(f"{pid}/statm")
+        size, resident, shared = self.view[:n].tobytes().split(None, 3)[:3]
+        return int(size), int(resident), int(shared)
+
+    def cmdline(self, pid: int) -> str:
+        n = self.read(f"{pid}/cmdline")
+        if not n:
+            return ""
+        return self.view[:n].tobytes().rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+
+    def owner_uid(self, pid: int) -> int:
+        return os.stat(str(pid), dir_fd=self.dirfd).st_uid
+
+    def ctx_switches(self, pid: int) -> tuple[int, int]:
+        n = self.read(f"{pid}/status")
+        return _parse_ctx_switches(self.view[:n].tobytes())
+
+    def schedstat(self, pid: int) -> tuple[int, int, int]:
+        n = self.read(f"{pid}/schedstat")
+        run, wait, slices = self.view[:n].tobytes().split(None, 3)[:3]
+        return int(run), int(wait), int(slices)
+
+    def task_ids(self, pid: int) -> list[int]:
+        fd = os.open(f"{pid}/task", os.O_RDONLY | os.O_DIRECTORY, dir_fd=self.dirfd)
+        try:
+            return [int(x) for x in os.listdir(fd) if x.isdigit()]
+        finally:
+            os.close(fd)
+
+    def wchan(self, pid: int, tid: int) -> str:
+        """Kernel function the thread sleeps in ("" when running or hidden: kernel trả về "0")."""
+        n = self.read(f"{pid}/task/{tid}/wchan")
+        name = self.view[:n].tobytes().decode("ascii", "replace").strip()
+        return "" if name == "0" else name
+
+
+def scan_pids(root: str, pids, need_cmd: bool, need_fds: bool, need_uid: bool, btime: float,
+              euid: int = -1, disabled_foreign=frozenset(), denied=None, need_sched: bool = False):
+    """Scan a list of PIDs -> (records, newly_denied, skipped).
+
+    Hàm thuần (chỉ nhận/trả kiểu cơ bản) để chạy được cả trong worker của process pool.
+      record = (pid, comm, uid, start_time, jiffies, state, nice, threads, rss_pages, cmdline, fds, sched)
+      sched = (voluntary ctx, involuntary ctx, runqueue wait ns | None) hoặc None nếu không cần
+      newly_denied = [(pid, start_time, field)], skipped = Counter(field)
+      denied = {pid: (start_time, fields)} các field đã biết là bị từ chối
+    """
+    denied = denied or {}
+    records = []
+    newly = []
+    skipped = Counter()
+    skip_stat = "stat" in disabled_foreign
+    fds_off = "fds" in disabled_foreign
+    want_uid = need_uid or bool(disabled_foreign)
+    with ProcReader(root) as reader:
+        for pid in pids:
+            try:
+                uid = reader.owner_uid(pid) if want_uid else -1
+                foreign = uid != euid
+                if skip_stat and foreign:
+                    # hidepid=1: stat của process user khác không đọc được -> không thử
+                    skipped["stat"] += 1
+                    continue
+                comm, f = reader.stat(pid)
+                start_time = btime + int(f[STAT_STARTTIME]) / CLK_TCK
+                known = denied.get(pid)
+                known = known[1] if known is not None and known[0] == start_time else ()
+
+                cmdline = ""
+                if need_cmd:
+                    if "cmd" in known:
+                        skipped["cmd"] += 1
+                    else:
+                        try:
+                            cmdline = reader.cmdline(pid)
+                        except PermissionError:
+                            newly.append((pid, start_time, "cmd"))
+
+                fds = 0
+                if need_fds:
+                    if "fds" in known or (fds_off and foreign):
+                        skipped["fds"] += 1
+                    else:
+                        try:
+                            fds = count_fds(pid, root)  # listdir(path) nhanh hơn open+listdir(fd)
+                        except PermissionError:
+                            newly.append((pid, start_time, "fds"))
+
+                sched = None
+                if need_sched:
+                    try:
+                        vol, invol = reader.ctx_switches(pid)
+                    except PermissionError:
+                        vol = invol = 0
+                    try:
+                        wait = reader.schedstat(pid)[1]
+                    except (FileNotFoundError, PermissionError):
+                        wait = None  # kernel không bật schedstats
+                    sched = (vol, invol, wait)
+
+                records.append((pid, comm, uid, start_time, int(f[STAT_UTIME]) + int(f[STAT_STIME]),
+                                f[STAT_STATE].decode(), int(f[STAT_NICE]), int(f[STAT_THREADS]),
+                                int(f[STAT_RSS]), cmdline, fds, sched))
+            except (FileNotFoundError, ProcessLookupError):
+                continue  # process đã chết giữa chừng
+            except (OSError, ValueError, IndexError):
+                continue
+    return records, newly, skipped
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""systemd unit listing for the Services tab (chạy trong thread nền, không đụng Tk)
+
+`list_units()` gọi `systemctl list-units` và trả về {unit: (unit, load, active, sub, description)}
+theo đúng thứ tự systemctl in ra. `diff_units()` so hai lần liệt kê để tab chỉ sửa
+những dòng thay đổi thay vì xóa/chèn lại cả bảng.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+
+from .tracing import span
+
+SYSTEMCTL_FALLBACKS = ("/bin/systemctl", "/usr/bin/systemctl", "/sbin/systemctl")
+
+
+def find_systemctl() -> str | None:
+    sys_cmd = shutil.which("systemctl")
+    if sys_cmd:
+        return sys_cmd
+    for p in SYSTEMCTL_FALLBACKS:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+def parse_units(out: str) -> dict:
+    """Parse `list-units --no-legend --plain` output into {unit: row values}."""
+    units = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if parts and parts[0] in ("●", "*", "-"):
+            parts = parts[1:]
+        if len(parts) < 4:
+            continue
+        unit = parts[0]
+        units[unit] = (unit, parts[1], parts[2], parts[3], " ".join(parts[4:]))
+    return units
+
+
+def list_units(sys_cmd: str, timeout_s: float = 5.0) -> dict:
+    """Run systemctl (blocking: call from a background thread). Raises RuntimeError on failure."""
+    cmd = [sys_cmd, "list-units", "--type=service", "--all", "--no-legend", "--no-pager", "--plain"]
+    with span("systemctl list-units", "subprocess", {"cmd": " ".join(cmd)}):
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_s)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "Systemd error")
+    return parse_units(result.stdout)
+
+
+def unit_action(sys_cmd: str, action: str, unit: str, timeout_s: float = 10.0, user: bool = False) -> None:
+    """systemctl [--user] start/stop/restart/enable/disable <unit> (blocking).
+
+    Raises RuntimeError with stderr on failure.
+    """
+    cmd = [sys_cmd] + (["--user"] if user else []) + [action, unit]
+    with span(f"systemctl {action}", "subprocess", {"cmd": " ".join(cmd)}):
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_s)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"exit code {result.returncode}")
+
+
+def diff_units(old: dict, new: dict) -> tuple[list, list, list]:
+    """(added, changed, removed) unit names between two listings."""
+    added = [u for u in new if u not in old]
+    changed = [u for u, vals in new.items() if u in old and old[u] != vals]
+    removed = [u for u in old if u not in new]
+    return added, changed, removed
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Startup items: XDG autostart .desktop files + systemd user units, scanned incrementally
+
+StartupScanner trả về {path: (name, enabled, scope, exec, path)} cho tab Startup:
+  * file đã parse được cache theo (path, mtime_ns, size): chỉ file mới/đổi mới bị đọc lại,
+  * thay đổi được nhận qua inotify (ctypes, không cần thư viện ngoài) trên các thư mục
+    autostart / systemd user; không có inotify thì so (mtime, size) của thư mục và file,
+  * không có gì đổi -> `scan()` trả lại đúng object lần trước (tab bỏ qua, không đụng Treeview).
+
+systemd user units: file *.service trong ~/.config/systemd/user (scope "User unit") và
+/etc/systemd/user ("System unit"), cộng các unit được bật qua symlink trong `*.target.wants/`
+(file unit thật có thể nằm ở /usr/lib/systemd/user). Enabled = có trong một thư mục .wants;
+symlink tới /dev/null = Masked.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import struct
+from pathlib import Path
+
+from .config import USER_AUTOSTART_DIR, SYS_AUTOSTART_DIRS, USER_SYSTEMD_DIR, SYS_USER_SYSTEMD_DIRS
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ name[len])
+
+
+class Inotify:
+    """Minimal non-blocking inotify over libc; raises OSError when unavailable."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self.watched = set()
+
+    def watch(self, path: str) -> bool:
+        if path in self.watched:
+            return True
+        if self._add(self.fd, os.fsencode(path), WATCH_MASK) < 0:
+            return False  # thư mục chưa có / không đủ quyền
+        self.watched.add(path)
+        return True
+
+    def drain(self) -> bool:
+        """Consume pending events; True if any arrived since the last call."""
+        got = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return got
+            if not data:
+                return got
+            got = True
+            # thư mục bị xóa/move thì watch mất: bỏ khỏi tập để lần sau watch lại
+            off = 0
+            while off + _EVENT.size <= len(data):
+                _wd, mask, _cookie, n = _EVENT.unpack_from(data, off)
+                off += _EVENT.size + n
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self.watched.clear()
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def parse_ini(path: Path, sections) -> dict:
+    """{section: {key: value}} for the wanted sections of a .desktop / unit file."""
+    data = {}
+    try:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return data
+    cur = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith(("#", ";")):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            cur = line[1:-1].strip()
+            continue
+        if cur in sections and "=" in line:
+            k, v = line.split("=", 1)
+            data.setdefault(cur, {}).setdefault(k.strip(), v.strip())
+    return data
+
+
+def desktop_entry(path: Path, scope: str):
+    d = parse_ini(path, ("Desktop Entry",)).get("Desktop Entry")
+    if not d:
+        return None
+    enabled = d.get("Hidden", "false").lower() != "true"
+    return (d.get("Name", path.stem), "Yes" if enabled else "No", scope, d.get("Exec", ""), str(path))
+
+
+def unit_entry(path: Path, unit: str, scope: str, enabled: str):
+    d = parse_ini(path, ("Unit", "Service"))
+    name = unit
+    desc = d.get("Unit", {}).get("Description")
+    if desc:
+        name = f"{unit} ({desc})"
+    return (name, enabled, scope, d.get("Service", {}).get("ExecStart", ""), str(path))
+
+
+def _sig(path: Path):
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+class StartupScanner:
+    def __init__(self, autostart_dirs=None, unit_dirs=None, use_inotify: bool = True):
+        # [(dir, scope)]
+        self.autostart_dirs = autostart_dirs or (
+            [(USER_AUTOSTART_DIR, "User")] + [(d, "System") for d in SYS_AUTOSTART_DIRS])
+        self.unit_dirs = unit_dirs or (
+            [(USER_SYSTEMD_DIR, "User unit")] + [(d, "System unit") for d in SYS_USER_SYSTEMD_DIRS])
+        self._cache = {}        # (path, mtime_ns, size, scope, enabled) -> row
+        self._rows = None
+        self._missing = []      # thư mục chưa tồn tại lúc scan (inotify không watch được)
+        self._dir_sigs = None   # fallback polling: {path: (mtime, size)}
+        self.parsed = 0         # số file phải parse ở lần scan gần nhất
+        self.inotify = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except (OSError, AttributeError):
+                self.inotify = None  # không phải Linux / libc không có inotify
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.inotify is not None else "polling"
+
+    def _dirs(self) -> list[Path]:
+        dirs = [d for d, _ in self.autostart_dirs]
+        for d, _ in self.unit_dirs:
+            dirs.append(d)
+            if d.is_dir():
+                dirs.extend(p for p in d.iterdir() if p.name.endswith(".wants") and p.is_dir())
+        return dirs
+
+    def _changed(self) -> bool:
+        if self._rows is None:
+            return True
+        if self.inotify is not None:
+            changed = self.inotify.drain()
+            if not self.inotify.watched:
+                return True  # một thư mục được watch bị xóa/move: watch lại từ đầu
+            # thư mục chưa tồn tại lúc watch: chỉ cần một stat để biết nó vừa được tạo
+            return changed or any(d.is_dir() for d in self._missing)
+        return self._poll_sigs() != self._dir_sigs
+
+    def _poll_sigs(self) -> dict:
+        sigs = {}
+        for d in self._dirs():
+            try:
+                sigs[str(d)] = _sig(d)
+                for p in d.iterdir():
+                    sigs[str(p)] = _sig(p)
+            except OSError:
+                continue
+        return sigs
+
+    def _entry(self, path: Path, scope: str, enabled: str | None, build):
+        try:
+            key = (str(path),) + _sig(path) + (scope, enabled)
+        except OSError:
+            return None
+        row = self._cache.get(key)
+        if row is None:
+            row = build()
+            self.parsed += 1
+        self._next_cache[key] = row
+        return row
+
+    def scan(self, force: bool = False) -> dict:
+        """{path: row}; trả lại đúng object lần trước khi không có gì đổi.
+
+        `force` bỏ qua việc dò thay đổi (nút Refresh Now) nhưng vẫn dùng cache theo mtime.
+        """
+        if not force and not self._changed():
+            self.parsed = 0
+            return self._rows
+        self.parsed = 0
+        self._next_cache = {}
+        rows = {}
+        for d, scope in self.autostart_dirs:
+            if not d.is_dir():
+                continue
+            for p in sorted(d.glob("*.desktop")):
+                row = self._entry(p, scope, None, lambda p=p, s=scope: desktop_entry(p, s))
+                if row:
+                    rows[row[4]] = row
+        for unit, (path, scope, enabled) in self._units().items():
+            row = self._entry(path, scope, enabled, lambda p=path, u=unit, s=scope, e=enabled: unit_entry(p, u, s, e))
+            if row:
+                rows[row[4]] = row
+        self._cache = self._next_cache
+        if self.inotify is not None:
+            self._missing = [d for d in self._dirs() if not (d.is_dir() and self.inotify.watch(str(d)))]
+        else:
+            self._dir_sigs = self._poll_sigs()
+        if rows == self._rows:
+            return self._rows
+        self._rows = rows
+        return rows
+
+    def _units(self) -> dict:
+        """{unit: (unit file path, scope, "Yes"/"No"/"Masked")} của systemd user units."""
+        units = {}
+        # thư mục user sau cùng: cấu hình của user đè lên /etc/systemd/user
+        for d, scope in reversed(self.unit_dirs):
+            if not d.is_dir():
+                continue
+            found = {}
+            for wants in d.iterdir():
+                if wants.name.endswith(".wants") and wants.is_dir():
+                    for link in wants.iterdir():
+                        target = link.resolve()
+                        if link.name.endswith(".service") and target.is_file():
+                            found[link.name] = (target, scope, "Yes")
+            for p in d.glob("*.service"):
+                if p.is_symlink() and os.readlink(p) == "/dev/null":
+                    found[p.name] = (p, scope, "Masked")
+                elif p.is_file():
+                    found[p.name] = (p.resolve(), scope, "Yes" if p.name in found else "No")
+            units.update(found)
+        return units
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Per-thread view of one process (/proc/<pid>/task/*/stat)
+
+Mỗi thread một dòng: TID, comm, state, CPU % (delta utime+stime, cùng CpuAccounting với
+bảng process, key (tid, start time)), tổng CPU time, CPU chạy lần cuối và wchan.
+Refresh theo nhịp riêng khi cửa sổ mở. Với process hàng nghìn thread:
+  - đọc qua procfs.ProcReader (một dir fd, buffer dùng lại),
+  - wchan chỉ đọc cho các dòng đang hiện trên màn hình,
+  - Treeview chỉ được gọi cho dòng có giá trị thay đổi.
+"""
+
+from __future__ import annotations
+
+import time
+
+import tkinter as tk
+from tkinter import ttk
+
+from . import procfs
+from .cpuacct import CpuAccounting
+from .config import PROC_STATUS_LABEL
+
+
+def _fmt_cpu_time(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}"
+
+
+class ThreadsWindow:
+    COLS = (("tid", "TID", 80), ("name", "Name", 200), ("state", "State", 110), ("cpu", "CPU %", 80),
+            ("time", "CPU time", 100), ("last_cpu", "Last CPU", 80), ("wchan", "Wait channel", 260))
+
+    def __init__(self, app, pid: int):
+        self.app = app
+        self.pid = pid
+        self.refresh_ms = max(250, int(app.cfg.get("threads_refresh_ms", 1000)))
+        self.reader = procfs.ProcReader(getattr(app.source, "root", procfs.PROC_ROOT))
+        self.btime = procfs.boot_time(self.reader.root)
+        self.cpu = CpuAccounting(app.source.cpu.mode)
+        self.rows = {}      # tid -> dict (giá trị thô để sort)
+        self._shown = {}    # tid -> tuple values đang hiện (bỏ qua tree.item nếu không đổi)
+        self._wchan = {}    # tid -> str (chỉ dòng trong viewport)
+        self.sort_col = "cpu"
+        self.sort_desc = True
+        self._job = None
+
+        self.win = win = tk.Toplevel(app)
+        win.title(f"Threads - PID {pid}")
+        win.geometry("960x560")
+        win.protocol("WM_DELETE_WINDOW", self.close)
+
+        top = ttk.Frame(win)
+        top.pack(fill="x", padx=10, pady=8)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(top, textvariable=self.status_var, foreground="#555555").pack(side="left")
+
+        self.tree = ttk.Treeview(win, columns=[c[0] for c in self.COLS], show="headings")
+        for cid, heading, width in self.COLS:
+            self.tree.heading(cid, text=heading, command=lambda c=cid: self._sort_by(c))
+            self.tree.column(cid, width=width, anchor="w")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        ysb = ttk.Scrollbar(win, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=ysb.set)
+        ysb.place(in_=self.tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        self.refresh()
+
+    # ------------------------------------------------------------
+    # Collect
+    # ------------------------------------------------------------
+    def _collect(self) -> dict:
+        reader = self.reader
+        pid = self.pid
+        rows = {}
+        self.cpu.begin()
+        for tid in reader.task_ids(pid):
+            try:
+                comm, f = reader.task_stat(pid, tid)
+            except (OSError, ValueError):
+                continue  # thread vừa thoát
+            try:
+                secs = (int(f[procfs.STAT_UTIME]) + int(f[procfs.STAT_STIME])) / procfs.CLK_TCK
+                start = self.btime + int(f[procfs.STAT_STARTTIME]) / procfs.CLK_TCK
+                st = procfs.STATE_MAP.get(f[procfs.STAT_STATE].decode(), "")
+                rows[tid] = {
+                    "tid": tid, "name": comm, "state": PROC_STATUS_LABEL.get(st, st),
+                    "cpu": self.cpu.update((tid, start), secs), "time": secs,
+                    "last_cpu": int(f[procfs.STAT_PROCESSOR]) if len(f) > procfs.STAT_PROCESSOR else -1,
+                }
+            except (ValueError, IndexError):
+                continue
+        self.cpu.end()
+        return rows
+
+    # ------------------------------------------------------------
+    # Refresh (nhịp riêng)
+    # ------------------------------------------------------------
+    def refresh(self):
+        self._job = None
+        t0 = time.perf_counter()
+        try:
+            self.rows = self._collect()
+        except FileNotFoundError:
+            self.status_var.set(f"Process đã thoát ({time.strftime('%H:%M:%S')}).")
+            return
+        except PermissionError:
+            self.status_var.set("Không đủ quyền đọc /proc/<pid>/task.")
+            return
+        order = self._sorted_tids()
+        tree = self.tree
+        shown = self._shown
+
+        for tid in [t for t in shown if t not in self.rows]:
+            tree.delete(str(tid))
+            del shown[tid]
+            self._wchan.pop(tid, None)
+
+        visible = self._visible_tids(order)
+        for tid in visible:
+            try:
+                self._wchan[tid] = self.reader.wchan(self.pid, tid)
+            except OSError:
+                self._wchan[tid] = ""
+
+        for i, tid in enumerate(order):
+            r = self.rows[tid]
+            values = (tid, r["name"], r["state"], f"{r['cpu']:.1f}", _fmt_cpu_time(r["time"]),
+                      r["last_cpu"] if r["last_cpu"] >= 0 else "", self._wchan.get(tid, ""))
+            iid = str(tid)
+            old = shown.get(tid)
+            if old is None:
+                tree.insert("", i, iid=iid, values=values)
+            elif old != values:
+                tree.item(iid, values=values)
+            shown[tid] = values
+        # giữ thứ tự sort (move rẻ hơn xóa/chèn lại)
+        children = tree.get_children("")
+        if list(children) != [str(t) for t in order]:
+            for i, tid in enumerate(order):
+                tree.move(str(tid), "", i)
+
+        total = sum(r["cpu"] for r in self.rows.values())
+        self.status_var.set(f"{len(self.rows)} threads, total CPU {total:.1f}% - "
+                            f"refresh {self.refresh_ms / 1000:g}s, took {(time.perf_counter() - t0) * 1000:.0f} ms")
+        self._job = self.win.after(self.refresh_ms, self.refresh)
+
+    def _visible_tids(self, order) -> list:
+        n = len(order)
+        if not n:
+            return []
+        first, last = self.tree.yview()
+        return order[max(0, int(first * n) - 5):min(n, int(last * n + 0.999) + 5)]
+
+    def _sorted_tids(self) -> list:
+        col = self.sort_col
+        if col == "wchan":
+            key = lambda t: self._wchan.get(t, "")
+        else:
+            key = lambda t: self.rows[t][col]
+        return sorted(self.rows, key=key, reverse=self.sort_desc)
+
+    def _sort_by(self, col: str):
+        if self.sort_col == col:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_col = col
+            self.sort_desc = col in ("cpu", "time")
+        if self._job is not None:
+            self.win.after_cancel(self._job)
+        self.refresh()
+
+    def close(self):
+        if self._job is not None:
+            self.win.after_cancel(self._job)
+            self._job = None
+        self.reader.close()
+        self.win.destroy()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Opt-in span tracing -> Chrome Trace Event JSON (mở bằng Perfetto / chrome://tracing)
+
+Khi tắt, mỗi span chỉ tốn đúng một lần kiểm tra `TRACER.enabled`.
+Khi bật, event được đẩy vào buffer có giới hạn và một thread riêng ghi dần ra file,
+nên capture dài (10 phút+) không làm phình RAM.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+
+DEFAULT_BUFFER_EVENTS = 50000
+FLUSH_INTERVAL_S = 0.5
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = ""
+        self.dropped = 0
+        self.written = 0
+        self._buf = deque(maxlen=DEFAULT_BUFFER_EVENTS)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = None
+        self._fh = None
+        self._first = True
+        self._pid = os.getpid()
+        self._named_tids = set()
+
+    # ------------------------------------------------------------
+    # Start / stop capture
+    # ------------------------------------------------------------
+    def start(self, path: str, max_events: int = DEFAULT_BUFFER_EVENTS) -> None:
+        if self.enabled:
+            self.stop()
+        self._fh = open(path, "w", encoding="utf-8")
+        # JSON array format: Perfetto chấp nhận cả file chưa đóng "]" nếu app bị kill giữa chừng
+        self._fh.write("[\n")
+        self._first = True
+        self.path = path
+        self.dropped = 0
+        self.written = 0
+        self._named_tids = set()
+        self._buf = deque(maxlen=max(1000, int(max_events)))
+        self._wake.clear()
+        self._writer = threading.Thread(target=self._writer_loop, name="trace-writer", daemon=True)
+        self.enabled = True
+        self._writer.start()
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+            self._writer = None
+        self._flush()
+        try:
+            self._fh.write("\n]\n")
+            self._fh.close()
+        except Exception:
+            pass
+        self._fh = None
+
+    # ------------------------------------------------------------
+    # Event recording (gọi từ bất kỳ thread nào)
+    # ------------------------------------------------------------
+    def complete(self, name: str, cat: str, t0_ns: int, args: dict | None = None) -> None:
+        """Record a finished span ("X" event) started at perf_counter_ns() == t0_ns."""
+        t1 = time.perf_counter_ns()
+        tid = threading.get_ident()
+        ev = {"name": name, "cat": cat, "ph": "X", "ts": t0_ns // 1000,
+              "dur": max(0, (t1 - t0_ns) // 1000), "pid": self._pid, "tid": tid}
+        if args:
+            ev["args"] = args
+        self._push(ev, tid)
+
+    def instant(self, name: str, cat: str = "app", args: dict | None = None) -> None:
+        tid = threading.get_ident()
+        ev = {"name": name, "cat": cat, "ph": "i", "s": "t",
+              "ts": time.perf_counter_ns() // 1000, "pid": self._pid, "tid": tid}
+        if args:
+            ev["args"] = args
+        self._push(ev, tid)
+
+    def _push(self, ev: dict, tid: int) -> None:
+        with self._lock:
+            if tid not in self._named_tids:
+                self._named_tids.add(tid)
+                if len(self._buf) == self._buf.maxlen:
+                    self.dropped += 1
+                self._buf.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                                  "args": {"name": threading.current_thread().name}})
+            if len(self._buf) == self._buf.maxlen:
+                self.dropped += 1
+            self._buf.append(ev)
+            half = len(self._buf) >= self._buf.maxlen // 2
+        if half:
+            self._wake.set()
+
+    # ------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------
+    def _writer_loop(self):
+        while self.enabled:
+            self._wake.wait(FLUSH_INTERVAL_S)
+            self._wake.clear()
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if not self._buf:
+                return
+            events = list(self._buf)
+            self._buf.clear()
+        fh = self._fh
+        if fh is None:
+            return
+        parts = []
+        for ev in events:
+            s = json.dumps(ev, separators=(",", ":"), default=str)
+            parts.append(s if self._first else ",\n" + s)
+            self._first = False
+        try:
+            fh.write("".join(parts))
+            fh.flush()
+            self.written += len(events)
+        except Exception:
+            pass
+
+
+TRACER = Tracer()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "t0")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        TRACER.complete(self.name, self.cat, self.t0, self.args)
+        return False
+
+
+def span(name: str, cat: str = "app", args: dict | None = None):
+    """Context manager for an inline span; a shared no-op object when tracing is off."""
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def traced(name: str | None = None, cat: str = "app"):
+    """Decorator: record every call of the function as a span."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                TRACER.complete(label, cat, t0)
+        return wrapper
+    return deco
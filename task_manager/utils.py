@@ -11,6 +11,8 @@ from datetime import datetime
 
 import psutil
 
+from .tracing import traced
+
 def fmt_bytes(n: int) -> str:
     if n is None:
         return ""
@@ -30,13 +32,13 @@ def safe_call(fn, default=None):
     except Exception:
         return default
 
-def is_system_process(p: psutil.Process) -> bool:
+def is_system_user(pid: int, user: str) -> bool:
     """Heuristic: system process if username is root or pid < 100."""
+    return pid < 100 or user in ("root", "systemd+", "messagebus")
+
+def is_system_process(p: psutil.Process) -> bool:
     try:
-        if p.pid < 100:
-            return True
-        u = p.username()
-        return u in ("root", "systemd+", "messagebus")
+        return is_system_user(p.pid, p.username())
     except Exception:
         return False
 
@@ -53,6 +55,7 @@ def readlink_exe(pid: int) -> str:
     except Exception:
         return ""
 
+@traced("run_cmd", "subprocess")
 def run_cmd(cmd: list[str], timeout: float = 2.0) -> tuple[int, str, str]:
     """Run subprocess command and return (returncode, stdout, stderr)."""
     try:
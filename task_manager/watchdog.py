@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Main-loop stall watchdog
+
+Một callback heartbeat chạy bằng Tk `after()`; một thread nền kiểm tra xem heartbeat
+có bị trễ quá ngưỡng không. Nếu có, chụp stack Python của main thread ngay lúc đó
+và ghi log ngay từ thread nền (kèm tên hàm refresh đang chạy, số lần stall), nên UI bị
+treo hẳn vẫn để lại dấu vết; khi main loop chạy lại, chỉ ghi thêm tổng thời gian stall.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import logging
+import threading
+import traceback
+from collections import Counter
+
+from .config import CFG_PATH
+
+STALL_LOG_PATH = CFG_PATH.parent / "stalls.log"
+
+log = logging.getLogger("task_manager.watchdog")
+
+
+def _setup_file_log():
+    if log.handlers:
+        return
+    try:
+        STALL_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        h = logging.FileHandler(STALL_LOG_PATH, encoding="utf-8")
+        h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        log.addHandler(h)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    except Exception:
+        pass
+
+
+def active_function(frame) -> str:
+    """Name the app function the main thread is stuck in (prefers refresh_* entry points)."""
+    refresh = ""
+    innermost_app = ""
+    f = frame
+    while f is not None:
+        code = f.f_code
+        if "task_manager" in code.co_filename:
+            if not innermost_app:
+                innermost_app = code.co_name
+            if code.co_name.startswith("refresh_") or code.co_name.startswith("_show_") \
+                    or code.co_name == "_service_action":
+                refresh = code.co_name
+        f = f.f_back
+    if refresh and innermost_app and refresh != innermost_app:
+        return f"{refresh} > {innermost_app}"
+    return refresh or innermost_app or "(tk event loop)"
+
+
+class StallWatchdog:
+    def __init__(self, root, threshold_ms: int = 250, heartbeat_ms: int = 100):
+        self.root = root
+        self.threshold = max(50, int(threshold_ms)) / 1000.0
+        self.heartbeat_ms = max(20, int(heartbeat_ms))
+        self.main_ident = threading.main_thread().ident
+
+        # thống kê
+        self.count = 0
+        self.worst_ms = 0.0
+        self.total_ms = 0.0
+        self.by_function = Counter()
+        self.last_stall = None  # (duration_ms, function)
+
+        self._last_beat = time.monotonic()
+        self._pending = None  # (function, stack_text) đã chụp cho stall hiện tại
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------
+    # Start / stop
+    # ------------------------------------------------------------
+    def start(self):
+        _setup_file_log()
+        self._last_beat = time.monotonic()
+        self.root.after(self.heartbeat_ms, self._beat)
+        self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ------------------------------------------------------------
+    # Heartbeat (main thread)
+    # ------------------------------------------------------------
+    def _beat(self):
+        if self._stop.is_set():
+            return
+        now = time.monotonic()
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            # heartbeat chạy lại được -> stall kết thúc, giờ mới biết tổng thời gian
+            self._record(gap * 1000.0 - self.heartbeat_ms, pending[0])
+        try:
+            self.root.after(self.heartbeat_ms, self._beat)
+        except Exception:
+            pass
+
+    def _record(self, dur_ms: float, func: str):
+        """Stall ended: the stack was already logged by the watchdog thread, add the duration."""
+        dur_ms = max(dur_ms, self.threshold * 1000.0)
+        self.total_ms += dur_ms
+        self.worst_ms = max(self.worst_ms, dur_ms)
+        self.last_stall = (dur_ms, func)
+        log.warning("UI stall ended after %.0f ms in %s (worst=%.0f ms)", dur_ms, func, self.worst_ms)
+
+    # ------------------------------------------------------------
+    # Watchdog thread
+    # ------------------------------------------------------------
+    def _run(self):
+        poll = min(self.threshold / 4.0, 0.05)
+        limit = self.threshold + self.heartbeat_ms / 1000.0
+        while not self._stop.wait(poll):
+            with self._lock:
+                late = time.monotonic() - self._last_beat
+                captured = self._pending is not None
+            if late <= limit or captured:
+                continue
+            frame = sys._current_frames().get(self.main_ident)
+            if frame is None:
+                continue
+            func = active_function(frame)
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+            with self._lock:
+                if self._pending is not None:
+                    continue
+                self._pending = (func, stack)
+                self.count += 1
+                self.by_function[func] += 1
+                count = self.count
+            # ghi ngay: nếu main loop không bao giờ chạy lại, đây là dấu vết duy nhất
+            log.warning("UI stall in %s: main loop blocked > %.0f ms (count=%d)\n%s",
+                        func, late * 1000.0, count, stack)
+
+    def summary(self) -> dict:
+        avg = self.total_ms / self.count if self.count else 0.0
+        top = ", ".join(f"{fn} x{n}" for fn, n in self.by_function.most_common(3))
+        return {
+            "UI stalls (count)": str(self.count),
+            "UI stall worst (ms)": f"{self.worst_ms:.0f}",
+            "UI stall avg (ms)": f"{avg:.0f}",
+            "UI stall top functions": top,
+            "UI stall log": str(STALL_LOG_PATH),
+        }